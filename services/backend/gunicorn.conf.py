@@ -0,0 +1,78 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Gunicorn configuration for the production server.
+
+Runs uvicorn workers under gunicorn. Run from services/backend:
+
+    gunicorn src.app.main:app
+
+The application is imported once in the master (`preload_app`), so its
+modules and the static asset table are shared by the workers
+copy-on-write. With several workers the master also imports the agent
+stack, which a single worker imports in the background after startup.
+Everything `lifespan` creates (SSE transport, background tasks) and the
+session service are created in each worker after the fork.
+
+Sessions and SSE events live in worker memory unless SESSION_DB_URL is set
+and SSE_SHARED_PUBSUB is enabled with a REDIS_URL, so the worker count is
+only derived from the cgroup CPU quota once both are shared; otherwise one
+worker runs unless SERVER_WORKERS says otherwise.
+"""
+
+from loguru import logger as _logger
+
+from src.app.utils.sse import shared_pubsub_enabled
+from src.lib.config import settings
+from src.lib.workers import available_cpus, worker_count
+
+_shared_state = bool(settings.SESSION_DB_URL) and shared_pubsub_enabled()
+
+bind = f'{settings.HOST}:{settings.PORT}'
+worker_class = 'src.app.server.AppWorker'
+workers = worker_count(settings.SERVER_WORKERS, _shared_state)
+preload_app = True
+
+# Restart workers whose event loop stopped responding
+timeout = settings.SERVER_TIMEOUT_SECONDS
+# Time workers get to finish requests on shutdown and restart
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+# Recycle workers periodically, staggered so they do not restart together
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+
+
+def on_starting(server):
+    """Log how the worker count was chosen and share the agent stack."""
+    _logger.info(
+        f'Starting {workers} workers ({available_cpus()} CPUs available, '
+        f'SERVER_WORKERS={settings.SERVER_WORKERS})'
+    )
+    if not _shared_state:
+        if workers > 1:
+            _logger.warning(
+                'Running several workers without SESSION_DB_URL and '
+                'SSE_SHARED_PUBSUB with REDIS_URL; sessions and SSE events are '
+                'per worker'
+            )
+        else:
+            _logger.info(
+                'Set SESSION_DB_URL, and SSE_SHARED_PUBSUB with REDIS_URL, to run '
+                'one worker per CPU'
+            )
+    if workers > 1:
+        from src.app.main import import_agent_stack
+
+        import_agent_stack()
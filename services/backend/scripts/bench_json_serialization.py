@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the JSON serialization paths used for API responses.
+
+Encodes a page of bug report summaries, an agent response with a large
+diagram and an SSE status event with FastAPI's legacy encoder, FastAPI's
+pydantic fast path and the fast serializer. Run from services/backend:
+
+    python scripts/bench_json_serialization.py
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.app.schemas.response import AgentResponse  # noqa: E402
+from src.lib import serialization  # noqa: E402
+
+BUG_PAGE = {
+    'success': True,
+    'count': 500,
+    'reports': [
+        {
+            'bug_id': f'3f1c0c5e-{i:04d}',
+            'timestamp': '2025-06-01T12:00:00',
+            'user_name': 'Ana',
+            'description': 'The diagram loses its edges after an AI edit. ' * 3,
+            'status': 'new',
+            'has_diagram': True,
+            'chat_messages_count': 12,
+        }
+        for i in range(500)
+    ],
+    'next_cursor': None,
+}
+
+AGENT_RESPONSE = AgentResponse(
+    response='Here is the architecture. ' * 50,
+    diagram={
+        'diagram_code': 'graph TD\n'
+        + ''.join(f'    N{i}[Service {i}] --> N{i + 1}\n' for i in range(2000)),
+        'diagram_type': 'mermaid',
+    },
+    session_id='3f1c0c5e-session',
+    model='gemini-2.5-flash',
+)
+
+SSE_EVENT = {
+    'type': 'tool_start',
+    'message': 'Running generate_diagram',
+    'tool_name': 'generate_diagram',
+    'timestamp': 1750000000.0,
+}
+
+
+def measure(function, iterations: int) -> float:
+    """Return the mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def compare(name: str, value: Any, annotation: Any, iterations: int):
+    adapter = TypeAdapter(annotation)
+    paths = {
+        'jsonable_encoder + json.dumps': lambda: json.dumps(
+            jsonable_encoder(value)
+        ).encode(),
+        'FastAPI TypeAdapter dump_json': lambda: adapter.dump_json(
+            adapter.validate_python(value)
+        ),
+        'serialization.dumps': lambda: serialization.dumps(value),
+    }
+    print(name)
+    for path, function in paths.items():
+        print(f'  {path:32} {measure(function, iterations):10.1f} us')
+
+
+def main():
+    backend = 'orjson' if serialization.orjson is not None else 'pydantic-core'
+    print(f'Fast serializer backend: {backend}')
+    compare('Bug list page (500 reports)', BUG_PAGE, dict[str, Any], 50)
+    compare('Agent response (2000-edge diagram)', AGENT_RESPONSE, AgentResponse, 50)
+    print('SSE event')
+    print(
+        f'  {"json.dumps":32} {measure(lambda: json.dumps(SSE_EVENT), 20000):10.2f} us'
+    )
+    print(
+        f'  {"serialization.dumps_str":32} '
+        f'{measure(lambda: serialization.dumps_str(SSE_EVENT), 20000):10.2f} us'
+    )
+
+
+if __name__ == '__main__':
+    main()
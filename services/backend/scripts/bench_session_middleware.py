@@ -0,0 +1,67 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the per-request overhead of the session middleware.
+
+Calls a trivial ASGI app directly, with and without the middleware, so the
+difference is the middleware's own cost. Run from services/backend:
+
+    python scripts/bench_session_middleware.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.app.middleware.session_middleware import SessionMiddleware  # noqa: E402
+
+REQUESTS = 50_000
+
+
+async def endpoint(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'ok'})
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, path: str) -> float:
+    """Return the mean microseconds per request."""
+    headers = [(b'x-session-id', b'3f1c0c5e-session'), (b'accept', b'*/*')]
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        scope = {'type': 'http', 'path': path, 'headers': headers}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+async def main():
+    middleware = SessionMiddleware(endpoint)
+    for path in ('/api/v1/agent/query', '/_next/static/chunks/main.js'):
+        base = await measure(endpoint, path)
+        wrapped = await measure(middleware, path)
+        print(f'{path}: {wrapped - base:.2f} us overhead per request')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
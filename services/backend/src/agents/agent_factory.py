@@ -18,14 +18,23 @@ from functools import lru_cache
 from typing import Any, Dict
 
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.tools import FunctionTool
 from loguru import logger as _logger
 
-from .callbacks import before_model_callback, store_tool_result_callback
+from .callbacks import (
+    before_model_callback,
+    model_started_callback,
+    store_tool_result_callback,
+    tool_completed_callback,
+    tool_failed_callback,
+    tool_started_callback,
+)
 from .tools import generate_architecture_diagram
 
 try:
     from src.lib.config import settings
+    from src.lib.genai_client import get_genai_client
 
     from .system_instructions import get_platform_assistant_instructions
 except ImportError:
@@ -33,6 +42,23 @@ except ImportError:
     from system_instructions import get_platform_assistant_instructions  # type: ignore
 
     from src.lib.config import settings  # type: ignore
+    from src.lib.genai_client import get_genai_client  # type: ignore
+
+
+class SharedClientGemini(Gemini):
+    """Gemini model calling through the process-wide GenAI client.
+
+    The client is looked up on every call rather than stored, so cached
+    agents pick up the new pools once a shutdown has closed the old ones.
+    """
+
+    @property
+    def api_client(self):
+        return get_genai_client()
+
+    @property
+    def _live_api_client(self):
+        return get_genai_client()
 
 
 class AgentFactory:
@@ -81,15 +107,21 @@ class AgentFactory:
                     f'assistant_{model_name.replace("-", "_").replace(".", "_")}'
                     f'__{platform}'
                 ),
-                model=model_name,
+                # Share the pooled client instead of one per agent
+                model=SharedClientGemini(model=model_name),
                 description=(
                     f'AI assistant using {model_config["display_name"]} - '
                     f'{model_config["description"]} with diagram generation'
                 ),
                 instruction=get_platform_assistant_instructions(platform),
                 tools=tools,
-                after_tool_callback=store_tool_result_callback,
-                before_model_callback=before_model_callback,
+                before_tool_callback=tool_started_callback,
+                after_tool_callback=[
+                    store_tool_result_callback,
+                    tool_completed_callback,
+                ],
+                on_tool_error_callback=tool_failed_callback,
+                before_model_callback=[model_started_callback, before_model_callback],
             )
 
             self._agent_cache[key] = agent
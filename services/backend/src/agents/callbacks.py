@@ -15,7 +15,9 @@
 """Callbacks for AI agent lifecycle events."""
 
 import json
-from typing import Any, Dict, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models.llm_response import LlmResponse
@@ -24,6 +26,35 @@ from google.adk.tools.tool_context import ToolContext
 from google.genai.types import Content, Part
 from loguru import logger as _logger
 
+from src.app.utils.session_status import AgentStatus, session_tracker
+from src.app.utils.sse import sse_manager
+from src.lib.latency import tool_latency
+
+from .tools import diagram_model
+
+# Start times of running tool calls keyed by (session ID, function call ID).
+# Entries are removed when a call completes or fails; the bound only guards
+# against calls that end without either callback.
+_tool_starts: OrderedDict[Tuple[str, str], float] = OrderedDict()
+MAX_RUNNING_TOOLS = 1024
+
+# Models called by tools regardless of the agent's model
+_TOOL_MODELS = {'generate_architecture_diagram': diagram_model}
+
+
+def _latency_key(tool: BaseTool, context: CallbackContext) -> str:
+    """Return the model a tool's duration depends on.
+
+    Tools that call a fixed model are keyed by it; other tools by the agent
+    running them, which is specific to the agent's model.
+    """
+    model = _TOOL_MODELS.get(tool.name)
+    return model() if model else context.agent_name
+
+
+def _call_key(tool: BaseTool, context: ToolContext) -> Tuple[str, str]:
+    return context.session.id, context.function_call_id or tool.name
+
 
 def store_tool_result_callback(
     tool: BaseTool,
@@ -84,3 +115,89 @@ def before_model_callback(
     except Exception as e:
         _logger.error('Error in before_model_callback: %s', e)
         return None
+
+
+async def tool_started_callback(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext
+) -> Optional[Dict[str, Any]]:
+    """Publishes a tool start event with the learned duration estimate."""
+    try:
+        session_id = tool_context.session.id
+        _tool_starts[_call_key(tool, tool_context)] = time.monotonic()
+        while len(_tool_starts) > MAX_RUNNING_TOOLS:
+            _tool_starts.popitem(last=False)
+
+        estimate = tool_latency.estimate(tool.name, _latency_key(tool, tool_context))
+        session_tracker.update_status(
+            session_id,
+            AgentStatus.TOOL_RUNNING,
+            f'Running {tool.name}',
+            tool.name,
+            estimated_duration=estimate,
+        )
+        await sse_manager.send_tool_start(session_id, tool.name, estimate)
+    except Exception as e:
+        _logger.error(f'Error in tool_started_callback: {e}')
+    return None
+
+
+async def tool_completed_callback(
+    tool: BaseTool,
+    args: Dict[str, Any],
+    tool_context: ToolContext,
+    tool_response: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Records the tool latency and publishes a tool completion event."""
+    try:
+        session_id = tool_context.session.id
+        started = _tool_starts.pop(_call_key(tool, tool_context), None)
+        failed = isinstance(tool_response, dict) and (
+            tool_response.get('status') == 'error'
+        )
+        # Failures return early and would skew the estimate down
+        if started is not None and not failed:
+            tool_latency.record(
+                tool.name,
+                _latency_key(tool, tool_context),
+                time.monotonic() - started,
+            )
+
+        session_tracker.update_status(
+            session_id, AgentStatus.GENERATING_RESPONSE, f'{tool.name} completed'
+        )
+        await sse_manager.send_tool_complete(session_id, tool.name)
+    except Exception as e:
+        _logger.error(f'Error in tool_completed_callback: {e}')
+    return None
+
+
+def tool_failed_callback(
+    tool: BaseTool,
+    args: Dict[str, Any],
+    tool_context: ToolContext,
+    error: Exception,
+) -> Optional[Dict[str, Any]]:
+    """Forgets the start time of a tool call that raised."""
+    try:
+        _tool_starts.pop(_call_key(tool, tool_context), None)
+    except Exception as e:
+        _logger.error(f'Error in tool_failed_callback: {e}')
+    # Let the error propagate as before
+    return None
+
+
+async def model_started_callback(
+    callback_context: CallbackContext, llm_request: Any
+) -> Optional[LlmResponse]:
+    """Publishes a status event when the agent model starts a turn."""
+    try:
+        session_id = callback_context.session.id
+        session_tracker.update_status(
+            session_id, AgentStatus.GENERATING_RESPONSE, 'Generating response'
+        )
+        await sse_manager.send_status_update(
+            session_id, AgentStatus.GENERATING_RESPONSE.value, 'Generating response'
+        )
+    except Exception as e:
+        _logger.error(f'Error in model_started_callback: {e}')
+    return None
@@ -21,22 +21,26 @@ from loguru import logger
 
 try:  # Local imports when running inside the service
     from src.lib.config import settings
+    from src.lib.genai_client import get_genai_client
     from src.lib.mermaid_utils import (
         create_fallback_mermaid,
         extract_mermaid,
         sanitize_mermaid,
     )
+    from src.lib.resilience import gemini_caller
 
     from .system_instructions import get_diagram_generator_instructions
 except ImportError:  # Fallback for direct execution
     from system_instructions import get_diagram_generator_instructions  # type: ignore
 
     from src.lib.config import settings  # type: ignore
+    from src.lib.genai_client import get_genai_client  # type: ignore
     from src.lib.mermaid_utils import (  # type: ignore
         create_fallback_mermaid,
         extract_mermaid,
         sanitize_mermaid,
     )
+    from src.lib.resilience import gemini_caller  # type: ignore
 
 try:
     # google-genai SDK
@@ -50,27 +54,24 @@ except Exception as _e:  # pragma: no cover - import errors handled via fallback
     )
 
 
-_CLIENT: Optional[Any] = None
-
-
 def _get_genai_client() -> Optional[Any]:
-    """Return a cached Google GenAI client if available and configured."""
-    global _CLIENT
-    if _CLIENT is not None:
-        return _CLIENT
-
+    """Return the shared Google GenAI client if available and configured."""
     if genai is None:
         return None
 
     # The client picks up GOOGLE_API_KEY automatically if set.
     try:
-        _CLIENT = genai.Client()
-        return _CLIENT
+        return get_genai_client()
     except Exception as e:  # pragma: no cover - network/config dependent
         logger.error(f'Failed to initialize genai client: {e}')
         return None
 
 
+def diagram_model() -> str:
+    """Return the model `generate_architecture_diagram` calls."""
+    return getattr(settings, 'GEMINI_MODEL_PRO', 'gemini-2.5-pro')
+
+
 def _extract_mermaid(text: str) -> str:
     """Extract Mermaid code from a response, stripping fences if present.
 
@@ -90,7 +91,7 @@ def _sanitize_mermaid(code: str) -> str:
     return sanitize_mermaid(code)
 
 
-def generate_architecture_diagram(
+async def generate_architecture_diagram(
     description: str, platform: Optional[str] = None
 ) -> Dict[str, Any]:
     """Generate a Mermaid architecture diagram from a free-text description.
@@ -109,7 +110,7 @@ def generate_architecture_diagram(
         if not description or not description.strip():
             return {'status': 'error', 'error_message': 'Description cannot be empty'}
 
-        model_name = getattr(settings, 'GEMINI_MODEL_PRO', 'gemini-2.5-pro')
+        model_name = diagram_model()
         client = _get_genai_client()
 
         # If client or API key isn't available, return a deterministic fallback
@@ -144,7 +145,12 @@ def generate_architecture_diagram(
         kwargs: Dict[str, Any] = {'model': model_name, 'contents': [description]}
         if gen_config is not None:
             kwargs['config'] = gen_config
-        response = client.models.generate_content(**kwargs)
+        # Async call so progress events keep streaming during the request;
+        # retried on transient errors and hedged when slow, if enabled
+        response = await gemini_caller.call(
+            f'architecture_diagram@{model_name}',
+            lambda: client.aio.models.generate_content(**kwargs),
+        )
 
         text = getattr(response, 'text', '') or ''
         diagram_code = _extract_mermaid(text)
@@ -29,27 +29,30 @@ from fastapi import (
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Request,
     Response,
     UploadFile,
 )
 from fastapi.responses import StreamingResponse
-from google.genai import types as genai_types
 from loguru import logger as _logger
 
-from src.agents.agent_factory import agent_factory
 from src.app.artifacts.file_validator import FileValidator
 from src.app.models import AgentConfig
 from src.app.schemas import AgentResponse, Query
-from src.app.services.agent_service import agent_service
+from src.app.services.admission_control import admission_controller, session_key
+from src.app.services.rate_limiting import rate_limit_keys, rate_limiter
 from src.app.utils.dependencies import (
     get_agent_config,
+    get_artifact_service,
     get_or_create_session,
     get_runner,
     get_session_model,
+    get_session_user,
 )
 from src.app.utils.sse import sse_manager
+from src.lib.serialization import FastJSONResponse
 
 router = APIRouter()
 
@@ -60,6 +63,8 @@ async def _save_file_as_artifact(
     """Save an uploaded file as an artifact and return its filename."""
     import time
 
+    from google.genai import types as genai_types
+
     # Generate unique filename for this upload
     original_filename = file.filename or 'unknown'
     # Use timestamp + uuid to ensure uniqueness
@@ -82,8 +87,7 @@ async def _save_file_as_artifact(
     # Get session information
     session_id = getattr(request.state, 'actual_session_id', 'default')
 
-    # Get artifact service from app state
-    artifact_service = request.app.state.artifact_service
+    artifact_service = get_artifact_service(request)
 
     # Save artifact
     await artifact_service.save_artifact(
@@ -104,6 +108,8 @@ async def get_available_models():
     Returns:
         Dictionary of available models with their configurations.
     """
+    from src.agents.agent_factory import agent_factory
+
     return {
         'models': agent_factory.get_available_models(),
         'default_model': agent_factory.get_default_model(),
@@ -119,7 +125,8 @@ async def agent_endpoint(
     model: str | None = Form(None),
     files: list[UploadFile] | None = File(None),
     platform: str | None = Form(None),
-) -> AgentResponse:
+    user_name: str | None = Depends(get_session_user),
+) -> FastJSONResponse:
     """
     Unified endpoint: processes user message with optional file attachments.
 
@@ -132,13 +139,17 @@ async def agent_endpoint(
         model: Optional model selection as form field.
         files: Optional list of uploaded files.
         config: The agent configuration, injected as a dependency.
+        user_name: Name the session logged in with, for rate limiting.
 
     Returns:
-        An AgentResponse object containing the agent's response and metadata.
+        The AgentResponse with the agent's response and metadata, rendered
+        with the fast JSON serializer.
 
     Raises:
         HTTPException: If the request contains neither text nor files, or if
           the uploaded files fail validation.
+        RateLimitExceeded: If the session or user sends messages or uploads
+          too fast (answered with 429).
     """
     # Validate that we have either text or files
     if not text.strip() and not files:
@@ -147,6 +158,28 @@ async def agent_endpoint(
             detail='Must provide either text message or file attachments',
         )
 
+    # Rejected requests neither create a session nor reach the agent
+    limit_keys = rate_limit_keys(request, user_name)
+    await rate_limiter.check('chat', limit_keys)
+
+    if files:
+        validator = FileValidator()
+        is_valid, validation_errors = await validator.validate_files(files)
+
+        if not is_valid:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    'message': 'File validation failed',
+                    'errors': validation_errors,
+                },
+            )
+
+        # Charged once validation has bounded the sizes
+        await rate_limiter.check(
+            'upload_bytes', limit_keys, cost=sum(file.size or 0 for file in files)
+        )
+
     # Create Query object from form data
     query = Query(text=text, model=model, platform=platform)
 
@@ -166,60 +199,73 @@ async def agent_endpoint(
 
     _logger.info('Received query for model %s: %s...', model_name, query.text[:50])
 
-    # Handle file uploads if present
+    # Save the validated files as artifacts
     uploaded_artifacts = []
-    if files:
-        validator = FileValidator()
-        is_valid, validation_errors = await validator.validate_files(files)
-
-        if not is_valid:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    'message': 'File validation failed',
-                    'errors': validation_errors,
-                },
-            )
-
-        # Save valid files as artifacts
-        for file in files:
-            artifact_id = await _save_file_as_artifact(request, file, config)
-            uploaded_artifacts.append(artifact_id)
-            _logger.info(f'Saved file {file.filename} as artifact {artifact_id}')
+    for file in files or []:
+        artifact_id = await _save_file_as_artifact(request, file, config)
+        uploaded_artifacts.append(artifact_id)
+        _logger.info(f'Saved file {file.filename} as artifact {artifact_id}')
 
     # Add file references to query context
     if uploaded_artifacts:
         query.file_artifacts = uploaded_artifacts
 
-    return await agent_service.process_query(
-        request=request,
-        query=query,
-        config=config,
-        session=session,
-        runner=runner,
-        model_name=model_name,
-    )
+    # The agent stack is imported on first use to keep startup fast
+    from src.app.services.agent_service import agent_service
+
+    async with admission_controller.slot('chat', session_key(request)):
+        result = await agent_service.process_query(
+            request=request,
+            query=query,
+            config=config,
+            session=session,
+            runner=runner,
+            model_name=model_name,
+        )
+
+    # A returned response skips FastAPI's response_model encoding, and with
+    # it the merge of headers set on `response`, such as the session cookie
+    json_response = FastJSONResponse(result)
+    json_response.headers.raw.extend(response.headers.raw)
+    return json_response
 
 
 @router.get('/events/{session_id}')
-async def sse_endpoint(session_id: str) -> StreamingResponse:
+async def sse_endpoint(
+    session_id: str,
+    last_event_id_header: Annotated[str | None, Header(alias='Last-Event-ID')] = None,
+    last_event_id: str | None = None,
+) -> StreamingResponse:
     """Server-Sent Events endpoint for real-time status updates.
 
+    Reconnecting clients resume from the `Last-Event-ID` header that
+    EventSource sends automatically; the `last_event_id` query parameter is a
+    fallback for clients that cannot set headers.
+
     Args:
         session_id: The session ID to stream events for.
+        last_event_id_header: ID of the last event received before reconnecting.
+        last_event_id: Query parameter alternative to the header.
 
     Returns:
         A StreamingResponse that sends real-time updates to the frontend.
     """
-    _logger.info('Starting SSE stream for session: %s', session_id)
+    resume_from = last_event_id_header or last_event_id
+    try:
+        resume_id = int(resume_from) if resume_from else None
+    except ValueError:
+        _logger.warning(f'Ignoring invalid Last-Event-ID {resume_from!r}')
+        resume_id = None
+
+    _logger.info(f'Starting SSE stream for session: {session_id}')
 
     return StreamingResponse(
-        sse_manager.generate_sse_stream(session_id),
-        media_type='text/plain',
+        sse_manager.generate_sse_stream(session_id, resume_id),
+        media_type='text/event-stream',
         headers={
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
             'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Cache-Control',
+            'Access-Control-Allow-Headers': 'Cache-Control, Last-Event-ID',
         },
     )
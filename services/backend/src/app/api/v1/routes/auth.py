@@ -20,14 +20,20 @@ functionality. It uses session-based authentication integrated with the existing
 session middleware.
 """
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from google.adk.sessions import Session
 from loguru import logger as _logger
 
 from src.app.models.login import LoginRequest, LoginResponse, LogoutResponse
 from src.app.utils.dependencies import get_or_create_session
 from src.lib.config import settings
 
+if TYPE_CHECKING:
+    from google.adk.sessions import Session
+
 router = APIRouter()
 
 
@@ -23,13 +23,17 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from src.app.schemas.bug_report_request import BugReportRequest
 from src.app.schemas.response import BugReportResponse
+from src.app.services.bug_ingest_queue import get_bug_ingest_queue
+from src.app.services.bug_stats import bug_stats
 from src.app.services.bug_storage_service import get_bug_storage_instance
+from src.lib.config import settings
+from src.lib.serialization import FastJSONResponse, dumps
 
 router = APIRouter()
 
@@ -39,6 +43,9 @@ async def submit_bug_report(report: BugReportRequest) -> BugReportResponse:
     """
     Submit a bug report.
 
+    With the ingest queue enabled the report is acknowledged as soon as it is
+    queued and saved with the next batch.
+
     Args:
         report: The bug report data containing description and context
 
@@ -77,8 +84,13 @@ async def submit_bug_report(report: BugReportRequest) -> BugReportResponse:
             'status': 'new',
         }
 
-        # Save using the appropriate storage backend
-        await storage.save_bug(bug_data)
+        # Save using the appropriate storage backend; the queue counts
+        # reports in the statistics once it has saved them
+        if settings.BUG_QUEUE_ENABLED:
+            await get_bug_ingest_queue().submit(bug_data)
+        else:
+            await storage.save_bug(bug_data)
+            bug_stats.add(bug_data)
 
         return BugReportResponse(
             success=True, bug_id=bug_id, message='Bug report submitted successfully'
@@ -91,53 +103,131 @@ async def submit_bug_report(report: BugReportRequest) -> BugReportResponse:
 
 
 @router.get('/list')
-async def list_bug_reports() -> dict[str, Any]:
+async def list_bug_reports(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    status: str | None = None,
+    user_name: str | None = None,
+) -> FastJSONResponse:
     """
-    List all bug reports (for admin/debugging purposes).
+    List bug reports, most recent first (for admin/debugging purposes).
+
+    Args:
+        limit: Maximum number of reports per page
+        cursor: `next_cursor` of the previous page
+        status: Only include reports with this status
+        user_name: Only include reports submitted by this user
 
     Returns:
-        Dictionary containing list of bug reports with basic info
+        JSON response containing one page of bug report summaries and the
+        cursor of the next page (None on the last page)
+
+    Raises:
+        HTTPException: If the cursor is invalid or the reports cannot be read
     """
     try:
         storage = get_bug_storage_instance()
-        all_bugs = await storage.list_bugs()
-
-        # Format bug reports for list view
-        bug_reports = []
-        for bug_data in all_bugs:
-            description = bug_data.get('description', '')
-            truncated_desc = (
-                description[:100] + '...' if len(description) > 100 else description
-            )
-            bug_reports.append(
-                {
-                    'bug_id': bug_data.get('bug_id'),
-                    'timestamp': bug_data.get('timestamp'),
-                    'user_name': bug_data.get('user_name', 'Anonymous'),
-                    'description': truncated_desc,
-                    'status': bug_data.get('status', 'unknown'),
-                    'has_diagram': bug_data.get('diagram') is not None,
-                    'chat_messages_count': len(bug_data.get('chat_history', [])),
-                }
-            )
-
-        # Sort by timestamp (most recent first)
-        bug_reports.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        bug_reports, next_cursor = await storage.page_bug_summaries(
+            limit=limit, cursor=cursor, status=status, user_name=user_name
+        )
 
-        return {
-            'success': True,
-            'total_reports': len(bug_reports),
-            'reports': bug_reports,
-        }
+        return FastJSONResponse(
+            {
+                'success': True,
+                'count': len(bug_reports),
+                'reports': bug_reports,
+                'next_cursor': next_cursor,
+            }
+        )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f'Failed to list bug reports: {str(e)}'
         )
 
 
+@router.get('/list/stream')
+async def stream_bug_reports(
+    status: str | None = None, user_name: str | None = None
+) -> StreamingResponse:
+    """
+    Stream bug report summaries as NDJSON in storage order.
+
+    Args:
+        status: Only include reports with this status
+        user_name: Only include reports submitted by this user
+
+    Returns:
+        StreamingResponse with one JSON summary per line
+    """
+    storage = get_bug_storage_instance()
+
+    async def stream():
+        async for summary in storage.iter_bug_summaries(status, user_name):
+            yield dumps(summary) + b'\n'
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+
+@router.get('/stats')
+async def get_bug_stats() -> FastJSONResponse:
+    """
+    Get bug report counts by status, day and platform.
+
+    Counts are kept up to date as reports are submitted; `ready` is False
+    until the counts of reports saved before startup have been added.
+
+    Returns:
+        JSON response containing the total and the counts per status, day
+        (YYYY-MM-DD) and platform
+    """
+    return FastJSONResponse({'success': True, **bug_stats.snapshot()})
+
+
+@router.get('/search')
+async def search_bug_reports(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> FastJSONResponse:
+    """
+    Search bug reports by description, user name and chat messages.
+
+    Args:
+        q: Search terms; reports mentioning any of them match
+        limit: Maximum number of reports per page
+        offset: `next_offset` of the previous page
+
+    Returns:
+        JSON response containing one page of bug report summaries, best match
+        first, and the offset of the next page (None on the last page)
+
+    Raises:
+        HTTPException: If the reports cannot be searched
+    """
+    try:
+        storage = get_bug_storage_instance()
+        bug_reports, next_offset = await storage.search_bugs(q, limit, offset)
+
+        return FastJSONResponse(
+            {
+                'success': True,
+                'count': len(bug_reports),
+                'reports': bug_reports,
+                'next_offset': next_offset,
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f'Failed to search bug reports: {str(e)}'
+        )
+
+
 @router.get('/{bug_id}')
-async def get_bug_report(bug_id: str) -> dict[str, Any]:
+async def get_bug_report(bug_id: str) -> FastJSONResponse:
     """
     Get a specific bug report by ID.
 
@@ -145,21 +235,26 @@ async def get_bug_report(bug_id: str) -> dict[str, Any]:
         bug_id: The unique bug report ID
 
     Returns:
-        Dictionary containing the full bug report data
+        JSON response containing the full bug report data
 
     Raises:
         HTTPException: If the bug report is not found or cannot be read
     """
     try:
         storage = get_bug_storage_instance()
-        bug_data = await storage.get_bug(bug_id)
+        bug_data = None
+        if settings.BUG_QUEUE_ENABLED:
+            # Reports still waiting in the queue are not in storage yet
+            bug_data = get_bug_ingest_queue().get_pending(bug_id)
+        if bug_data is None:
+            bug_data = await storage.get_bug(bug_id)
 
         if bug_data is None:
             raise HTTPException(
                 status_code=404, detail=f'Bug report with ID {bug_id} not found'
             )
 
-        return {'success': True, 'bug_report': bug_data}
+        return FastJSONResponse({'success': True, 'bug_report': bug_data})
 
     except HTTPException:
         raise
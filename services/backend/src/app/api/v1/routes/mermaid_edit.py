@@ -20,15 +20,22 @@ processes them using the Gemini AI service, and returns the
 edited Mermaid code.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
 from src.app.schemas.mermaid_edit import (
+    MermaidBatchEditRequest,
     MermaidEditRequest,
     MermaidEditResponse,
 )
+from src.app.services.admission_control import AdmissionRejected, session_key
 from src.app.services.mermaid_edit_service import MermaidEditService
-from src.app.utils.dependencies import get_mermaid_edit_service
+from src.app.services.rate_limiting import rate_limit_keys, rate_limiter
+from src.app.utils.dependencies import get_mermaid_edit_service, get_session_user
+from src.lib.serialization import FastJSONResponse, dumps
 
 router = APIRouter()
 
@@ -36,21 +43,28 @@ router = APIRouter()
 @router.post('/edit', response_model=MermaidEditResponse)
 async def edit_mermaid_diagram(
     request: MermaidEditRequest,
+    http_request: Request,
     service: MermaidEditService = Depends(get_mermaid_edit_service),
-) -> MermaidEditResponse:
+    user_name: str | None = Depends(get_session_user),
+) -> FastJSONResponse:
     """
     Edit a Mermaid diagram using Gemini AI.
 
     Args:
         request: Mermaid edit request containing diagram code and edit instructions
+        http_request: The incoming HTTP request, used to identify the session
         service: Mermaid edit service dependency
+        user_name: Name the session logged in with, for rate limiting
 
     Returns:
-        MermaidEditResponse: Edited Mermaid diagram code
+        FastJSONResponse: MermaidEditResponse with the edited Mermaid code
 
     Raises:
         HTTPException: If Mermaid diagram editing fails
+        AdmissionRejected: If too many edits are waiting (answered with 429)
+        RateLimitExceeded: If the session or user edits too often (429)
     """
+    await rate_limiter.check('edit', rate_limit_keys(http_request, user_name))
     try:
         logger.info(
             'Processing Mermaid edit request for %s diagram with %s characters',
@@ -64,19 +78,87 @@ async def edit_mermaid_diagram(
             diagram_type=request.diagram_type,
             diagram_title=request.diagram_title,
             additional_context=request.additional_context,
+            edit_scope=request.edit_scope,
+            session_id=session_key(http_request),
         )
 
         logger.info('Mermaid diagram editing completed successfully')
 
-        return MermaidEditResponse(
-            success=True,
-            content=edited_content,
-            diagram_type=request.diagram_type,
+        return FastJSONResponse(
+            MermaidEditResponse(
+                success=True,
+                content=edited_content,
+                diagram_type=request.diagram_type,
+            )
         )
 
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error('Mermaid diagram editing failed: %s', e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f'Mermaid diagram editing failed: {str(e)}',
         )
+
+
+@router.post('/edit/batch')
+async def batch_edit_mermaid_diagrams(
+    request: MermaidBatchEditRequest,
+    http_request: Request,
+    service: MermaidEditService = Depends(get_mermaid_edit_service),
+    user_name: str | None = Depends(get_session_user),
+) -> StreamingResponse:
+    """
+    Edit several Mermaid diagrams with bounded concurrency.
+
+    Results are streamed as newline-delimited JSON, one line per job in
+    completion order. A failing job produces a line with `success: false`
+    and does not fail the batch. Jobs are admitted to Gemini with the lowest
+    priority, after chat and single edits. Each job counts as one edit
+    against the rate limit.
+
+    Args:
+        request: Batch of edit jobs
+        http_request: The incoming HTTP request, used to identify the session
+        service: Mermaid edit service dependency
+        user_name: Name the session logged in with, for rate limiting
+
+    Returns:
+        StreamingResponse: NDJSON stream of MermaidBatchEditResult lines
+
+    Raises:
+        RateLimitExceeded: If the session or user edits too often (429)
+    """
+    await rate_limiter.check(
+        'edit', rate_limit_keys(http_request, user_name), cost=len(request.jobs)
+    )
+    logger.info(f'Processing Mermaid batch edit request with {len(request.jobs)} jobs')
+
+    session_id = session_key(http_request)
+
+    async def stream() -> AsyncIterator[bytes]:
+        async for result in service.iter_batch_edits(
+            request.jobs,
+            max_concurrency=request.max_concurrency,
+            session_id=session_id,
+        ):
+            yield dumps(result) + b'\n'
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+
+@router.get('/cache/stats')
+async def get_edit_cache_stats(
+    service: MermaidEditService = Depends(get_mermaid_edit_service),
+) -> dict[str, Any]:
+    """
+    Get hit-rate metrics of the Mermaid edit-result cache.
+
+    Args:
+        service: Mermaid edit service dependency
+
+    Returns:
+        Dictionary of cache metrics for this worker
+    """
+    return service.cache_stats()
@@ -24,6 +24,8 @@ from fastapi import APIRouter, HTTPException
 from loguru import logger as _logger
 
 from src.lib.config import settings
+from src.lib.latency import tool_latency
+from src.lib.resilience import gemini_caller
 
 router = APIRouter()
 
@@ -80,3 +82,29 @@ async def health_check():
     """
     _logger.info('Health check requested.')
     return {'status': 'healthy', 'version': settings.API_VERSION}
+
+
+@router.get('/gemini/stats', tags=['Server Info'])
+async def gemini_stats() -> dict:
+    """
+    Get retry, hedging and latency metrics of Gemini calls.
+
+    Latency quantiles are reported separately for calls that were hedged and
+    for calls that were not.
+
+    Returns:
+        dict: Metrics per operation and model for this worker
+    """
+    return gemini_caller.stats()
+
+
+@router.get('/tools/stats', tags=['Server Info'])
+async def tool_stats() -> dict:
+    """
+    Get the measured durations of agent tool calls.
+
+    Returns:
+        dict: Sample counts and latency quantiles per tool and model for this
+        worker
+    """
+    return tool_latency.stats()
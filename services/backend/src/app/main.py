@@ -26,28 +26,57 @@ Features:
 - AI-powered system architecture analysis and diagram generation
 - Static file serving for frontend applications
 - CORS middleware for cross-origin requests
+- Response compression, including streamed SSE events
 - Session management with in-memory storage
 - Health check endpoints
 - Comprehensive logging setup
 - GCP environment configuration
 """
 
+import asyncio
+import importlib
 import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from google.adk.artifacts import InMemoryArtifactService
-from google.adk.sessions import InMemorySessionService
+from fastapi.responses import JSONResponse
 from loguru import logger as _logger
 
 from src.app.api.v1.endpoints import main_v1_router
+from src.app.middleware.compression_middleware import CompressionMiddleware
 from src.app.middleware.session_middleware import SessionMiddleware
+from src.app.services.admission_control import AdmissionRejected
+from src.app.services.bug_ingest_queue import drain_bug_ingest_queue
+from src.app.services.bug_stats import bug_stats
+from src.app.services.bug_storage_service import get_bug_storage_instance
+from src.app.services.rate_limiting import RateLimitExceeded
 from src.app.staticfrontend.router import register_frontend_routes
+from src.app.utils.sse import sse_manager
 from src.lib.config import settings
+from src.lib.genai_client import genai_client_provider
 from src.lib.logging import setup_logging
 
+# Modules imported in the background after startup instead of with the app
+AGENT_STACK_MODULES = (
+    'google.adk.artifacts',
+    'google.adk.runners',
+    'google.adk.sessions',
+    'src.app.services.agent_service',
+)
+
+
+def import_agent_stack() -> None:
+    """
+    Import the agent stack: ADK, the Gemini SDK and the agents.
+
+    These modules make up most of the import time of the application and
+    are otherwise imported by the first request that needs them.
+    """
+    for name in AGENT_STACK_MODULES:
+        importlib.import_module(name)
+
 
 def configure_gcp_environment() -> None:
     """
@@ -74,7 +103,8 @@ async def lifespan(app: FastAPI):
 
     This async context manager manages the application lifecycle, performing
     necessary setup during startup and cleanup during shutdown. It configures
-    logging, validates GCP environment, and initializes the session service.
+    logging and validates GCP environment. The session and artifact services
+    are created on first use.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -89,14 +119,25 @@ async def lifespan(app: FastAPI):
     setup_logging()
     _logger.info('Starting Architecture Designer API...')
     configure_gcp_environment()
-    app.state.session_service = InMemorySessionService()
 
-    # Initialize artifact service with ADK's InMemoryArtifactService
-    app.state.artifact_service = InMemoryArtifactService()
-    _logger.info('Initialized InMemoryArtifactService for artifacts')
+    # Serve requests while the agent stack is imported, so the first agent
+    # query rarely has to wait for it
+    agent_stack = asyncio.create_task(asyncio.to_thread(import_agent_stack))
+
+    # Receive SSE events published by every worker
+    await sse_manager.start()
+
+    # Count stored bug reports without delaying startup
+    stats_rebuild = asyncio.create_task(bug_stats.rebuild(get_bug_storage_instance()))
 
     yield
     _logger.info('Shutting down Architecture Designer API...')
+    stats_rebuild.cancel()
+    agent_stack.cancel()
+    # Save bug reports that were acknowledged but not written yet
+    await drain_bug_ingest_queue()
+    await sse_manager.close()
+    await genai_client_provider.aclose()
 
 
 app = FastAPI(
@@ -110,6 +151,21 @@ app = FastAPI(
 
 app.add_middleware(CORSMiddleware, **settings.cors.model_dump())
 app.add_middleware(SessionMiddleware)
+app.add_middleware(CompressionMiddleware)
+
+
+@app.exception_handler(AdmissionRejected)
+@app.exception_handler(RateLimitExceeded)
+async def too_many_requests_handler(
+    request: Request, exc: AdmissionRejected | RateLimitExceeded
+) -> JSONResponse:
+    """Answer requests turned away by admission control or rate limits."""
+    return JSONResponse(
+        status_code=429,
+        content={'detail': str(exc)},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
+
 
 main_router = APIRouter()
 main_router.include_router(main_v1_router)
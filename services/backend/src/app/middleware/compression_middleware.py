@@ -0,0 +1,204 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Middleware compressing responses with the best coding a client accepts.
+
+Complete bodies are compressed when they are large enough to benefit.
+Streamed bodies, such as Server-Sent Events, are compressed incrementally
+and flushed after every chunk the application sends, so compression never
+holds back an event.
+"""
+
+from __future__ import annotations
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.lib.config import settings
+from src.lib.content_coding import (
+    BrotliStream,
+    GzipStream,
+    accepted_encodings,
+    brotli_available,
+)
+
+# Media types worth compressing; prefixes end with a slash
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        'text/',
+        'application/json',
+        'application/javascript',
+        'application/x-ndjson',
+        'application/xml',
+        'application/manifest+json',
+        'image/svg+xml',
+    }
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    """Return whether a Content-Type is on the compression allowlist."""
+    media_type = content_type.partition(';')[0].strip().lower()
+    return (
+        media_type in COMPRESSIBLE_TYPES
+        or media_type[: media_type.find('/') + 1] in COMPRESSIBLE_TYPES
+    )
+
+
+class CompressionMiddleware:
+    """Middleware compressing responses with brotli or gzip.
+
+    Responses are left alone when the client accepts neither coding, when
+    their media type is not on the allowlist, when they are already encoded
+    (precompressed frontend assets), partial, or marked `no-transform`, and
+    when a complete body is smaller than the threshold.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int | None = None,
+        gzip_level: int | None = None,
+        brotli_quality: int | None = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The application to wrap
+            minimum_size: Smallest complete body that is compressed
+            gzip_level: zlib compression level
+            brotli_quality: Brotli quality, used when brotli is installed
+        """
+        self.app = app
+        self.minimum_size = minimum_size or settings.COMPRESSION_MIN_BYTES
+        self.gzip_level = gzip_level or settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality = brotli_quality or settings.COMPRESSION_BROTLI_QUALITY
+
+    def _coding(self, scope: Scope) -> str | None:
+        """Return the coding to use for a request, if any."""
+        for name, value in scope['headers']:
+            if name == b'accept-encoding':
+                accepted = accepted_encodings(value.decode('latin-1'))
+                if 'br' in accepted and brotli_available():
+                    return 'br'
+                if 'gzip' in accepted:
+                    return 'gzip'
+                return None
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compress the response to a single request."""
+        coding = None
+        if scope['type'] == 'http' and scope['method'] != 'HEAD':
+            coding = self._coding(scope)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        extensions = scope.get('extensions') or {}
+        if 'http.response.pathsend' in extensions:
+            # Files sent by path bypass the body messages we compress
+            extensions = dict(extensions)
+            del extensions['http.response.pathsend']
+            scope = {**scope, 'extensions': extensions}
+
+        responder = _CompressingResponder(
+            send,
+            coding,
+            self.minimum_size,
+            self.gzip_level if coding == 'gzip' else self.brotli_quality,
+        )
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """ASGI send wrapper compressing one response."""
+
+    def __init__(self, send: Send, coding: str, minimum_size: int, level: int):
+        self.send = send
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start: Message | None = None
+        self.stream: GzipStream | BrotliStream | None = None
+
+    def _should_compress(self, message: Message) -> bool:
+        """Return whether the response started by a message is compressed."""
+        if message['status'] < 200 or message['status'] in (204, 206, 304):
+            return False
+        headers = Headers(raw=message['headers'])
+        return (
+            'content-encoding' not in headers
+            and 'content-range' not in headers
+            and 'no-transform' not in headers.get('cache-control', '').lower()
+            and is_compressible(headers.get('content-type', ''))
+        )
+
+    def _encoded_start(self, start: Message, content_length: int | None) -> Message:
+        """Rewrite the response headers for the compressed body."""
+        headers = MutableHeaders(scope=start)
+        headers['Content-Encoding'] = self.coding
+        if content_length is None:
+            del headers['Content-Length']
+        else:
+            headers['Content-Length'] = str(content_length)
+        headers.add_vary_header('Accept-Encoding')
+        # The compressed bytes differ from the ones a strong ETag names
+        etag = headers.get('etag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = f'W/{etag}'
+        return start
+
+    def _new_stream(self) -> GzipStream | BrotliStream:
+        if self.coding == 'br':
+            return BrotliStream(self.level)
+        return GzipStream(self.level)
+
+    async def __call__(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            if self._should_compress(message):
+                self.start = message
+            else:
+                await self.send(message)
+            return
+        if message['type'] != 'http.response.body' or (
+            self.start is None and self.stream is None
+        ):
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if self.stream is None:
+            start, self.start = self.start, None
+            if not more_body:
+                # Complete body: compress it only if it is worth it
+                if len(body) < self.minimum_size:
+                    await self.send(start)
+                    await self.send(message)
+                    return
+                compressed = self._new_stream().finish(body)
+                await self.send(self._encoded_start(start, len(compressed)))
+                await self.send({'type': 'http.response.body', 'body': compressed})
+                return
+            self.stream = self._new_stream()
+            await self.send(self._encoded_start(start, None))
+
+        if more_body:
+            data = self.stream.chunk(body)
+        else:
+            data = self.stream.finish(body)
+        await self.send(
+            {'type': 'http.response.body', 'body': data, 'more_body': more_body}
+        )
@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Middleware for managing user session IDs and authentication via HTTP headers.
+"""Middleware for managing user session IDs via HTTP headers.
 
-This module provides a Starlette/FastAPI middleware that intercepts requests
-to API paths, retrieves or generates a session ID, handles authentication,
-and makes session data available to downstream application logic via the
-request state. It also ensures the session ID is returned in the response headers.
+This module provides a pure ASGI middleware that retrieves or generates a
+session ID for each request, makes it available to downstream application
+logic via the request state, and returns the session ID in the response
+headers. It only reads request headers and rewrites the response start
+message, so streaming responses such as SSE pass through untouched.
 """
 
 from __future__ import annotations
@@ -25,129 +26,101 @@ from __future__ import annotations
 import uuid
 
 from loguru import logger as _logger
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Static frontend assets never need a session
+STATIC_EXTENSIONS = frozenset(
+    {
+        'css',
+        'js',
+        'map',
+        'svg',
+        'png',
+        'jpg',
+        'jpeg',
+        'gif',
+        'ico',
+        'webp',
+        'woff',
+        'woff2',
+        'txt',
+        'json',
+    }
+)
+STATIC_PREFIXES = frozenset({'/_next'})
+
+
+def is_static_path(path: str) -> bool:
+    """Return whether a path is a static asset served without a session.
+
+    Uses one set lookup for the first path segment and one for the
+    extension. API paths are never static, whatever their extension.
+    """
+    if path.startswith('/api/'):
+        return False
+    segment_end = path.find('/', 1)
+    if (path if segment_end < 0 else path[:segment_end]) in STATIC_PREFIXES:
+        return True
+    _, dot, extension = path[path.rfind('/') + 1 :].rpartition('.')
+    return bool(dot) and extension.lower() in STATIC_EXTENSIONS
 
 
-class SessionMiddleware(BaseHTTPMiddleware):
-    """Middleware to manage a session ID and authentication for requests.
+class SessionMiddleware:
+    """Middleware to manage a session ID for requests.
 
     This middleware performs the following steps:
-    1. For paths under `/api/v1/`: Manages session IDs and authentication state
-    2. For static frontend paths: Checks authentication for protected routes
-    3. Looks for existing session ID in the `X-Session-ID` request header
-    4. If no ID is found, generates a new UUIDv4
-    5. Stores session data in `request.state` for downstream use
-    6. Ensures session ID is present in response headers
+    1. Passes static assets and non-HTTP traffic straight through
+    2. Looks for an existing session ID in the `X-Session-ID` request header
+    3. If no ID is found, generates a new UUIDv4
+    4. Stores the ID in the request state as `candidate_session_id`
+    5. Sets `X-Session-ID` on the response to the session actually used
+       (`actual_session_id` in the request state) and exposes it to CORS
+       clients
     """
 
-    def __init__(self, app):
-        super().__init__(app)
-        # Paths that don't require authentication
-        self.public_paths = {
-            '/health',
-            '/docs',
-            '/redoc',
-            '/openapi.json',
-            '/api/v1/auth/login',
-            '/api/v1/auth/logout',
-            '/login',
-            '/login.html',
-            '/_next',  # Next.js static assets
-        }
-
-    def _is_public_path(self, path: str) -> bool:
-        """Check if a path is public and doesn't require authentication."""
-        # Check for common static file extensions
-        if any(
-            path.endswith(ext)
-            for ext in [
-                '.css',
-                '.js',
-                '.svg',
-                '.png',
-                '.jpg',
-                '.jpeg',
-                '.gif',
-                '.ico',
-                '.woff',
-                '.woff2',
-                '.txt',
-                '.json',
-            ]
-        ):
-            return True
-
-        # Check exact matches
-        if path in self.public_paths:
-            return True
-
-        # Check path prefixes for static assets
-        for public_path in self.public_paths:
-            if path.startswith(public_path):
-                return True
-
-        return False
-
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        """Handles the middleware logic for a single request.
-
-        Args:
-            request: The incoming Starlette request.
-            call_next: A function to call the next middleware or endpoint.
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        Returns:
-            The Starlette response.
-        """
-        # Handle session ID for all requests
-        candidate_session_id = request.headers.get('X-Session-ID')
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles the middleware logic for a single request."""
+        if scope['type'] != 'http' or is_static_path(scope['path']):
+            await self.app(scope, receive, send)
+            return
 
+        candidate_session_id = None
+        for name, value in scope['headers']:
+            if name == b'x-session-id':
+                candidate_session_id = value.decode('latin-1')
+                break
         if not candidate_session_id:
             candidate_session_id = str(uuid.uuid4())
-            _logger.info(
-                'Generated new session ID: %s for path: %s',
-                candidate_session_id,
-                request.url.path,
-            )
-        else:
-            _logger.info(
-                'Using existing session ID: %s for path: %s',
-                candidate_session_id,
-                request.url.path,
+            _logger.debug(
+                f'Generated new session ID {candidate_session_id} '
+                f'for path {scope["path"]}'
             )
 
-        # Store the session ID on the request state for access in dependencies
-        request.state.candidate_session_id = candidate_session_id
-
-        response = await call_next(request)
-
-        # Ensure the final session ID from the request lifecycle is in the header
-        actual_session_id = getattr(
-            request.state, 'actual_session_id', candidate_session_id
-        )
-        response.headers['X-Session-ID'] = actual_session_id
-
-        # NOTE: To allow a browser's JavaScript to read the `X-Session-ID`
-        # header, it must be listed in `Access-Control-Expose-Headers`.
-        # TODO: This logic can also be configured globally in the main
-        #       FastAPI CORS middleware setup for better centralization.
-        current_exposed = response.headers.get('Access-Control-Expose-Headers')
-        if current_exposed:
-            exposed_set = {h.strip() for h in current_exposed.split(',')}
-            if 'X-Session-ID' not in exposed_set:
-                exposed_set.add('X-Session-ID')
-                response.headers['Access-Control-Expose-Headers'] = ', '.join(
-                    sorted(list(exposed_set))
+        # Request.state is backed by this dict, so dependencies see the ID
+        # and can record the session they actually used
+        state = scope.setdefault('state', {})
+        state['candidate_session_id'] = candidate_session_id
+
+        async def send_with_session(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers['X-Session-ID'] = state.get(
+                    'actual_session_id', candidate_session_id
                 )
-        else:
-            response.headers['Access-Control-Expose-Headers'] = 'X-Session-ID'
-
-        _logger.info(
-            'Set session ID in response headers: %s for path: %s',
-            actual_session_id,
-            request.url.path,
-        )
-        return response
+                # Browsers only let JavaScript read exposed headers
+                exposed = headers.get('Access-Control-Expose-Headers')
+                if not exposed:
+                    headers['Access-Control-Expose-Headers'] = 'X-Session-ID'
+                elif 'x-session-id' not in {
+                    h.strip().lower() for h in exposed.split(',')
+                }:
+                    headers['Access-Control-Expose-Headers'] = (
+                        f'{exposed}, X-Session-ID'
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_session)
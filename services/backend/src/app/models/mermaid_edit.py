@@ -43,3 +43,11 @@ class EditInstruction(str, Enum):
     SIMPLIFY = 'simplify'
     RESTRUCTURE = 'restructure'
     CUSTOM = 'custom'
+
+
+class EditScope(str, Enum):
+    """Edit scope enumeration."""
+
+    AUTO = 'auto'
+    FULL = 'full'
+    SCOPED = 'scoped'
@@ -18,7 +18,7 @@ from typing import Optional
 
 from pydantic import BaseModel, Field, field_validator
 
-from src.app.models.mermaid_edit import DiagramType
+from src.app.models.mermaid_edit import DiagramType, EditScope
 
 
 class MermaidEditRequest(BaseModel):
@@ -50,6 +50,13 @@ class MermaidEditRequest(BaseModel):
         description='Additional context for editing',
         max_length=1000,
     )
+    edit_scope: EditScope = Field(
+        default=EditScope.AUTO,
+        description=(
+            'Whether to send only the part of the diagram referenced by the '
+            'instructions to the model (auto: only for large diagrams)'
+        ),
+    )
 
     @field_validator('content')
     def validate_content(cls, v: str) -> str:
@@ -103,3 +110,59 @@ class MermaidEditResponse(BaseModel):
         ...,
         description='Type of Mermaid diagram',
     )
+
+
+class MermaidBatchEditJob(MermaidEditRequest):
+    """A single job within a batch edit request."""
+
+    job_id: Optional[str] = Field(
+        default=None,
+        description='Caller-provided identifier echoed back in the result',
+        max_length=200,
+    )
+
+
+class MermaidBatchEditRequest(BaseModel):
+    """Mermaid diagram batch edit request schema."""
+
+    jobs: list[MermaidBatchEditJob] = Field(
+        ...,
+        description='Edit jobs to run',
+        min_length=1,
+        max_length=100,
+    )
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        description='Maximum number of jobs sent to Gemini at once',
+        ge=1,
+        le=16,
+    )
+
+
+class MermaidBatchEditResult(BaseModel):
+    """Result of a single batch edit job, streamed as one NDJSON line."""
+
+    index: int = Field(
+        ...,
+        description='Position of the job in the request',
+    )
+    job_id: Optional[str] = Field(
+        default=None,
+        description='Identifier provided with the job',
+    )
+    success: bool = Field(
+        ...,
+        description='Whether the editing was successful',
+    )
+    content: Optional[str] = Field(
+        default=None,
+        description='Edited Mermaid diagram code',
+    )
+    diagram_type: DiagramType = Field(
+        ...,
+        description='Type of Mermaid diagram',
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description='Error message if the job failed',
+    )
@@ -0,0 +1,40 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Gunicorn worker running the application on uvicorn.
+
+Used by `gunicorn.conf.py`; see that file for how the server is started.
+"""
+
+from uvicorn.workers import UvicornWorker
+
+
+class AppWorker(UvicornWorker):
+    """Uvicorn worker that shuts down within gunicorn's graceful timeout.
+
+    Uvicorn otherwise waits for every connection to close before running
+    the lifespan shutdown, and SSE streams never close on their own. The
+    master would then kill the worker before queued bug reports are saved.
+    Open connections get the graceful timeout minus a reserve for the
+    lifespan shutdown.
+    """
+
+    # Seconds of the graceful timeout kept for the lifespan shutdown
+    LIFESPAN_SHUTDOWN_SECONDS = 5
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(
+            1, self.cfg.graceful_timeout - self.LIFESPAN_SHUTDOWN_SECONDS
+        )
@@ -18,6 +18,19 @@ This package contains business logic services that can be used across different
 parts of the application.
 """
 
-from .agent_service import AgentService, agent_service
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .agent_service import AgentService, agent_service
 
 __all__ = ['AgentService', 'agent_service']
+
+
+def __getattr__(name: str) -> Any:
+    # The agent service pulls in ADK, so it is imported on first access
+    if name in __all__:
+        return getattr(importlib.import_module('.agent_service', __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,290 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Admission control for the Gemini-backed endpoints.
+
+Requests that call Gemini take a slot for the duration of the call. Slots
+are limited in total and per route, so a spike queues requests here
+instead of sending them all to Gemini at once and running into quota
+errors. Waiting requests are admitted by priority (interactive chat before
+single edits before batch jobs) and, within a priority, sessions with the
+fewest requests in flight go first. When the queue is full, or a session
+already has too many requests waiting, new requests are rejected at once
+with a hint of when to retry.
+
+A hedged Gemini request (see `src.lib.resilience`) takes a slot of its own
+on the route of the request sending it, and is only sent if one is free
+without waiting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+from fastapi import Request
+from loguru import logger as _logger
+
+from src.lib.config import settings
+from src.lib.resilience import gemini_caller
+
+# Routes in admission order; lower values are admitted first
+PRIORITIES = {'chat': 0, 'edit': 1, 'batch': 2}
+
+# Route and session of the slot the current request holds
+_held_slot: ContextVar[tuple[str, str] | None] = ContextVar('held_slot', default=None)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(eq=False)
+class _Waiter:
+    route: str
+    session_id: str
+    seq: int
+    future: asyncio.Future = field(repr=False)
+
+
+def session_key(request: Request) -> str:
+    """Return the key requests are grouped by for fairness."""
+    session_id = getattr(request.state, 'candidate_session_id', None)
+    if session_id:
+        return session_id
+    return request.client.host if request.client else 'anonymous'
+
+
+class AdmissionController:
+    """Priority queue in front of a limited number of Gemini slots.
+
+    Counts are kept per process; every worker admits its own requests.
+    """
+
+    # Weight of the latest hold time in the average used for Retry-After
+    HOLD_TIME_WEIGHT = 0.2
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        route_limits: dict[str, int] | None = None,
+        max_queue: int | None = None,
+        max_queued_per_session: int | None = None,
+        queue_timeout: float | None = None,
+        enabled: bool | None = None,
+    ):
+        """Initialize the controller.
+
+        Args:
+            max_concurrency: Slots shared by all routes
+            route_limits: Most slots each route may hold
+            max_queue: Most requests waiting for a slot
+            max_queued_per_session: Most waiting requests of one session
+            queue_timeout: Seconds a request waits before it is rejected
+            enabled: Whether requests are limited at all
+        """
+        self.max_concurrency = max_concurrency or settings.ADMISSION_MAX_CONCURRENCY
+        self.route_limits = route_limits or {
+            'chat': settings.ADMISSION_CHAT_LIMIT,
+            'edit': settings.ADMISSION_EDIT_LIMIT,
+            'batch': settings.ADMISSION_BATCH_LIMIT,
+        }
+        self.max_queue = (
+            settings.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        )
+        self.max_queued_per_session = (
+            max_queued_per_session or settings.ADMISSION_MAX_QUEUED_PER_SESSION
+        )
+        self.queue_timeout = queue_timeout or settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        self.enabled = settings.ADMISSION_ENABLED if enabled is None else enabled
+        self.active = 0
+        self._active_by_route: Counter[str] = Counter()
+        self._active_by_session: Counter[str] = Counter()
+        self._queued_by_session: Counter[str] = Counter()
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._hold_seconds = 5.0
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Return the seconds after which a rejected request should retry."""
+        backlog = (len(self._waiters) + 1) / self.max_concurrency
+        return max(1, math.ceil(self._hold_seconds * backlog))
+
+    def _has_capacity(self, route: str) -> bool:
+        return (
+            self.active < self.max_concurrency
+            and self._active_by_route[route] < self.route_limits[route]
+        )
+
+    def _dequeue(self, waiter: _Waiter):
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            self._queued_by_session[waiter.session_id] -= 1
+            if not self._queued_by_session[waiter.session_id]:
+                del self._queued_by_session[waiter.session_id]
+
+    def _dispatch(self):
+        """Hand free slots to the best waiting requests."""
+        while True:
+            best = best_key = None
+            for waiter in list(self._waiters):
+                if waiter.future.done():
+                    # Timed out or cancelled and not cleaned up yet
+                    self._dequeue(waiter)
+                    continue
+                if not self._has_capacity(waiter.route):
+                    continue
+                key = (
+                    PRIORITIES[waiter.route],
+                    self._active_by_session[waiter.session_id],
+                    waiter.seq,
+                )
+                if best_key is None or key < best_key:
+                    best, best_key = waiter, key
+            if best is None:
+                return
+            self._dequeue(best)
+            self._grant(best.route, best.session_id)
+            best.future.set_result(None)
+
+    def _grant(self, route: str, session_id: str):
+        self.active += 1
+        self._active_by_route[route] += 1
+        self._active_by_session[session_id] += 1
+
+    def release(self, route: str, session_id: str, held_seconds: float) -> None:
+        """Free a slot and admit the next waiting request."""
+        self.active -= 1
+        self._active_by_route[route] -= 1
+        self._active_by_session[session_id] -= 1
+        if not self._active_by_session[session_id]:
+            del self._active_by_session[session_id]
+        self._hold_seconds += self.HOLD_TIME_WEIGHT * (
+            held_seconds - self._hold_seconds
+        )
+        self._dispatch()
+
+    async def acquire(self, route: str, session_id: str) -> None:
+        """Wait for a slot.
+
+        Args:
+            route: Route class, one of PRIORITIES
+            session_id: Session the request belongs to
+
+        Raises:
+            AdmissionRejected: If the queue is full, the session has too many
+              requests waiting or no slot freed up within the queue timeout
+        """
+        if not self._waiters and self._has_capacity(route):
+            self._grant(route, session_id)
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise AdmissionRejected(
+                'Too many requests are waiting; try again later',
+                self.retry_after(),
+            )
+        if self._queued_by_session[session_id] >= self.max_queued_per_session:
+            raise AdmissionRejected(
+                'Too many requests of this session are waiting', self.retry_after()
+            )
+
+        waiter = _Waiter(
+            route,
+            session_id,
+            next(self._seq),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        self._queued_by_session[session_id] += 1
+        self._dispatch()
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the wait was abandoned
+                self.release(route, session_id, 0.0)
+            else:
+                self._dequeue(waiter)
+            if isinstance(e, TimeoutError):
+                _logger.warning(
+                    f'Rejected {route} request of session {session_id} after '
+                    f'waiting {self.queue_timeout}s for a Gemini slot'
+                )
+                raise AdmissionRejected(
+                    'Timed out waiting for capacity; try again later',
+                    self.retry_after(),
+                ) from None
+            raise
+
+    def hedge_slot(self) -> Callable[[], None] | None:
+        """Take a slot for a hedge of the current request, without waiting.
+
+        Returns:
+            A function releasing the slot, or None if no slot is free or
+            requests are waiting for one
+        """
+        held = _held_slot.get()
+        if not self.enabled or held is None:
+            # The request itself was not admitted here
+            return lambda: None
+        route, session_id = held
+        if self._waiters or not self._has_capacity(route):
+            return None
+        self._grant(route, session_id)
+        start = time.monotonic()
+        return lambda: self.release(route, session_id, time.monotonic() - start)
+
+    @asynccontextmanager
+    async def slot(self, route: str, session_id: str) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block.
+
+        Args:
+            route: Route class, one of PRIORITIES
+            session_id: Session the request belongs to
+
+        Raises:
+            AdmissionRejected: If the request is not admitted
+        """
+        if not self.enabled:
+            yield
+            return
+        await self.acquire(route, session_id)
+        start = time.monotonic()
+        outer = _held_slot.get()
+        _held_slot.set((route, session_id))
+        try:
+            yield
+        finally:
+            _held_slot.set(outer)
+            self.release(route, session_id, time.monotonic() - start)
+
+
+admission_controller = AdmissionController()
+gemini_caller.hedge_permit = admission_controller.hedge_slot
@@ -34,6 +34,7 @@ from loguru import logger as _logger
 from src.agents.agent_factory import agent_factory
 from src.app.models import AgentConfig
 from src.app.schemas import AgentResponse, Query
+from src.app.utils.dependencies import get_artifact_service, get_session_service
 from src.app.utils.formatters import format_text_response
 from src.app.utils.sse import sse_manager
 
@@ -57,8 +58,7 @@ class AgentService:
         if not file_artifacts:
             return ''
 
-        # Get artifact service from request
-        artifact_service = request.app.state.artifact_service
+        artifact_service = get_artifact_service(request)
 
         # Check if artifact service is configured (ADK best practice)
         if artifact_service is None:
@@ -240,7 +240,7 @@ class AgentService:
         session_id = getattr(request.state, 'actual_session_id', 'UNKNOWN')
 
         try:
-            session_service = request.app.state.session_service
+            session_service = get_session_service(request)
             self._logger.info(
                 "Running agent for session '%s' with query: '%s...'",
                 session_id,
@@ -0,0 +1,227 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Write-behind queue for bug report ingestion."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+from loguru import logger as _logger
+
+from src.app.services.bug_stats import bug_stats
+from src.app.services.bug_storage_service import (
+    BugStorageBackend,
+    get_bug_storage_instance,
+)
+from src.lib.config import settings
+
+
+class BugIngestQueue:
+    """Queue that acknowledges bug reports and saves them in batches.
+
+    A background worker collects submitted reports until a batch is full or
+    the flush interval has passed since the first one, then saves them with a
+    single `save_bugs` call. Reports stay readable through `get_pending` until
+    they are saved. Submissions wait once `max_pending` reports are queued,
+    so a storage outage slows clients down instead of growing memory.
+
+    Reports of a batch that could not be saved are kept and saved with the
+    next flush. Those beyond `max_pending`, and any still unsaved when the
+    queue is drained, are appended to `fallback_file` as JSON lines.
+    """
+
+    # Attempts to save a batch before it is kept for the next flush
+    SAVE_ATTEMPTS = 3
+    # Delay before the first retry, doubled on every further one
+    RETRY_DELAY_SECONDS = 0.5
+
+    def __init__(
+        self,
+        storage: BugStorageBackend,
+        max_batch: int | None = None,
+        flush_interval: float | None = None,
+        max_pending: int | None = None,
+        fallback_file: str | Path | None = None,
+    ):
+        """Initialize the queue.
+
+        Args:
+            storage: Backend the batches are saved to
+            max_batch: Most reports saved in one call
+            flush_interval: Seconds to wait for a batch to fill
+            max_pending: Unsaved reports above which submissions wait
+            fallback_file: JSON lines file receiving reports that could not
+              be saved
+        """
+        self.storage = storage
+        self.max_batch = max_batch or settings.BUG_QUEUE_MAX_BATCH
+        self.flush_interval = flush_interval or settings.BUG_QUEUE_FLUSH_SECONDS
+        self.max_pending = max_pending or settings.BUG_QUEUE_MAX_PENDING
+        self.fallback_file = Path(fallback_file or settings.BUG_QUEUE_FALLBACK_FILE)
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._pending: dict[str, dict[str, Any]] = {}
+        # Dequeued reports whose save failed, oldest first
+        self._unsaved: list[dict[str, Any]] = []
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of submitted reports not saved yet."""
+        return len(self._pending)
+
+    def get_pending(self, bug_id: str) -> dict[str, Any] | None:
+        """Return a submitted report that has not been saved yet."""
+        return self._pending.get(bug_id)
+
+    def _ensure_worker(self):
+        """Start the worker on the running event loop if it is not running."""
+        if self._worker is not None and not self._worker.done():
+            if self._worker.get_loop() is asyncio.get_running_loop():
+                return
+        self._queue = asyncio.Queue(self.max_pending)
+        self._worker = asyncio.create_task(self._run_worker())
+
+    async def submit(self, bug_data: dict[str, Any]) -> None:
+        """Queue a bug report for saving.
+
+        Args:
+            bug_data: Bug report data including its `bug_id`
+        """
+        self._ensure_worker()
+        self._pending[bug_data['bug_id']] = bug_data
+        await self._queue.put(bug_data)
+
+    async def _run_worker(self):
+        """Collect reports into batches and save them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # With unsaved reports, flush again after the interval regardless
+            batch = [] if self._unsaved else [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]):
+        """Save a batch and earlier unsaved reports, retrying with backoff."""
+        # Until saved, the reports stay in `_unsaved`, even if cancelled
+        reports = self._unsaved + batch
+        self._unsaved = reports
+        try:
+            for attempt in range(1, self.SAVE_ATTEMPTS + 1):
+                try:
+                    await self.storage.save_bugs(reports)
+                    break
+                except Exception as e:
+                    if attempt == self.SAVE_ATTEMPTS:
+                        _logger.error(
+                            f'Failed to save {len(reports)} bug reports, keeping '
+                            f'them for the next flush: {e}'
+                        )
+                        self._spill(len(reports) - self.max_pending)
+                        return
+                    _logger.warning(
+                        f'Failed to save {len(reports)} bug reports '
+                        f'(attempt {attempt}): {e}'
+                    )
+                    await asyncio.sleep(self.RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+
+            self._saved(reports)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _saved(self, reports: list[dict[str, Any]]):
+        """Forget saved reports and count them in the bug statistics."""
+        self._unsaved = []
+        for bug_data in reports:
+            self._pending.pop(bug_data['bug_id'], None)
+            bug_stats.add(bug_data)
+
+    def _spill(self, count: int):
+        """Move the oldest unsaved reports to the fallback file."""
+        if count <= 0:
+            return
+        spilled, self._unsaved = self._unsaved[:count], self._unsaved[count:]
+        try:
+            self.fallback_file.parent.mkdir(parents=True, exist_ok=True)
+            with self.fallback_file.open('a', encoding='utf-8') as f:
+                for bug_data in spilled:
+                    f.write(json.dumps(bug_data, ensure_ascii=False) + '\n')
+        except OSError as e:
+            bug_ids = ', '.join(bug['bug_id'] for bug in spilled)
+            _logger.error(f'Lost bug reports {bug_ids}: {e}')
+        else:
+            _logger.error(
+                f'Wrote {len(spilled)} unsaved bug reports to {self.fallback_file}'
+            )
+        for bug_data in spilled:
+            self._pending.pop(bug_data['bug_id'], None)
+
+    async def drain(self):
+        """Save every queued report and stop the worker.
+
+        Reports that still cannot be saved are written to the fallback file.
+        """
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._unsaved:
+            try:
+                await self.storage.save_bugs(self._unsaved)
+            except Exception as e:
+                _logger.error(f'Failed to save bug reports while draining: {e}')
+                self._spill(len(self._unsaved))
+            else:
+                self._saved(self._unsaved)
+        self._worker = None
+        self._queue = None
+        _logger.info('Drained the bug report queue')
+
+
+_bug_ingest_queue: BugIngestQueue | None = None
+
+
+def get_bug_ingest_queue() -> BugIngestQueue:
+    """Get or create the singleton bug ingest queue.
+
+    Returns:
+        Queue saving to the bug storage singleton
+    """
+    global _bug_ingest_queue
+    if _bug_ingest_queue is None:
+        _bug_ingest_queue = BugIngestQueue(get_bug_storage_instance())
+    return _bug_ingest_queue
+
+
+async def drain_bug_ingest_queue() -> None:
+    """Save reports still queued, if the queue was ever used."""
+    if _bug_ingest_queue is not None:
+        await _bug_ingest_queue.drain()
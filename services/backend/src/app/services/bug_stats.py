@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incrementally maintained bug report counters."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from loguru import logger as _logger
+
+from src.app.services.bug_storage_service import BugStorageBackend
+
+# User agent markers checked in order; Android and ChromeOS agents also
+# mention Linux, and iOS agents mention Mac OS X
+_PLATFORMS = (
+    ('Android', 'Android'),
+    ('iPhone', 'iOS'),
+    ('iPad', 'iOS'),
+    ('CrOS', 'ChromeOS'),
+    ('Windows', 'Windows'),
+    ('Macintosh', 'macOS'),
+    ('Mac OS X', 'macOS'),
+    ('Linux', 'Linux'),
+)
+
+
+def platform_from_user_agent(user_agent: str | None) -> str:
+    """Return the operating system named in a browser user agent."""
+    for marker, platform in _PLATFORMS:
+        if user_agent and marker in user_agent:
+            return platform
+    return 'unknown'
+
+
+class BugStats:
+    """Counts of bug reports by status, day and platform.
+
+    Counters are updated in constant time for every saved report and rebuilt
+    from storage at startup. Reports are counted once per bug ID, so reports
+    saved while a rebuild is running are not counted twice. Counts are kept
+    per process.
+    """
+
+    def __init__(self):
+        self.by_status: Counter[str] = Counter()
+        self.by_day: Counter[str] = Counter()
+        self.by_platform: Counter[str] = Counter()
+        self.ready = False
+        self._statuses: dict[str, str] = {}
+
+    @property
+    def total(self) -> int:
+        """Return the number of counted reports."""
+        return len(self._statuses)
+
+    def add(self, bug_data: dict[str, Any]) -> None:
+        """Count a saved bug report unless it was counted already."""
+        bug_id = bug_data.get('bug_id')
+        if bug_id is None or bug_id in self._statuses:
+            return
+        status = bug_data.get('status') or 'unknown'
+        self._statuses[bug_id] = status
+        self.by_status[status] += 1
+        self.by_day[(bug_data.get('timestamp') or '')[:10] or 'unknown'] += 1
+        self.by_platform[platform_from_user_agent(bug_data.get('user_agent'))] += 1
+
+    async def rebuild(self, storage: BugStorageBackend) -> None:
+        """Count every report already in storage."""
+        try:
+            for bug_data in await storage.list_bugs():
+                self.add(bug_data)
+        except Exception as e:
+            _logger.error(f'Failed to rebuild bug statistics: {e}')
+            return
+        self.ready = True
+        _logger.info(f'Rebuilt bug statistics from {self.total} reports')
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current counts."""
+        return {
+            'ready': self.ready,
+            'total': self.total,
+            'by_status': dict(self.by_status),
+            'by_day': dict(sorted(self.by_day.items())),
+            'by_platform': dict(self.by_platform),
+        }
+
+
+bug_stats = BugStats()
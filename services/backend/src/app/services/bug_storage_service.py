@@ -16,24 +16,68 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import copy
+import gzip
+import heapq
+import itertools
 import json
+import os
+import sqlite3
+import time
+import uuid
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Callable
 
 from loguru import logger as _logger
 
 from src.lib.config import settings
+from src.lib.search import InvertedIndex, tokenize
 
 
 class BugStorageBackend(ABC):
     """Abstract base class for bug storage backends."""
 
+    # Pool running the blocking I/O; None uses the event loop's default pool
+    _executor: ThreadPoolExecutor | None = None
+    # Seconds a caller waits for one storage call
+    timeout: float | None = None
+    # In-process search index of backends without one of their own
+    _search_index: InvertedIndex | None = None
+    _search_summaries: dict[str, dict[str, Any]] | None = None
+    _search_refreshed = 0.0
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking storage I/O off the event loop.
+
+        Raises:
+            TimeoutError: If the call does not finish within `timeout`
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._executor, func, *args), self.timeout
+        )
+
     @abstractmethod
     async def save_bug(self, bug_data: dict[str, Any]) -> None:
         """Save a bug report."""
         pass
 
+    async def save_bugs(self, bug_list: list[dict[str, Any]]) -> None:
+        """Save several bug reports.
+
+        Backends that can write a batch at once override this.
+
+        Args:
+            bug_list: Bug reports to save, in submission order
+        """
+        for bug_data in bug_list:
+            await self.save_bug(bug_data)
+
     @abstractmethod
     async def list_bugs(self) -> list[dict[str, Any]]:
         """List all bug reports."""
@@ -44,33 +88,549 @@ class BugStorageBackend(ABC):
         """Get a specific bug report by ID."""
         pass
 
+    async def iter_bug_summaries(
+        self, status: str | None = None, user_name: str | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield summaries of bug reports, optionally filtered.
+
+        Backends with an index override this to avoid loading every report.
+
+        Args:
+            status: Only include reports with this status
+            user_name: Only include reports submitted by this user
+
+        Yields:
+            Bug report summaries in storage order
+        """
+        for bug_data in await self.list_bugs():
+            summary = summarize_bug(bug_data)
+            if _matches(summary, status, user_name):
+                yield summary
+
+    async def list_bug_summaries(
+        self, status: str | None = None, user_name: str | None = None
+    ) -> list[dict[str, Any]]:
+        """List summaries of bug reports, optionally filtered.
+
+        Args:
+            status: Only include reports with this status
+            user_name: Only include reports submitted by this user
+
+        Returns:
+            List of bug report summaries
+        """
+        return [summary async for summary in self.iter_bug_summaries(status, user_name)]
+
+    async def page_bug_summaries(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: str | None = None,
+        user_name: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one page of summaries, most recent first.
+
+        Summaries are streamed through a heap bounded by the page size, so
+        only `limit + 1` of them are held at a time.
+
+        Args:
+            limit: Maximum number of summaries to return
+            cursor: Cursor returned with the previous page
+            status: Only include reports with this status
+            user_name: Only include reports submitted by this user
+
+        Returns:
+            The page and the cursor of the next page, or None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        heap: list[tuple[tuple[str, str], int, dict[str, Any]]] = []
+        counter = itertools.count()
+        async for summary in self.iter_bug_summaries(status, user_name):
+            key = _sort_key(summary)
+            if after is not None and key >= after:
+                continue
+            entry = (key, next(counter), summary)
+            if len(heap) <= limit:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+
+        page = [summary for _, _, summary in sorted(heap, reverse=True)]
+        return _paginate(page, limit)
+
+    async def search_bugs(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return one page of summaries of reports matching a text query.
+
+        Reports mentioning any query term match; the description, user name
+        and chat messages are searched. This implementation keeps an
+        in-process inverted index that picks up new reports at most every
+        `BUGS_SEARCH_REFRESH_SECONDS`.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of summaries to return
+            offset: Number of best matches to skip
+
+        Returns:
+            The page, best match first, and the offset of the next page or
+            None on the last page
+        """
+        await self._refresh_search_index()
+        hits = self._search_index.search(query, limit + 1, offset)
+        page = [
+            {**self._search_summaries[bug_id], 'score': round(score, 4)}
+            for bug_id, score in hits
+        ]
+        return page[:limit], offset + limit if len(page) > limit else None
+
+    async def _refresh_search_index(self) -> None:
+        """Add reports saved since the last refresh to the search index."""
+        now = time.monotonic()
+        if self._search_index is not None and (
+            now - self._search_refreshed < settings.BUGS_SEARCH_REFRESH_SECONDS
+        ):
+            return
+        if self._search_index is None:
+            self._search_index = InvertedIndex()
+            self._search_summaries = {}
+        self._search_refreshed = now
+
+        for bug_data in await self._unindexed_bugs(self._search_index):
+            bug_id = bug_data.get('bug_id')
+            if bug_id is None or bug_id in self._search_index:
+                continue
+            self._search_index.add(bug_id, ' '.join(search_fields(bug_data)))
+            self._search_summaries[bug_id] = summarize_bug(bug_data)
+
+    async def _unindexed_bugs(self, indexed: InvertedIndex) -> list[dict[str, Any]]:
+        """Return the reports missing from the search index.
+
+        This implementation reads every report; backends that can tell new
+        reports apart override it.
+
+        Args:
+            indexed: Search index built so far
+
+        Returns:
+            Full bug reports, payloads included
+        """
+        bug_reports = []
+        for record in await self.list_bugs():
+            bug_id = record.get('bug_id')
+            if bug_id is None or bug_id in indexed:
+                continue
+            # Chat content of large reports lives in their payload
+            if 'payload' in record:
+                record = await self.get_bug(bug_id) or record
+            bug_reports.append(record)
+        return bug_reports
+
+
+def summarize_bug(bug_data: dict[str, Any]) -> dict[str, Any]:
+    """Return the list view fields of a bug report.
+
+    Args:
+        bug_data: Full bug report data
+
+    Returns:
+        Bug report summary
+    """
+    description = bug_data.get('description', '')
+    payload = bug_data.get('payload') or {}
+    return {
+        'bug_id': bug_data.get('bug_id'),
+        'timestamp': bug_data.get('timestamp'),
+        'user_name': bug_data.get('user_name', 'Anonymous'),
+        'description': (
+            description[:100] + '...' if len(description) > 100 else description
+        ),
+        'status': bug_data.get('status', 'unknown'),
+        'has_diagram': (
+            bug_data.get('diagram') is not None or payload.get('has_diagram', False)
+        ),
+        'chat_messages_count': (
+            len(bug_data.get('chat_history') or [])
+            or payload.get('chat_messages_count', 0)
+        ),
+    }
+
+
+def search_fields(bug_data: dict[str, Any]) -> tuple[str, str, str]:
+    """Return the description, user name and chat text searched in a report."""
+    chat = '\n'.join(
+        str(message.get('content', ''))
+        for message in bug_data.get('chat_history') or []
+        if isinstance(message, dict)
+    )
+    return (
+        bug_data.get('description') or '',
+        bug_data.get('user_name') or '',
+        chat,
+    )
+
+
+# Report fields stored outside the report line when they are large
+PAYLOAD_FIELDS = ('diagram', 'chat_history')
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    """Compress a payload with 'gzip' or 'zstd'."""
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError(
+                'The zstandard package is required for zstd payloads; '
+                'install it with `uv sync --extra zstd`'
+            ) from e
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """Decompress a payload written by `_compress`."""
+    if codec == 'zstd':
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def split_payloads(
+    bug_list: list[dict[str, Any]], name: str, codec: str, min_bytes: int
+) -> tuple[list[dict[str, Any]], bytes]:
+    """Move the large fields of bug reports into one compressed payload blob.
+
+    Each report whose `PAYLOAD_FIELDS` serialize to at least `min_bytes` is
+    compressed on its own and appended to the blob. Its record keeps every
+    other field plus a `payload` reference holding the byte range in `name`
+    and the summary columns derived from the moved fields.
+
+    Args:
+        bug_list: Full bug reports
+        name: Key the payload blob will be stored under
+        codec: 'gzip' or 'zstd'
+        min_bytes: Smallest payload moved out of the record
+
+    Returns:
+        The records to store and the payload blob, empty if nothing was moved
+    """
+    records, chunks, offset = [], [], 0
+    for bug_data in bug_list:
+        payload = {
+            field: bug_data[field]
+            for field in PAYLOAD_FIELDS
+            if bug_data.get(field) is not None
+        }
+        raw = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        if not payload or len(raw) < min_bytes:
+            records.append(bug_data)
+            continue
+
+        chunk = _compress(raw, codec)
+        record = {k: v for k, v in bug_data.items() if k not in PAYLOAD_FIELDS}
+        record['payload'] = {
+            'object': name,
+            'start': offset,
+            'length': len(chunk),
+            'codec': codec,
+            'has_diagram': bug_data.get('diagram') is not None,
+            'chat_messages_count': len(bug_data.get('chat_history') or []),
+        }
+        records.append(record)
+        chunks.append(chunk)
+        offset += len(chunk)
+    return records, b''.join(chunks)
+
+
+def merge_payload(record: dict[str, Any], chunk: bytes) -> dict[str, Any]:
+    """Restore a full bug report from its record and compressed payload."""
+    bug_data = {k: v for k, v in record.items() if k != 'payload'}
+    bug_data.update(json.loads(_decompress(chunk, record['payload']['codec'])))
+    return bug_data
+
+
+def encode_cursor(key: tuple[str, str]) -> str:
+    """Encode a (timestamp, bug_id) position as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor created by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        timestamp, bug_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+    return str(timestamp), str(bug_id)
+
+
+def _sort_key(summary: dict[str, Any]) -> tuple[str, str]:
+    """Return the pagination order key of a summary."""
+    return summary.get('timestamp') or '', summary.get('bug_id') or ''
+
+
+def _paginate(
+    page: list[dict[str, Any]], limit: int
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Trim a page fetched with one extra item and derive the next cursor."""
+    if len(page) <= limit:
+        return page, None
+    return page[:limit], encode_cursor(_sort_key(page[limit - 1]))
+
+
+def _matches(summary: dict[str, Any], status: str | None, user_name: str | None):
+    """Return whether a summary passes the list filters."""
+    return (status is None or summary['status'] == status) and (
+        user_name is None or summary['user_name'] == user_name
+    )
+
 
 class LocalBugStorage(BugStorageBackend):
-    """Local file system storage for bug reports."""
+    """Local file system storage for bug reports.
+
+    Reports are appended to a JSONL file. An SQLite sidecar maps each bug ID
+    to its byte range in the file and keeps the list view columns, so lookups
+    and filtered listings do not parse the whole history. The index catches up
+    with lines appended since it was last updated, including by other
+    processes, before every query.
+
+    Batches are appended with a single write and flushed to disk with fsync
+    once per batch, or after every report in `report` durability mode.
+    Reports whose ID is already in the file are skipped, so retrying a save
+    that timed out while its write went on does not store them twice.
+
+    Large diagrams and chat histories are compressed into one file per batch
+    under `payloads/`, so lines and index rows stay small; `get_bug` reads
+    the payload range of the requested report only.
 
-    def __init__(self, bugs_dir: str = 'bugs'):
+    The sidecar also holds an FTS5 table over descriptions, user names and
+    chat messages, updated with the rest of the index, for ranked search.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bugs (
+            bug_id TEXT PRIMARY KEY,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            timestamp TEXT,
+            status TEXT,
+            user_name TEXT,
+            description TEXT,
+            has_diagram INTEGER,
+            chat_messages_count INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS bugs_status ON bugs (status);
+        CREATE INDEX IF NOT EXISTS bugs_user_name ON bugs (user_name);
+        CREATE INDEX IF NOT EXISTS bugs_timestamp ON bugs (timestamp, bug_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+        CREATE VIRTUAL TABLE IF NOT EXISTS bugs_fts USING fts5(
+            bug_id UNINDEXED, description, user_name, chat
+        );
+    """
+
+    def __init__(
+        self,
+        bugs_dir: str = 'bugs',
+        timeout: float | None = None,
+        durability: str = 'batch',
+        payload_codec: str | None = None,
+        payload_min_bytes: int | None = None,
+    ):
         """Initialize local bug storage.
 
         Args:
             bugs_dir: Directory to store bug reports
+            timeout: Seconds to wait for one storage call
+            durability: Whether to fsync once per 'batch' or per 'report'
+            payload_codec: Compression of stored payloads, 'gzip' or 'zstd'
+            payload_min_bytes: Smallest payload stored outside its record
         """
+        # A single thread serializes appends and index updates
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='bug-storage')
+        self.timeout = timeout or settings.BUGS_IO_TIMEOUT_SECONDS
+        self.durability = durability
+        self.payload_codec = payload_codec or settings.BUGS_PAYLOAD_CODEC
+        self.payload_min_bytes = (
+            payload_min_bytes
+            if payload_min_bytes is not None
+            else settings.BUGS_PAYLOAD_MIN_BYTES
+        )
         self.bugs_dir = Path(bugs_dir)
         self.bugs_dir.mkdir(exist_ok=True)
         self.bugs_file = self.bugs_dir / 'bug_reports.jsonl'
+        self.payloads_dir = self.bugs_dir / 'payloads'
+        self.payloads_dir.mkdir(exist_ok=True)
+        self.index_file = self.bugs_dir / 'bug_index.sqlite3'
+        self._db = sqlite3.connect(self.index_file, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        has_fts = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'bugs_fts'"
+        ).fetchone()
+        self._db.executescript(self._SCHEMA)
+        if not has_fts:
+            # Index created before search existed; rebuild it to fill bugs_fts
+            with self._db:
+                self._db.execute('DELETE FROM bugs')
+                self._db.execute("DELETE FROM meta WHERE key = 'indexed_bytes'")
         _logger.info(f'Initialized local bug storage at {self.bugs_file}')
 
+    def _indexed_bytes(self) -> int:
+        """Return how much of the JSONL file the index covers."""
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'indexed_bytes'"
+        ).fetchone()
+        return row['value'] if row else 0
+
+    def _sync_index(self) -> None:
+        """Index lines appended to the JSONL file since the last sync."""
+        size = self.bugs_file.stat().st_size if self.bugs_file.exists() else 0
+        indexed = self._indexed_bytes()
+        if size == indexed:
+            return
+
+        with self._db:
+            if size < indexed:
+                # The file was replaced or truncated; rebuild from scratch
+                _logger.warning('Bug report file shrank; rebuilding the index')
+                self._db.execute('DELETE FROM bugs')
+                self._db.execute('DELETE FROM bugs_fts')
+                indexed = 0
+
+            rows = []
+            offset = indexed
+            with self.bugs_file.open('rb') as f:
+                f.seek(indexed)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        # Partially written line; index it on a later sync
+                        break
+                    line_offset, offset = offset, offset + len(raw)
+                    if not raw.strip():
+                        continue
+                    try:
+                        bug_data = json.loads(raw)
+                    except json.JSONDecodeError as e:
+                        _logger.warning(
+                            f'Error parsing bug report at byte {line_offset}: {e}'
+                        )
+                        continue
+                    summary = summarize_bug(bug_data)
+                    rows.append(
+                        (
+                            (
+                                summary['bug_id'],
+                                line_offset,
+                                len(raw),
+                                summary['timestamp'] or '',
+                                summary['status'],
+                                summary['user_name'],
+                                summary['description'],
+                                summary['has_diagram'],
+                                summary['chat_messages_count'],
+                            ),
+                            bug_data,
+                        )
+                    )
+
+            for row, bug_data in rows:
+                # The first line wins when an ID appears more than once
+                inserted = self._db.execute(
+                    'INSERT OR IGNORE INTO bugs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', row
+                ).rowcount
+                if inserted:
+                    self._db.execute(
+                        'INSERT INTO bugs_fts VALUES (?, ?, ?, ?)',
+                        (row[0], *search_fields(self._with_payload(bug_data))),
+                    )
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('indexed_bytes', ?)", (offset,)
+            )
+
     async def save_bug(self, bug_data: dict[str, Any]) -> None:
         """Save a bug report to local JSONL file.
 
         Args:
             bug_data: Bug report data to save
         """
+        return await self.save_bugs([bug_data])
+
+    async def save_bugs(self, bug_list: list[dict[str, Any]]) -> None:
+        """Append bug reports to the local JSONL file in one write.
+
+        Args:
+            bug_list: Bug reports to save, in submission order
+        """
+        return await self._run(self._save_bugs, bug_list)
+
+    def _new_reports(self, bug_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Drop reports that are already saved or repeated in the batch."""
+        self._sync_index()
+        bug_ids = [bug_data.get('bug_id') for bug_data in bug_list]
+        placeholders = ', '.join('?' * len(bug_ids))
+        seen = {
+            row['bug_id']
+            for row in self._db.execute(
+                f'SELECT bug_id FROM bugs WHERE bug_id IN ({placeholders})', bug_ids
+            )
+        }
+        new_reports = []
+        for bug_id, bug_data in zip(bug_ids, bug_list):
+            if bug_id is not None and bug_id in seen:
+                continue
+            seen.add(bug_id)
+            new_reports.append(bug_data)
+        if len(new_reports) < len(bug_list):
+            _logger.warning(
+                f'Skipped {len(bug_list) - len(new_reports)} bug reports '
+                f'that were already saved'
+            )
+        return new_reports
+
+    def _save_bugs(self, bug_list: list[dict[str, Any]]) -> None:
+        """Blocking implementation of `save_bugs`."""
         try:
+            bug_list = self._new_reports(bug_list)
+            if not bug_list:
+                return
+            name = f'{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.{self.payload_codec}'
+            bug_list, payloads = split_payloads(
+                bug_list, name, self.payload_codec, self.payload_min_bytes
+            )
+            if payloads:
+                # Payloads reach the disk before any line referencing them
+                with (self.payloads_dir / name).open('wb') as f:
+                    f.write(payloads)
+                    f.flush()
+                    os.fsync(f.fileno())
+
             with self.bugs_file.open('a', encoding='utf-8') as f:
-                f.write(json.dumps(bug_data, ensure_ascii=False) + '\n')
-            _logger.info(f'Saved bug report {bug_data.get("bug_id")} locally')
+                if self.durability == 'report':
+                    for bug_data in bug_list:
+                        f.write(json.dumps(bug_data, ensure_ascii=False) + '\n')
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    f.write(
+                        ''.join(
+                            json.dumps(bug_data, ensure_ascii=False) + '\n'
+                            for bug_data in bug_list
+                        )
+                    )
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._sync_index()
+            _logger.info(f'Saved {len(bug_list)} bug reports locally')
         except Exception as e:
-            _logger.error(f'Failed to save bug to local storage: {e}')
+            _logger.error(f'Failed to save bugs to local storage: {e}')
             raise
 
     async def list_bugs(self) -> list[dict[str, Any]]:
@@ -79,7 +639,15 @@ class LocalBugStorage(BugStorageBackend):
         Returns:
             List of bug report dictionaries
         """
+        return await self._run(self._list_bugs)
+
+    def _list_bugs(self) -> list[dict[str, Any]]:
+        """Blocking implementation of `list_bugs`.
+
+        Like the index, keeps the first line of a bug ID written twice.
+        """
         bug_reports = []
+        seen: set[str] = set()
 
         if not self.bugs_file.exists():
             return bug_reports
@@ -92,6 +660,11 @@ class LocalBugStorage(BugStorageBackend):
                         if not line:
                             continue
                         bug_data = json.loads(line)
+                        bug_id = bug_data.get('bug_id')
+                        if bug_id is not None:
+                            if bug_id in seen:
+                                continue
+                            seen.add(bug_id)
                         bug_reports.append(bug_data)
                     except json.JSONDecodeError as e:
                         _logger.warning(
@@ -104,6 +677,108 @@ class LocalBugStorage(BugStorageBackend):
 
         return bug_reports
 
+    _SUMMARY_QUERY = (
+        'SELECT bug_id, timestamp, user_name, description, status, '
+        'has_diagram, chat_messages_count FROM bugs '
+        'WHERE (:status IS NULL OR status = :status) '
+        'AND (:user_name IS NULL OR user_name = :user_name) '
+    )
+
+    @staticmethod
+    def _summary_from_row(row: sqlite3.Row) -> dict[str, Any]:
+        """Convert an index row to a summary."""
+        return {
+            **dict(row),
+            'timestamp': row['timestamp'] or None,
+            'has_diagram': bool(row['has_diagram']),
+        }
+
+    def _query_summaries(
+        self, status: str | None, user_name: str | None
+    ) -> sqlite3.Cursor:
+        """Bring the index up to date and start a summary query on it."""
+        try:
+            self._sync_index()
+            return self._db.execute(
+                self._SUMMARY_QUERY + 'ORDER BY timestamp DESC, bug_id DESC',
+                {'status': status, 'user_name': user_name},
+            )
+        except Exception as e:
+            _logger.error(f'Failed to list bugs from local index: {e}')
+            raise
+
+    async def iter_bug_summaries(
+        self, status: str | None = None, user_name: str | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield bug report summaries from the index, most recent first.
+
+        Args:
+            status: Only include reports with this status
+            user_name: Only include reports submitted by this user
+
+        Yields:
+            Bug report summaries
+        """
+        rows = await self._run(self._query_summaries, status, user_name)
+        while batch := await self._run(rows.fetchmany, 256):
+            for row in batch:
+                yield self._summary_from_row(row)
+
+    async def page_bug_summaries(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: str | None = None,
+        user_name: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return one page of summaries with a keyset query on the index.
+
+        Args:
+            limit: Maximum number of summaries to return
+            cursor: Cursor returned with the previous page
+            status: Only include reports with this status
+            user_name: Only include reports submitted by this user
+
+        Returns:
+            The page and the cursor of the next page, or None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return await self._run(
+            self._page_bug_summaries, limit, cursor, status, user_name
+        )
+
+    def _page_bug_summaries(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: str | None = None,
+        user_name: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Blocking implementation of `page_bug_summaries`."""
+        timestamp, bug_id = decode_cursor(cursor) if cursor else (None, None)
+        try:
+            self._sync_index()
+            rows = self._db.execute(
+                self._SUMMARY_QUERY
+                + 'AND (:timestamp IS NULL OR timestamp < :timestamp '
+                'OR (timestamp = :timestamp AND bug_id < :bug_id)) '
+                'ORDER BY timestamp DESC, bug_id DESC LIMIT :limit',
+                {
+                    'status': status,
+                    'user_name': user_name,
+                    'timestamp': timestamp,
+                    'bug_id': bug_id,
+                    'limit': limit + 1,
+                },
+            ).fetchall()
+        except Exception as e:
+            _logger.error(f'Failed to page bugs from local index: {e}')
+            raise
+
+        return _paginate([self._summary_from_row(row) for row in rows], limit)
+
     async def get_bug(self, bug_id: str) -> dict[str, Any] | None:
         """Get a specific bug report by ID from local storage.
 
@@ -113,40 +788,103 @@ class LocalBugStorage(BugStorageBackend):
         Returns:
             Bug report data or None if not found
         """
-        if not self.bugs_file.exists():
-            return None
+        return await self._run(self._get_bug, bug_id)
 
+    def _get_bug(self, bug_id: str) -> dict[str, Any] | None:
+        """Blocking implementation of `get_bug`."""
         try:
-            with self.bugs_file.open('r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        bug_data = json.loads(line)
-                        if bug_data.get('bug_id') == bug_id:
-                            return bug_data
-                    except json.JSONDecodeError:
-                        continue
+            self._sync_index()
+            row = self._db.execute(
+                'SELECT offset, length FROM bugs WHERE bug_id = ?', (bug_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            with self.bugs_file.open('rb') as f:
+                f.seek(row['offset'])
+                return self._with_payload(json.loads(f.read(row['length'])))
         except Exception as e:
             _logger.error(f'Failed to get bug from local storage: {e}')
             raise
 
-        return None
+    def _with_payload(self, bug_data: dict[str, Any]) -> dict[str, Any]:
+        """Return a full report, reading its payload file range if it has one."""
+        payload = bug_data.get('payload')
+        if payload is None:
+            return bug_data
+        with (self.payloads_dir / payload['object']).open('rb') as f:
+            f.seek(payload['start'])
+            return merge_payload(bug_data, f.read(payload['length']))
+
+    async def search_bugs(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return one page of summaries ranked by the FTS5 index.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of summaries to return
+            offset: Number of best matches to skip
+
+        Returns:
+            The page, best match first, and the offset of the next page or
+            None on the last page
+        """
+        return await self._run(self._search_bugs, query, limit, offset)
+
+    def _search_bugs(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Blocking implementation of `search_bugs`."""
+        terms = dict.fromkeys(tokenize(query))
+        if not terms:
+            return [], None
+        # Quoted terms keep FTS5 operators in user input from being parsed
+        match = ' OR '.join(f'"{term}"' for term in terms)
+        try:
+            self._sync_index()
+            rows = self._db.execute(
+                'SELECT b.bug_id, b.timestamp, b.user_name, b.description, '
+                'b.status, b.has_diagram, b.chat_messages_count, '
+                '-bm25(bugs_fts, 0, 2.0, 1.0, 1.0) AS score '
+                'FROM bugs_fts JOIN bugs b ON b.bug_id = bugs_fts.bug_id '
+                'WHERE bugs_fts MATCH ? ORDER BY score DESC, b.bug_id '
+                'LIMIT ? OFFSET ?',
+                (match, limit + 1, offset),
+            ).fetchall()
+        except Exception as e:
+            _logger.error(f'Failed to search bugs in local index: {e}')
+            raise
+
+        page = [
+            {**self._summary_from_row(row), 'score': round(row['score'], 4)}
+            for row in rows
+        ]
+        return page[:limit], offset + limit if len(page) > limit else None
 
 
 class GCSBugStorage(BugStorageBackend):
     """Google Cloud Storage backend for bug reports."""
 
-    def __init__(self, bucket_name: str = 'flowgen', bugs_path: str = 'bugs'):
+    def __init__(
+        self,
+        bucket_name: str = 'flowgen',
+        bugs_path: str = 'bugs',
+        timeout: float | None = None,
+    ):
         """Initialize GCS bug storage.
 
         Args:
             bucket_name: GCS bucket name
             bugs_path: Path within the bucket for bug reports
+            timeout: Seconds to wait for one storage call
         """
         from google.cloud import storage
 
+        self._executor = ThreadPoolExecutor(
+            settings.GCS_BUGS_IO_THREADS, thread_name_prefix='bug-storage'
+        )
+        self.timeout = timeout or settings.BUGS_IO_TIMEOUT_SECONDS
         self.bucket_name = bucket_name
         self.bugs_path = bugs_path.strip('/')
         self.bugs_file = f'{self.bugs_path}/bug_reports.jsonl'
@@ -164,22 +902,40 @@ class GCSBugStorage(BugStorageBackend):
         Args:
             bug_data: Bug report data to save
         """
+        return await self.save_bugs([bug_data])
+
+    async def save_bugs(self, bug_list: list[dict[str, Any]]) -> None:
+        """Append bug reports to the GCS file in one rewrite.
+
+        Args:
+            bug_list: Bug reports to save, in submission order
+        """
+        return await self._run(self._save_bugs, bug_list)
+
+    def _save_bugs(self, bug_list: list[dict[str, Any]]) -> None:
+        """Blocking implementation of `save_bugs`."""
         try:
             blob = self.bucket.blob(self.bugs_file)
 
             # Read existing content if file exists
             existing_content = ''
-            if blob.exists():
-                existing_content = blob.download_as_text()
+            if blob.exists(timeout=self.timeout):
+                existing_content = blob.download_as_text(timeout=self.timeout)
 
-            # Append new bug report
-            new_line = json.dumps(bug_data, ensure_ascii=False) + '\n'
-            updated_content = existing_content + new_line
+            # Append new bug reports
+            new_lines = ''.join(
+                json.dumps(bug_data, ensure_ascii=False) + '\n' for bug_data in bug_list
+            )
+            updated_content = existing_content + new_lines
 
             # Upload updated content
-            blob.upload_from_string(updated_content, content_type='application/jsonl')
+            blob.upload_from_string(
+                updated_content,
+                content_type='application/jsonl',
+                timeout=self.timeout,
+            )
             _logger.info(
-                f'Saved bug report {bug_data.get("bug_id")} to GCS '
+                f'Saved {len(bug_list)} bug reports to GCS '
                 f'gs://{self.bucket_name}/{self.bugs_file}'
             )
         except Exception as e:
@@ -192,15 +948,19 @@ class GCSBugStorage(BugStorageBackend):
         Returns:
             List of bug report dictionaries
         """
+        return await self._run(self._list_bugs)
+
+    def _list_bugs(self) -> list[dict[str, Any]]:
+        """Blocking implementation of `list_bugs`."""
         bug_reports = []
 
         try:
             blob = self.bucket.blob(self.bugs_file)
 
-            if not blob.exists():
+            if not blob.exists(timeout=self.timeout):
                 return bug_reports
 
-            content = blob.download_as_text()
+            content = blob.download_as_text(timeout=self.timeout)
 
             for line_num, line in enumerate(content.splitlines(), 1):
                 line = line.strip()
@@ -229,13 +989,17 @@ class GCSBugStorage(BugStorageBackend):
         Returns:
             Bug report data or None if not found
         """
+        return await self._run(self._get_bug, bug_id)
+
+    def _get_bug(self, bug_id: str) -> dict[str, Any] | None:
+        """Blocking implementation of `get_bug`."""
         try:
             blob = self.bucket.blob(self.bugs_file)
 
-            if not blob.exists():
+            if not blob.exists(timeout=self.timeout):
                 return None
 
-            content = blob.download_as_text()
+            content = blob.download_as_text(timeout=self.timeout)
 
             for line in content.splitlines():
                 line = line.strip()
@@ -254,6 +1018,639 @@ class GCSBugStorage(BugStorageBackend):
         return None
 
 
+class SegmentedGCSBugStorage(BugStorageBackend):
+    """Google Cloud Storage backend writing one object per bug report.
+
+    Saves create `reports/<time>-<bug_id>.json` objects, or one multi-line
+    `reports/<time>-<random>.jsonl` object per batch, with a create-only
+    generation precondition, so they never read or rewrite existing data and
+    concurrent saves cannot overwrite each other. Every few saves the pending
+    reports are concatenated into `segments/*.jsonl` files with GCS compose,
+    and older segments are merged once there are too many, so listing reads a
+    handful of objects. A report is deleted only at the generation that was
+    composed; if two workers compact the same reports, the duplicate lines are
+    dropped when reading. A legacy `bug_reports.jsonl` is read as the oldest
+    segment.
+
+    Compaction also maintains `index.json`, which maps every compacted bug ID
+    to its object and byte range and keeps the list view columns. Lookups
+    read a single range and filtered listings read only the index plus the
+    reports saved since the last compaction.
+
+    Large diagrams and chat histories are compressed into one immutable
+    `payloads/*` object per batch that compaction leaves alone; `get_bug`
+    fetches the payload range of the requested report only.
+    """
+
+    # GCS compose accepts at most 32 source objects per request
+    MAX_COMPOSE_SOURCES = 32
+    # A compaction lock older than this is assumed to be abandoned
+    LOCK_TIMEOUT_SECONDS = 300
+    # Attempts to read a consistent listing while a compaction deletes sources
+    READ_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        bucket_name: str = 'flowgen',
+        bugs_path: str = 'bugs',
+        compact_every: int = 32,
+        max_segments: int = 8,
+        client=None,
+        timeout: float | None = None,
+        io_threads: int | None = None,
+        durability: str = 'batch',
+        payload_codec: str | None = None,
+        payload_min_bytes: int | None = None,
+    ):
+        """Initialize segmented GCS bug storage.
+
+        Args:
+            bucket_name: GCS bucket name
+            bugs_path: Path within the bucket for bug reports
+            compact_every: Saves between background compactions
+            max_segments: Segment count above which segments are merged
+            client: Existing storage client to use instead of a default one
+            timeout: Seconds to wait for one storage call
+            io_threads: Threads running blocking GCS calls
+            durability: Write one object per 'batch' or per 'report'
+            payload_codec: Compression of stored payloads, 'gzip' or 'zstd'
+            payload_min_bytes: Smallest payload stored outside its record
+        """
+        if client is None:
+            from google.cloud import storage
+
+            client = storage.Client()
+
+        # The client's HTTP session keeps connections alive across calls
+        self._executor = ThreadPoolExecutor(
+            io_threads or settings.GCS_BUGS_IO_THREADS,
+            thread_name_prefix='bug-storage',
+        )
+        self.timeout = timeout or settings.BUGS_IO_TIMEOUT_SECONDS
+        self.bucket_name = bucket_name
+        self.bugs_path = bugs_path.strip('/')
+        self.reports_prefix = f'{self.bugs_path}/reports/'
+        self.segments_prefix = f'{self.bugs_path}/segments/'
+        self.payloads_prefix = f'{self.bugs_path}/payloads/'
+        self.legacy_file = f'{self.bugs_path}/bug_reports.jsonl'
+        self.lock_file = f'{self.bugs_path}/compaction.lock'
+        self.index_file = f'{self.bugs_path}/index.json'
+        self.compact_every = compact_every
+        self.max_segments = max_segments
+        self.durability = durability
+        self.payload_codec = payload_codec or settings.BUGS_PAYLOAD_CODEC
+        self.payload_min_bytes = (
+            payload_min_bytes
+            if payload_min_bytes is not None
+            else settings.BUGS_PAYLOAD_MIN_BYTES
+        )
+
+        self.client = client
+        self.bucket = self.client.bucket(bucket_name)
+        self._saves_since_compaction = 0
+        self._compaction: asyncio.Task | None = None
+        self._index: dict[str, Any] | None = None
+        self._index_generation = 0
+        # Pending batch objects already added to the search index
+        self._searched_objects: set[str] = set()
+        _logger.info(
+            f'Initialized segmented GCS bug storage at '
+            f'gs://{bucket_name}/{self.bugs_path}/'
+        )
+
+    async def save_bug(self, bug_data: dict[str, Any]) -> None:
+        """Save a bug report as its own GCS object.
+
+        Args:
+            bug_data: Bug report data to save
+        """
+        await self.save_bugs([bug_data])
+
+    async def save_bugs(self, bug_list: list[dict[str, Any]]) -> None:
+        """Save bug reports as one GCS object, or one per report.
+
+        Args:
+            bug_list: Bug reports to save, in submission order
+        """
+        if not bug_list:
+            return
+        objects = await self._run(self._save_bugs, bug_list)
+
+        self._saves_since_compaction += objects
+        if self._saves_since_compaction >= self.compact_every:
+            self._schedule_compaction()
+
+    def _save_bugs(self, bug_list: list[dict[str, Any]]) -> int:
+        """Blocking implementation of `save_bugs`.
+
+        Returns:
+            Number of objects written
+        """
+        if self.durability == 'report':
+            batches = [[bug_data] for bug_data in bug_list]
+        else:
+            batches = [bug_list]
+
+        try:
+            for batch in batches:
+                stamp = f'{time.time_ns():020d}'
+                payload_name = (
+                    f'{self.payloads_prefix}{stamp}-{uuid.uuid4().hex[:8]}.'
+                    f'{self.payload_codec}'
+                )
+                batch, payloads = split_payloads(
+                    batch, payload_name, self.payload_codec, self.payload_min_bytes
+                )
+                if payloads:
+                    # Upload payloads before any record referencing them
+                    self.bucket.blob(payload_name).upload_from_string(
+                        payloads,
+                        content_type='application/octet-stream',
+                        if_generation_match=0,
+                        timeout=self.timeout,
+                    )
+
+                if len(batch) == 1:
+                    bug_id = batch[0].get('bug_id') or str(uuid.uuid4())
+                    name = f'{stamp}-{bug_id}.json'
+                else:
+                    name = f'{stamp}-{uuid.uuid4().hex[:8]}.jsonl'
+                blob = self.bucket.blob(self.reports_prefix + name)
+                # Objects hold whole JSONL lines so that composed segments stay valid
+                blob.upload_from_string(
+                    ''.join(
+                        json.dumps(bug_data, ensure_ascii=False) + '\n'
+                        for bug_data in batch
+                    ),
+                    content_type='application/jsonl',
+                    if_generation_match=0,
+                    timeout=self.timeout,
+                )
+                _logger.info(
+                    f'Saved {len(batch)} bug reports to GCS '
+                    f'gs://{self.bucket_name}/{blob.name}'
+                )
+        except Exception as e:
+            _logger.error(f'Failed to save bugs to GCS: {e}')
+            raise
+        return len(batches)
+
+    def _schedule_compaction(self) -> None:
+        """Start a background compaction unless one is already running."""
+        if self._compaction is not None and not self._compaction.done():
+            return
+        self._saves_since_compaction = 0
+        self._compaction = asyncio.create_task(self.compact())
+
+    def _list(self, prefix: str) -> list[Any]:
+        """List the objects under a prefix in name order."""
+        blobs = self.client.list_blobs(
+            self.bucket_name, prefix=prefix, timeout=self.timeout
+        )
+        return sorted(blobs, key=lambda blob: blob.name)
+
+    def _download(
+        self, blob: Any, start: int | None = None, end: int | None = None
+    ) -> bytes:
+        """Download an object or an inclusive byte range of it."""
+        return blob.download_as_bytes(start=start, end=end, timeout=self.timeout)
+
+    def _acquire_lock(self) -> Any | None:
+        """Create the compaction lock object, or return None if it is held."""
+        from google.api_core.exceptions import PreconditionFailed
+
+        lock = self.bucket.blob(self.lock_file)
+        try:
+            lock.upload_from_string(
+                datetime.now(timezone.utc).isoformat(),
+                if_generation_match=0,
+                timeout=self.timeout,
+            )
+            return lock
+        except PreconditionFailed:
+            pass
+
+        stale = self.bucket.get_blob(self.lock_file, timeout=self.timeout)
+        if stale is not None and stale.time_created is not None:
+            age = datetime.now(timezone.utc) - stale.time_created
+            if age.total_seconds() > self.LOCK_TIMEOUT_SECONDS:
+                _logger.warning('Removing abandoned bug compaction lock')
+                self._delete(stale)
+        return None
+
+    def _delete(self, blob: Any) -> None:
+        """Delete an object only at the generation that was read."""
+        from google.api_core.exceptions import NotFound, PreconditionFailed
+
+        try:
+            blob.delete(if_generation_match=blob.generation, timeout=self.timeout)
+        except (NotFound, PreconditionFailed):
+            # Already compacted or replaced by another worker
+            pass
+
+    def _compose(self, name: str, sources: list[Any]) -> None:
+        """Concatenate sources into a new object."""
+        destination = self.bucket.blob(name)
+        destination.content_type = 'application/jsonl'
+        destination.compose(
+            sources,
+            if_generation_match=0,
+            if_source_generation_match=[source.generation for source in sources],
+            timeout=self.timeout,
+        )
+
+    def _segment_name(self, first_source: Any) -> str:
+        """Name a segment after its oldest source so segments sort by age."""
+        stamp = first_source.name.rsplit('/', 1)[-1].split('-', 1)[0]
+        return f'{self.segments_prefix}{stamp}-{uuid.uuid4().hex[:8]}.jsonl'
+
+    def _load_index(self) -> tuple[dict[str, Any], int]:
+        """Return the index and its generation, reusing the cached copy."""
+        blob = self.bucket.get_blob(self.index_file, timeout=self.timeout)
+        if blob is None:
+            return {'entries': {}, 'legacy_generation': None}, 0
+        if self._index is None or blob.generation != self._index_generation:
+            self._index = json.loads(self._download(blob))
+            self._index_generation = blob.generation
+        return self._index, self._index_generation
+
+    def _save_index(self, index: dict[str, Any], generation: int) -> None:
+        """Write the index unless another worker replaced it meanwhile."""
+        blob = self.bucket.blob(self.index_file)
+        blob.upload_from_string(
+            json.dumps(index, ensure_ascii=False),
+            content_type='application/json',
+            if_generation_match=generation,
+            timeout=self.timeout,
+        )
+        self._index, self._index_generation = index, blob.generation
+
+    @staticmethod
+    def _index_lines(
+        entries: dict[str, Any], name: str, content: bytes, base: int = 0
+    ) -> None:
+        """Add index entries for the JSONL lines of an object."""
+        offset = base
+        for raw in content.splitlines(keepends=True):
+            start, offset = offset, offset + len(raw)
+            if not raw.strip():
+                continue
+            try:
+                bug_data = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            bug_id = bug_data.get('bug_id')
+            if bug_id is not None and bug_id not in entries:
+                entries[bug_id] = {
+                    'object': name,
+                    'start': start,
+                    'end': offset - 1,
+                    'summary': summarize_bug(bug_data),
+                }
+
+    async def compact(self) -> int:
+        """Compose pending reports into segments and merge excess segments.
+
+        Sources are deleted only after the index pointing into the new
+        segments has been written. Runs without the per-call timeout since it
+        issues many requests; each request is bounded on its own.
+
+        Returns:
+            Number of report objects compacted
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._compact)
+
+    def _compact(self) -> int:
+        """Blocking implementation of `compact`."""
+        try:
+            lock = self._acquire_lock()
+            if lock is None:
+                return 0
+
+            try:
+                index, generation = self._load_index()
+                index = copy.deepcopy(index)
+                entries = index['entries']
+
+                legacy = self.bucket.get_blob(self.legacy_file, timeout=self.timeout)
+                if legacy is not None and (
+                    legacy.generation != index['legacy_generation']
+                ):
+                    content = self._download(legacy)
+                    self._index_lines(entries, legacy.name, content)
+                    index['legacy_generation'] = legacy.generation
+
+                composed = []
+                reports = self._list(self.reports_prefix)
+                for start in range(0, len(reports), self.MAX_COMPOSE_SOURCES):
+                    batch = reports[start : start + self.MAX_COMPOSE_SOURCES]
+                    name = self._segment_name(batch[0])
+                    offset = 0
+                    for blob in batch:
+                        content = self._download(blob)
+                        self._index_lines(entries, name, content, offset)
+                        offset += len(content)
+                    self._compose(name, batch)
+                    composed += batch
+
+                segments = self._list(self.segments_prefix)
+                if len(segments) > self.max_segments:
+                    batch = segments[: self.MAX_COMPOSE_SOURCES]
+                    name = self._segment_name(batch[0])
+                    bases, offset = {}, 0
+                    for blob in batch:
+                        bases[blob.name] = offset
+                        offset += blob.size
+                    self._compose(name, batch)
+                    for entry in entries.values():
+                        if entry['object'] in bases:
+                            base = bases[entry['object']]
+                            entry['object'] = name
+                            entry['start'] += base
+                            entry['end'] += base
+                    composed += batch
+
+                self._save_index(index, generation)
+                for blob in composed:
+                    self._delete(blob)
+            finally:
+                self._delete(lock)
+
+            if reports:
+                _logger.info(f'Compacted {len(reports)} bug reports into segments')
+            return len(reports)
+        except Exception as e:
+            _logger.error(f'Failed to compact bug reports in GCS: {e}')
+            return 0
+
+    def _read_bugs(self) -> list[dict[str, Any]]:
+        """Read bug reports from every segment and pending report object."""
+        from google.api_core.exceptions import NotFound
+
+        for attempt in range(1, self.READ_ATTEMPTS + 1):
+            legacy = self.bucket.get_blob(self.legacy_file, timeout=self.timeout)
+            blobs = [legacy] if legacy is not None else []
+            blobs += self._list(self.segments_prefix) + self._list(self.reports_prefix)
+            try:
+                contents = [
+                    (
+                        blob.name,
+                        self._download(blob).decode('utf-8'),
+                    )
+                    for blob in blobs
+                ]
+                break
+            except NotFound:
+                # Compacted away after listing; its data is in a newer segment
+                if attempt == self.READ_ATTEMPTS:
+                    raise
+
+        bug_reports = []
+        seen: set[str] = set()
+        for name, content in contents:
+            for line_num, line in enumerate(content.splitlines(), 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    bug_data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    _logger.warning(
+                        f'Error parsing line {line_num} of {name} in GCS: {e}'
+                    )
+                    continue
+                bug_id = bug_data.get('bug_id')
+                if bug_id in seen:
+                    continue
+                seen.add(bug_id)
+                bug_reports.append(bug_data)
+        return bug_reports
+
+    async def list_bugs(self) -> list[dict[str, Any]]:
+        """List all bug reports from GCS.
+
+        Returns:
+            List of bug report dictionaries
+        """
+        return await self._run(self._list_bugs)
+
+    def _list_bugs(self) -> list[dict[str, Any]]:
+        """Blocking implementation of `list_bugs`."""
+        try:
+            return self._read_bugs()
+        except Exception as e:
+            _logger.error(f'Failed to list bugs from GCS: {e}')
+            raise
+
+    @staticmethod
+    def _report_bug_id(blob: Any) -> str | None:
+        """Return the bug ID of a single-report object, or None for a batch."""
+        name = blob.name.rsplit('/', 1)[-1]
+        if not name.endswith('.json'):
+            return None
+        return name.split('-', 1)[1].removesuffix('.json')
+
+    @staticmethod
+    def _parse_reports(content: bytes) -> list[dict[str, Any]]:
+        """Parse the JSONL lines of a report object, skipping invalid ones."""
+        bug_reports = []
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                bug_reports.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return bug_reports
+
+    async def iter_bug_summaries(
+        self, status: str | None = None, user_name: str | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield bug report summaries from the index and pending reports.
+
+        Args:
+            status: Only include reports with this status
+            user_name: Only include reports submitted by this user
+
+        Yields:
+            Bug report summaries
+        """
+        from google.api_core.exceptions import NotFound
+
+        try:
+            index, _ = await self._run(self._load_index)
+            pending = await self._run(self._list, self.reports_prefix)
+        except Exception as e:
+            _logger.error(f'Failed to list bugs from GCS index: {e}')
+            raise
+
+        for entry in index['entries'].values():
+            if _matches(entry['summary'], status, user_name):
+                yield entry['summary']
+
+        seen = set(index['entries'])
+        for blob in pending:
+            if self._report_bug_id(blob) in seen:
+                continue
+            try:
+                content = await self._run(self._download, blob)
+                summaries = [
+                    summarize_bug(bug_data) for bug_data in self._parse_reports(content)
+                ]
+            except NotFound:
+                # Compacted after listing; take its reports from the new index
+                entries = (await self._run(self._load_index))[0]['entries']
+                summaries = [
+                    entry['summary']
+                    for bug_id, entry in entries.items()
+                    if bug_id not in seen
+                ]
+            for summary in summaries:
+                if summary['bug_id'] in seen:
+                    continue
+                seen.add(summary['bug_id'])
+                if _matches(summary, status, user_name):
+                    yield summary
+
+    async def _unindexed_bugs(self, indexed: InvertedIndex) -> list[dict[str, Any]]:
+        """Return the reports missing from the search index.
+
+        Compacted reports are found through `index.json` and read with one
+        range request per segment; of the pending report objects, only those
+        not searched before are downloaded. Runs without the per-call timeout
+        since a first refresh reads every report; each request is bounded on
+        its own.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._read_unindexed, indexed)
+
+    def _read_unindexed(self, indexed: InvertedIndex) -> list[dict[str, Any]]:
+        """Blocking implementation of `_unindexed_bugs`."""
+        from google.api_core.exceptions import NotFound
+
+        try:
+            index, _ = self._load_index()
+            spans: dict[str, list[dict[str, Any]]] = {}
+            for bug_id, entry in index['entries'].items():
+                if bug_id not in indexed:
+                    spans.setdefault(entry['object'], []).append(entry)
+
+            records = []
+            for name, entries in spans.items():
+                start = min(entry['start'] for entry in entries)
+                end = max(entry['end'] for entry in entries)
+                try:
+                    content = self._download(self.bucket.blob(name), start, end)
+                except NotFound:
+                    # Merged meanwhile; found again on the next refresh
+                    continue
+                for entry in entries:
+                    line = content[entry['start'] - start : entry['end'] - start + 1]
+                    records.append(json.loads(line))
+
+            pending = self._list(self.reports_prefix)
+            self._searched_objects &= {blob.name for blob in pending}
+            for blob in pending:
+                if (
+                    blob.name in self._searched_objects
+                    or self._report_bug_id(blob) in indexed
+                ):
+                    continue
+                try:
+                    content = self._download(blob)
+                except NotFound:
+                    # Compacted after listing; it is in the next index
+                    continue
+                records += self._parse_reports(content)
+                self._searched_objects.add(blob.name)
+
+            bug_reports = []
+            for record in records:
+                payload = record.get('payload')
+                if payload is not None:
+                    chunk = self._download(
+                        self.bucket.blob(payload['object']),
+                        payload['start'],
+                        payload['start'] + payload['length'] - 1,
+                    )
+                    record = merge_payload(record, chunk)
+                bug_reports.append(record)
+            return bug_reports
+        except Exception as e:
+            _logger.error(f'Failed to read new bugs from GCS: {e}')
+            raise
+
+    async def get_bug(self, bug_id: str) -> dict[str, Any] | None:
+        """Get a specific bug report by ID from GCS.
+
+        Args:
+            bug_id: Bug report ID
+
+        Returns:
+            Bug report data or None if not found
+        """
+        return await self._run(self._get_bug, bug_id)
+
+    def _get_bug(self, bug_id: str) -> dict[str, Any] | None:
+        """Blocking implementation of `get_bug`."""
+        bug_data = self._find_bug(bug_id)
+        payload = bug_data.get('payload') if bug_data else None
+        if payload is None:
+            return bug_data
+
+        try:
+            chunk = self._download(
+                self.bucket.blob(payload['object']),
+                payload['start'],
+                payload['start'] + payload['length'] - 1,
+            )
+        except Exception as e:
+            _logger.error(f'Failed to get bug payload from GCS: {e}')
+            raise
+        return merge_payload(bug_data, chunk)
+
+    def _find_bug(self, bug_id: str) -> dict[str, Any] | None:
+        """Return the stored record of a bug report without its payload."""
+        from google.api_core.exceptions import NotFound
+
+        try:
+            entry = self._load_index()[0]['entries'].get(bug_id)
+            if entry is not None:
+                blob = self.bucket.blob(entry['object'])
+                try:
+                    return json.loads(
+                        self._download(blob, entry['start'], entry['end'])
+                    )
+                except NotFound:
+                    _logger.warning(f'Stale bug index entry for {bug_id}')
+
+            moved = entry is not None
+            for blob in self._list(self.reports_prefix):
+                if self._report_bug_id(blob) not in (None, bug_id):
+                    continue
+                try:
+                    content = self._download(blob)
+                except NotFound:
+                    moved = True
+                    continue
+                for bug_data in self._parse_reports(content):
+                    if bug_data.get('bug_id') == bug_id:
+                        return bug_data
+
+            if not moved:
+                return None
+            # The object moved during a compaction; fall back to a full read
+            for bug_data in self._read_bugs():
+                if bug_data.get('bug_id') == bug_id:
+                    return bug_data
+        except Exception as e:
+            _logger.error(f'Failed to get bug from GCS: {e}')
+            raise
+
+        return None
+
+
 def get_bug_storage() -> BugStorageBackend:
     """Get the appropriate bug storage backend based on configuration.
 
@@ -262,12 +1659,27 @@ def get_bug_storage() -> BugStorageBackend:
     """
     if settings.USE_GCS_FOR_BUGS:
         _logger.info('Using Google Cloud Storage for bug reports')
-        return GCSBugStorage(
-            bucket_name=settings.GCS_BUGS_BUCKET, bugs_path=settings.GCS_BUGS_PATH
+        if settings.GCS_BUGS_LAYOUT == 'jsonl':
+            return GCSBugStorage(
+                bucket_name=settings.GCS_BUGS_BUCKET, bugs_path=settings.GCS_BUGS_PATH
+            )
+        return SegmentedGCSBugStorage(
+            bucket_name=settings.GCS_BUGS_BUCKET,
+            bugs_path=settings.GCS_BUGS_PATH,
+            compact_every=settings.GCS_BUGS_COMPACT_EVERY,
+            max_segments=settings.GCS_BUGS_MAX_SEGMENTS,
+            durability=settings.BUGS_DURABILITY,
+            payload_codec=settings.BUGS_PAYLOAD_CODEC,
+            payload_min_bytes=settings.BUGS_PAYLOAD_MIN_BYTES,
         )
     else:
         _logger.info('Using local file system for bug reports')
-        return LocalBugStorage(bugs_dir=settings.BUGS_DIR)
+        return LocalBugStorage(
+            bugs_dir=settings.BUGS_DIR,
+            durability=settings.BUGS_DURABILITY,
+            payload_codec=settings.BUGS_PAYLOAD_CODEC,
+            payload_min_bytes=settings.BUGS_PAYLOAD_MIN_BYTES,
+        )
 
 
 _bug_storage: BugStorageBackend | None = None
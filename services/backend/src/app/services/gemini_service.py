@@ -14,29 +14,27 @@
 
 """Gemini AI service."""
 
-from typing import Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
 
-from google import genai
-from google.genai import types
 from loguru import logger
 
-from src.lib.config import settings
+from src.lib.genai_client import get_genai_client
+from src.lib.resilience import gemini_caller
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
 
 
 class GeminiService:
     """Service for interacting with Gemini AI."""
 
-    def __init__(self):
-        """Initialize Gemini service."""
-        # Use the same pattern as the tools module for API key handling
-        api_key = getattr(settings, 'GEMINI_API_KEY', None) or getattr(
-            settings, 'GOOGLE_API_KEY', None
-        )
-        if api_key:
-            self.client = genai.Client(api_key=api_key)
-        else:
-            # Fallback to environment-based initialization
-            self.client = genai.Client()
+    @property
+    def client(self) -> genai.Client:
+        """The shared, pooled client, looked up again after a shutdown."""
+        return get_genai_client()
 
     async def generate_content(
         self,
@@ -44,7 +42,7 @@ class GeminiService:
         model: str,
         response_modalities: Optional[list] = None,
         speech_config: Optional[types.SpeechConfig] = None,
-    ) -> genai.types.GenerateContentResponse:
+    ) -> types.GenerateContentResponse:
         """
         Generate content using Gemini AI.
 
@@ -57,6 +55,8 @@ class GeminiService:
         Returns:
             GenerateContentResponse: Gemini API response
         """
+        from google.genai import types
+
         try:
             config = types.GenerateContentConfig()
 
@@ -68,10 +68,14 @@ class GeminiService:
 
             logger.debug(f'Generating content with model: {model}')
 
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=content,
-                config=config,
+            # Retried on transient errors and hedged when slow, if enabled
+            response = await gemini_caller.call(
+                f'generate_content@{model}',
+                lambda: self.client.aio.models.generate_content(
+                    model=model,
+                    contents=content,
+                    config=config,
+                ),
             )
 
             # Add response validation and logging
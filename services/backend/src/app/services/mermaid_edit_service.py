@@ -16,23 +16,76 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
 import textwrap
-from typing import Optional
+from typing import Any, AsyncIterator, Optional, Sequence
 
 from loguru import logger
 
-from src.app.models.mermaid_edit import DiagramType
+from src.app.models.mermaid_edit import DiagramType, EditScope
+from src.app.schemas.mermaid_edit import MermaidBatchEditJob, MermaidBatchEditResult
+from src.app.services.admission_control import AdmissionRejected, admission_controller
 from src.app.services.gemini_service import GeminiService
+from src.lib.cache import (
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResultCache,
+)
 from src.lib.config import settings
+from src.lib.mermaid_scope import (
+    MermaidScope,
+    extract_edit_scope,
+    merge_scoped_edit,
+)
 from src.lib.mermaid_utils import extract_mermaid, sanitize_mermaid
 
 
+def _build_edit_cache() -> Optional[ResultCache]:
+    """Create the edit-result cache configured in settings.
+
+    Returns:
+        Optional[ResultCache]: The cache, or None when caching is disabled
+    """
+    if not settings.MERMAID_EDIT_CACHE_ENABLED:
+        return None
+
+    if settings.MERMAID_EDIT_CACHE_SHARED and settings.REDIS_URL:
+        backend = RedisCacheBackend(settings.REDIS_URL, prefix='mermaid_edit')
+    else:
+        backend = InMemoryCacheBackend(
+            max_entries=settings.MERMAID_EDIT_CACHE_MAX_ENTRIES
+        )
+    return ResultCache(
+        backend, ttl=settings.MERMAID_EDIT_CACHE_TTL_SECONDS, name='mermaid_edit'
+    )
+
+
+def _normalize_content(content: str) -> str:
+    """Normalize whitespace so equivalent diagrams share a cache entry."""
+    lines = content.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(
+        re.sub(r'[ \t]+', ' ', line.strip()) for line in lines if line.strip()
+    )
+
+
 class MermaidEditService:
     """Service for Mermaid diagram editing using Gemini AI."""
 
     def __init__(self):
         """Initialize mermaid edit service."""
         self.gemini_service = GeminiService()
+        self.cache = _build_edit_cache()
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Return hit-rate metrics of the edit-result cache.
+
+        Returns:
+            dict: Cache metrics, or a disabled marker
+        """
+        if self.cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.cache.stats()}
 
     def _build_edit_prompt(
         self,
@@ -85,6 +138,87 @@ class MermaidEditService:
         """
         return textwrap.dedent(prompt).strip()
 
+    def _build_scoped_edit_prompt(
+        self,
+        scope: MermaidScope,
+        instructions: str,
+        diagram_type: DiagramType,
+        diagram_title: Optional[str] = None,
+        additional_context: Optional[str] = None,
+    ) -> str:
+        """Build editing prompt for an excerpt of a larger diagram.
+
+        Args:
+            scope: Slice of the diagram selected for editing
+            instructions: Editing instructions
+            diagram_type: Type of diagram
+            diagram_title: Title of the diagram
+            additional_context: Additional context
+
+        Returns:
+            str: Formatted prompt
+        """
+        title_str = f'Title: {diagram_title}\n\n' if diagram_title else ''
+        if additional_context:
+            context_str = f'Additional context: {additional_context}\n\n'
+        else:
+            context_str = ''
+
+        prompt = f"""
+            You are an expert Mermaid diagram editor specializing in \\
+            {diagram_type.value} diagrams.
+
+            The code below is an EXCERPT of a larger Mermaid diagram. It only \\
+            contains the nodes, subgraphs and connections relevant to the \\
+            requested change. Please edit it according to these \\
+            instructions: {instructions}
+
+            {title_str}{context_str}Diagram excerpt:
+            ```mermaid
+            {scope.excerpt}
+            ```
+
+            Requirements:
+            1. Return ONLY valid Mermaid syntax for the edited excerpt
+            2. Keep the first directive line and every enclosing subgraph \\
+            declaration with its original ID, even if it looks incomplete
+            3. Nodes referenced but not shown exist elsewhere in the diagram; \\
+            do not add them unless asked to
+            4. Use appropriate Mermaid syntax for {diagram_type.value} diagrams
+            5. Do not include explanations, code blocks, or metadata
+            6. Preserve important architectural relationships unless \\
+            specifically asked to change them
+
+            Return only the edited Mermaid excerpt:
+        """
+        return textwrap.dedent(prompt).strip()
+
+    def _select_scope(
+        self, content: str, instructions: str, edit_scope: EditScope
+    ) -> Optional[MermaidScope]:
+        """Select the diagram slice to edit, or None for a full edit.
+
+        Args:
+            content: Mermaid diagram code
+            instructions: Editing instructions
+            edit_scope: Requested edit scope
+
+        Returns:
+            Optional[MermaidScope]: Selected slice, if scoping applies
+        """
+        if edit_scope == EditScope.FULL:
+            return None
+        if (
+            edit_scope == EditScope.AUTO
+            and len(content) < settings.MERMAID_SCOPED_EDIT_MIN_CHARS
+        ):
+            return None
+        return extract_edit_scope(
+            content,
+            instructions,
+            max_ratio=settings.MERMAID_SCOPED_EDIT_MAX_RATIO,
+        )
+
     async def edit_mermaid_diagram(
         self,
         content: str,
@@ -92,49 +226,165 @@ class MermaidEditService:
         diagram_type: DiagramType = DiagramType.FLOWCHART,
         diagram_title: Optional[str] = None,
         additional_context: Optional[str] = None,
+        edit_scope: EditScope = EditScope.AUTO,
+        admission_route: str = 'edit',
+        session_id: str = 'anonymous',
     ) -> str:
         """Edit Mermaid diagram using Gemini AI.
 
+        Only the Gemini call waits for an admission slot; edits served from
+        the cache are answered at once.
+
         Args:
             content: Mermaid diagram code to edit
             instructions: Editing instructions
             diagram_type: Type of diagram
             diagram_title: Title of the diagram
             additional_context: Additional context
+            edit_scope: Whether to send only the referenced slice to the model
+            admission_route: Priority class of the Gemini call, 'edit' or 'batch'
+            session_id: Session the edit belongs to, for fair admission
 
         Returns:
             str: Edited Mermaid diagram code
+
+        Raises:
+            AdmissionRejected: If too many Gemini calls are waiting
         """
         try:
             logger.info(f'Editing {diagram_type.value} Mermaid diagram')
 
-            prompt = self._build_edit_prompt(
-                content=content,
-                instructions=instructions,
-                diagram_type=diagram_type,
-                diagram_title=diagram_title,
-                additional_context=additional_context,
-            )
+            cache_key = None
+            if self.cache is not None:
+                cache_key = ResultCache.make_key(
+                    _normalize_content(content),
+                    instructions,
+                    diagram_type.value,
+                    diagram_title,
+                    additional_context,
+                    edit_scope.value,
+                    settings.GEMINI_MODEL,
+                )
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info('Mermaid diagram edit served from cache')
+                    return cached
+
+            scope = self._select_scope(content, instructions, edit_scope)
+            if scope is not None:
+                logger.info(
+                    f'Scoped edit: sending {len(scope.excerpt)} of '
+                    f'{len(content)} characters '
+                    f'({len(scope.node_ids)} nodes, {len(scope.subgraphs)} subgraphs)'
+                )
+                prompt = self._build_scoped_edit_prompt(
+                    scope=scope,
+                    instructions=instructions,
+                    diagram_type=diagram_type,
+                    diagram_title=diagram_title,
+                    additional_context=additional_context,
+                )
+            else:
+                prompt = self._build_edit_prompt(
+                    content=content,
+                    instructions=instructions,
+                    diagram_type=diagram_type,
+                    diagram_title=diagram_title,
+                    additional_context=additional_context,
+                )
 
             # Use GeminiService to generate content
-            response = await self.gemini_service.generate_content(
-                content=prompt,
-                model=settings.GEMINI_MODEL,  # Use fast model for diagram editing
-                response_modalities=['TEXT'],
-            )
+            async with admission_controller.slot(admission_route, session_id):
+                response = await self.gemini_service.generate_content(
+                    content=prompt,
+                    model=settings.GEMINI_MODEL,  # Use fast model for diagram editing
+                    response_modalities=['TEXT'],
+                )
 
             edited_content = response.candidates[0].content.parts[0].text
 
             # Clean up the response to ensure it's valid Mermaid code
             edited_content = self._clean_mermaid_response(edited_content)
+            if scope is not None:
+                edited_content = sanitize_mermaid(
+                    merge_scoped_edit(scope, edited_content)
+                )
+
+            edited_content = edited_content.strip()
+            if cache_key is not None:
+                await self.cache.set(cache_key, edited_content)
 
             logger.info('Mermaid diagram editing completed')
-            return edited_content.strip()
+            return edited_content
 
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error(f'Mermaid diagram editing failed: {str(e)}')
             raise Exception(f'Mermaid diagram editing failed: {str(e)}')
 
+    async def iter_batch_edits(
+        self,
+        jobs: Sequence[MermaidBatchEditJob],
+        max_concurrency: Optional[int] = None,
+        session_id: str = 'batch',
+    ) -> AsyncIterator[MermaidBatchEditResult]:
+        """Run edit jobs concurrently, yielding results as they complete.
+
+        A failing job, including one not admitted by admission control,
+        yields an unsuccessful result instead of aborting the batch. Pending
+        jobs are cancelled if the consumer stops iterating.
+
+        Args:
+            jobs: Edit jobs to run
+            max_concurrency: Maximum number of concurrent Gemini calls
+            session_id: Session the batch belongs to, for fair admission
+
+        Yields:
+            MermaidBatchEditResult: One result per job, in completion order
+        """
+        semaphore = asyncio.Semaphore(
+            max_concurrency or settings.MERMAID_BATCH_MAX_CONCURRENCY
+        )
+
+        async def run(index: int, job: MermaidBatchEditJob) -> MermaidBatchEditResult:
+            async with semaphore:
+                try:
+                    content = await self.edit_mermaid_diagram(
+                        content=job.content,
+                        instructions=job.instructions,
+                        diagram_type=job.diagram_type,
+                        diagram_title=job.diagram_title,
+                        additional_context=job.additional_context,
+                        edit_scope=job.edit_scope,
+                        admission_route='batch',
+                        session_id=session_id,
+                    )
+                except Exception as e:
+                    return MermaidBatchEditResult(
+                        index=index,
+                        job_id=job.job_id,
+                        success=False,
+                        diagram_type=job.diagram_type,
+                        error=str(e),
+                    )
+            return MermaidBatchEditResult(
+                index=index,
+                job_id=job.job_id,
+                success=True,
+                content=content,
+                diagram_type=job.diagram_type,
+            )
+
+        logger.info(f'Running batch of {len(jobs)} Mermaid edits')
+        tasks = [asyncio.create_task(run(i, job)) for i, job in enumerate(jobs)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
     def _clean_mermaid_response(self, response: str) -> str:
         """Clean the AI response to extract valid Mermaid code.
 
@@ -0,0 +1,180 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-session and per-user rate limits for the Gemini-backed endpoints.
+
+Every request takes tokens from a bucket of its client address, of its
+session and, once the session has logged in under a name, of that user.
+Session IDs are chosen by the client and a new one is made up for every
+request without one, so the address bucket is what holds back a client
+that drops them; the user bucket keeps new sessions from resetting a
+user's allowance. A request rejected by one of its buckets is charged to
+none of them. Agent queries, Mermaid
+edits and uploaded bytes have separate buckets. Buckets are kept in memory
+per worker unless RATE_LIMIT_SHARED puts them in Redis.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from fastapi import Request
+from loguru import logger as _logger
+
+from src.app.services.admission_control import session_key
+from src.lib.config import settings
+from src.lib.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RedisRateLimitBackend,
+)
+
+# Login name used when none is given; shared by everyone who skips it
+ANONYMOUS_USER = 'Anonymous'
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request exceeds a rate limit."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class BucketLimit:
+    """Refill rate and capacity of one kind of bucket."""
+
+    per_minute: float
+    burst: float
+
+    @property
+    def rate(self) -> float:
+        """Return the tokens added per second."""
+        return self.per_minute / 60
+
+
+def client_address(request: Request) -> str:
+    """Return the address a request came from.
+
+    Behind `RATE_LIMIT_TRUSTED_PROXIES` proxies, each appending the address
+    it received the request from to X-Forwarded-For, the client is that many
+    entries from the end; earlier entries are set by the client and ignored.
+    """
+    hops = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if hops > 0:
+        forwarded = [
+            address.strip()
+            for address in request.headers.get('x-forwarded-for', '').split(',')
+            if address.strip()
+        ]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else 'unknown'
+
+
+def rate_limit_keys(request: Request, user_name: str | None = None) -> list[str]:
+    """Return the bucket keys a request is charged to.
+
+    Args:
+        request: The incoming request
+        user_name: Name the session logged in with, if any
+
+    Returns:
+        The client address and session keys, followed by the user key for
+        named users
+    """
+    keys = [f'ip:{client_address(request)}', f'session:{session_key(request)}']
+    if user_name and user_name != ANONYMOUS_USER:
+        keys.append(f'user:{user_name}')
+    return keys
+
+
+def _build_backend() -> RateLimitBackend:
+    """Create the bucket storage configured in settings."""
+    if settings.RATE_LIMIT_SHARED and settings.REDIS_URL:
+        return RedisRateLimitBackend(settings.REDIS_URL, prefix='ratelimit')
+    return InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+class RateLimiter:
+    """Token bucket limits by kind of request.
+
+    Backend errors are logged and let the request through, so an
+    unreachable Redis cannot take the API down with it.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend | None = None,
+        limits: dict[str, BucketLimit] | None = None,
+        enabled: bool | None = None,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            backend: Bucket storage
+            limits: Limit of each kind of bucket
+            enabled: Whether requests are limited at all
+        """
+        self.backend = backend or _build_backend()
+        self.limits = limits or {
+            'chat': BucketLimit(
+                settings.RATE_LIMIT_CHAT_PER_MINUTE, settings.RATE_LIMIT_CHAT_BURST
+            ),
+            'edit': BucketLimit(
+                settings.RATE_LIMIT_EDIT_PER_MINUTE, settings.RATE_LIMIT_EDIT_BURST
+            ),
+            'upload_bytes': BucketLimit(
+                settings.RATE_LIMIT_UPLOAD_BYTES_PER_MINUTE,
+                settings.RATE_LIMIT_UPLOAD_BYTES_BURST,
+            ),
+        }
+        self.enabled = settings.RATE_LIMIT_ENABLED if enabled is None else enabled
+
+    async def check(self, bucket: str, keys: list[str], cost: float = 1) -> None:
+        """Charge a request to the buckets of its session and user.
+
+        A cost above the bucket capacity is charged as a full bucket, so a
+        large request is allowed once the bucket has refilled.
+
+        Args:
+            bucket: Kind of bucket, one of `limits`
+            keys: Bucket keys from `rate_limit_keys`
+            cost: Tokens the request takes
+
+        Raises:
+            RateLimitExceeded: If any of the buckets lacks the tokens; none
+              of them is charged then
+        """
+        if not self.enabled or cost <= 0:
+            return
+        limit = self.limits[bucket]
+        cost = min(cost, limit.burst)
+        try:
+            wait = await self.backend.consume(
+                [f'{bucket}:{key}' for key in keys], cost, limit.rate, limit.burst
+            )
+        except Exception as e:
+            _logger.warning(f'Rate limit check failed, allowing request: {e}')
+            return
+        if wait > 0:
+            _logger.warning(f'Rate limited {bucket} requests of {", ".join(keys)}')
+            raise RateLimitExceeded(
+                'Rate limit exceeded; try again later', max(1, math.ceil(wait))
+            )
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,237 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Asset table for serving the static frontend build.
+
+The build directory is scanned once at startup. Every file gets an entry
+with its media type, size, ETag and cache policy, plus its precompressed
+variants: `.br` and `.gz` siblings produced by the build, and an in-memory
+gzip copy of compressible files that are small enough to keep in memory.
+Requests are then answered from the table without touching the file system,
+except to stream files too large to cache.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi.responses import FileResponse, Response
+from loguru import logger as _logger
+
+from src.lib.content_coding import accepted_encodings
+
+# Content-addressed Next.js bundles never change under the same URL
+IMMUTABLE_PREFIX = '_next/static/'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Pages keep their URL across deploys and must be revalidated
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Content codings in order of preference and their file suffixes
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/manifest+json',
+    'application/xml',
+    'image/svg+xml',
+)
+
+
+@dataclass
+class Representation:
+    """One encoding of an asset, on disk and optionally in memory."""
+
+    path: Path
+    size: int
+    etag: str
+    body: bytes | None = None
+
+
+@dataclass
+class Asset:
+    """A servable file and its precompressed variants."""
+
+    media_type: str
+    cache_control: str
+    identity: Representation
+    encoded: dict[str, Representation] = field(default_factory=dict)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Return whether an If-None-Match header matches an ETag (weakly)."""
+    if if_none_match.strip() == '*':
+        return True
+    return any(
+        candidate.strip().removeprefix('W/') == etag
+        for candidate in if_none_match.split(',')
+    )
+
+
+class AssetTable:
+    """Static frontend files indexed by URL path."""
+
+    def __init__(
+        self,
+        root: Path,
+        memory_max_bytes: int = 256 * 1024,
+        memory_budget_bytes: int = 32 * 1024 * 1024,
+    ):
+        """Scan the build directory.
+
+        Args:
+            root: Directory of the static frontend build
+            memory_max_bytes: Largest file kept in memory
+            memory_budget_bytes: Total size of the files kept in memory
+        """
+        self.root = root
+        self.memory_max_bytes = memory_max_bytes
+        self.memory_budget_bytes = memory_budget_bytes
+        self.memory_used = 0
+        self._assets: dict[str, Asset] = {}
+        self._scan()
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def _representation(self, path: Path, suffix: str = '') -> Representation:
+        """Describe a file, loading it into memory if it is small."""
+        stat = path.stat()
+        body = None
+        if (
+            stat.st_size <= self.memory_max_bytes
+            and self.memory_used + stat.st_size <= self.memory_budget_bytes
+        ):
+            body = path.read_bytes()
+            self.memory_used += stat.st_size
+        return Representation(
+            path=path,
+            size=stat.st_size,
+            etag=f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"',
+            body=body,
+        )
+
+    def _scan(self):
+        """Build the table from every file under the root."""
+        suffixes = {suffix for _, suffix in ENCODINGS}
+        for path in sorted(self.root.rglob('*')):
+            if not path.is_file() or path.suffix in suffixes:
+                continue
+            key = path.relative_to(self.root).as_posix()
+            media_type = (
+                mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            )
+            asset = Asset(
+                media_type=media_type,
+                cache_control=(
+                    IMMUTABLE_CACHE_CONTROL
+                    if key.startswith(IMMUTABLE_PREFIX)
+                    else REVALIDATE_CACHE_CONTROL
+                ),
+                identity=self._representation(path),
+            )
+            for coding, suffix in ENCODINGS:
+                variant = path.with_name(path.name + suffix)
+                if variant.is_file():
+                    asset.encoded[coding] = self._representation(variant, suffix)
+
+            identity = asset.identity
+            if (
+                'gzip' not in asset.encoded
+                and identity.body is not None
+                and media_type.startswith(_COMPRESSIBLE_TYPES)
+            ):
+                compressed = gzip.compress(identity.body, compresslevel=9, mtime=0)
+                if len(compressed) < identity.size:
+                    self.memory_used += len(compressed)
+                    asset.encoded['gzip'] = Representation(
+                        path=path,
+                        size=len(compressed),
+                        etag=identity.etag[:-1] + '.gz"',
+                        body=compressed,
+                    )
+
+            self._assets[key] = asset
+        _logger.info(
+            f'Indexed {len(self._assets)} frontend assets '
+            f'({self.memory_used // 1024} KiB in memory)'
+        )
+
+    def resolve(self, path: str) -> Asset | None:
+        """Return the asset serving an SPA path.
+
+        A file matching the path wins, then `<path>.html`, then `index.html`
+        so the client-side router can handle the path. Missing `_next`
+        bundles are not answered with the index page.
+        """
+        path = path.strip('/')
+        asset = self._assets.get(path) if path != 'index.html' else None
+        if asset is None:
+            asset = self._assets.get(f'{path}.html')
+        if asset is None and not path.startswith('_next/'):
+            asset = self._assets.get('index.html')
+        return asset
+
+    @staticmethod
+    def respond(asset: Asset, headers) -> Response:
+        """Answer a request for an asset.
+
+        Picks the best encoding the client accepts, answers 304 when the
+        client's copy is current and serves cached bodies from memory.
+
+        Args:
+            asset: The asset to serve
+            headers: Request headers
+
+        Returns:
+            The response
+        """
+        representation = asset.identity
+        coding = None
+        if asset.encoded:
+            accepted = accepted_encodings(headers.get('accept-encoding', ''))
+            for candidate, _ in ENCODINGS:
+                if candidate in accepted and candidate in asset.encoded:
+                    coding = candidate
+                    representation = asset.encoded[candidate]
+                    break
+
+        response_headers = {
+            'Cache-Control': asset.cache_control,
+            'ETag': representation.etag,
+        }
+        if asset.encoded:
+            response_headers['Vary'] = 'Accept-Encoding'
+
+        if_none_match = headers.get('if-none-match')
+        if if_none_match and _etag_matches(if_none_match, representation.etag):
+            return Response(status_code=304, headers=response_headers)
+
+        if coding is not None:
+            response_headers['Content-Encoding'] = coding
+        if representation.body is not None:
+            return Response(
+                representation.body,
+                media_type=asset.media_type,
+                headers=response_headers,
+            )
+        return FileResponse(
+            representation.path,
+            media_type=asset.media_type,
+            headers=response_headers,
+        )
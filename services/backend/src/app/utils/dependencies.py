@@ -20,17 +20,19 @@ import logging
 import time
 import uuid
 from functools import lru_cache
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 from fastapi import Depends, HTTPException, Request, Response
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService, Session
 
-from src.agents.agent_factory import agent_factory
 from src.app.models import AgentConfig
 from src.app.services.mermaid_edit_service import MermaidEditService
 from src.lib.config import settings
 
+if TYPE_CHECKING:
+    from google.adk.artifacts import BaseArtifactService
+    from google.adk.runners import Runner
+    from google.adk.sessions import BaseSessionService, Session
+
 _logger = logging.getLogger(__name__)
 
 
@@ -47,16 +49,67 @@ def get_agent_config() -> AgentConfig:
     )
 
 
-def get_session_service(request: Request) -> InMemorySessionService:
-    """Gets the session service instance from the application state.
+def create_session_service() -> BaseSessionService:
+    """Creates the ADK session service.
+
+    Sessions are kept in worker memory unless SESSION_DB_URL names a
+    database, which every worker then shares.
+
+    Returns:
+        The session service.
+
+    Raises:
+        RuntimeError: If SESSION_DB_URL is set but the sessions extra is
+          not installed.
+    """
+    if not settings.SESSION_DB_URL:
+        from google.adk.sessions import InMemorySessionService
+
+        return InMemorySessionService()
+    try:
+        from google.adk.sessions import DatabaseSessionService
+    except ImportError as e:
+        raise RuntimeError(
+            'google-adk[db] is required for SESSION_DB_URL; '
+            'install it with `uv sync --extra sessions`'
+        ) from e
+    return DatabaseSessionService(db_url=settings.SESSION_DB_URL)
+
+
+def get_session_service(request: Request) -> BaseSessionService:
+    """Gets the session service, creating it on first use.
+
+    ADK is only imported once a request needs a session, so processes that
+    only serve static files and health checks start quickly.
 
     Args:
         request: The incoming FastAPI request object.
 
     Returns:
-        An instance of InMemorySessionService.
+        The application's session service.
     """
-    return request.app.state.session_service
+    state = request.app.state
+    if getattr(state, 'session_service', None) is None:
+        state.session_service = create_session_service()
+    return state.session_service
+
+
+def get_artifact_service(request: Request) -> BaseArtifactService:
+    """Gets the artifact service, creating it on first use.
+
+    Args:
+        request: The incoming FastAPI request object.
+
+    Returns:
+        The application's artifact service.
+    """
+    state = request.app.state
+    if getattr(state, 'artifact_service', None) is None:
+        from google.adk.artifacts import InMemoryArtifactService
+
+        state.artifact_service = InMemoryArtifactService()
+        _logger.info('Initialized InMemoryArtifactService for artifacts')
+    return state.artifact_service
 
 
 async def get_session_model(
@@ -157,6 +210,30 @@ async def get_or_create_session(
     return session
 
 
+async def get_session_user(
+    request: Request,
+    config: Annotated[AgentConfig, Depends(get_agent_config)],
+) -> str | None:
+    """Gets the name the session's user logged in with.
+
+    Unlike `get_or_create_session`, this never creates a session.
+
+    Args:
+        request: The incoming FastAPI request object.
+        config: The agent configuration.
+
+    Returns:
+        The user name, or None if the session does not exist or never
+        logged in.
+    """
+    session = await get_session_service(request).get_session(
+        app_name=config.app_name,
+        user_id=config.user_id,
+        session_id=request.state.candidate_session_id,
+    )
+    return session.state.get('user_name') if session else None
+
+
 def get_runner(
     request: Request,
     config: Annotated[AgentConfig, Depends(get_agent_config)],
@@ -180,6 +257,10 @@ def get_runner(
     runner_key = f'runner_{model_name.replace("-", "_").replace(".", "_")}__{platform}'
 
     if not hasattr(request.app.state, runner_key):
+        from google.adk.runners import Runner
+
+        from src.agents.agent_factory import agent_factory
+
         try:
             # Get the model-specific agent from the factory
             agent = agent_factory.get_agent(model_name, platform=platform)
@@ -188,8 +269,8 @@ def get_runner(
             runner = Runner(
                 agent=agent,
                 app_name=config.app_name,
-                session_service=request.app.state.session_service,
-                artifact_service=request.app.state.artifact_service,
+                session_service=get_session_service(request),
+                artifact_service=get_artifact_service(request),
             )
             setattr(request.app.state, runner_key, runner)
             _logger.info(f'Created new Runner for model: {model_name}')
@@ -19,10 +19,6 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timedelta
 
-import google.auth
-from google.auth import impersonated_credentials
-from google.cloud import storage
-
 _logger = logging.getLogger(__name__)
 
 
@@ -52,6 +48,10 @@ def generate_download_signed_url(
         _logger.error('Invalid GCS URI format: %s', uri)
         return None
 
+    import google.auth
+    from google.auth import impersonated_credentials
+    from google.cloud import storage
+
     try:
         credentials, _ = google.auth.default()
 
@@ -12,57 +12,321 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Server-Sent Events (SSE) support for real-time agent status updates."""
+"""Server-Sent Events (SSE) support for real-time agent status updates.
+
+Every open stream is a subscriber of its session. A session can have any
+number of subscribers (e.g. several browser tabs), each with a small bounded
+buffer: consecutive status updates are coalesced into the latest one and the
+oldest events are dropped when a slow client falls behind. Keep-alives for all
+streams are driven by a single shared heartbeat task instead of one timer per
+connection, so idle streams cost only their buffer.
+
+Every event gets a monotonically increasing ID and is kept for a short while
+in a per-session replay buffer, so a client that reconnects with the standard
+`Last-Event-ID` header receives the events it missed, including a
+`final_response` published while it was disconnected.
+
+Events travel through a pub/sub transport before they reach the streams. The
+default in-process transport delivers them directly; with the shared Redis
+transport every worker receives every event, so a response produced by one
+worker reaches a stream held open by another.
+"""
 
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
-from typing import AsyncGenerator, Dict
+from collections import deque
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple
+
+from src.lib.config import settings
+from src.lib.pubsub import InProcessPubSub, PubSubBackend, RedisPubSub
+from src.lib.serialization import dumps_str
 
 _logger = logging.getLogger(__name__)
 
+_KEEP_ALIVE = 'data: {"type": "keep_alive"}\n\n'
+
+# Interval between sweeps of expired replay buffers
+_HISTORY_SWEEP_SECONDS = 60.0
+
+_Event = Tuple[int, Dict[str, Any]]
+
+
+class _EventIds:
+    """Monotonic event IDs derived from the wall clock in microseconds.
+
+    Clock-based IDs keep increasing across restarts, so a reconnecting client
+    never holds an ID that is ahead of fresh events.
+    """
+
+    def __init__(self):
+        self._last = 0
+
+    def next(self) -> int:
+        """Return an ID strictly greater than every previous one."""
+        self._last = max(self._last + 1, time.time_ns() // 1000)
+        return self._last
+
+
+class _SessionHistory:
+    """Recent events of a session, bounded by count and age."""
+
+    __slots__ = ('events', 'max_age')
+
+    def __init__(self, max_events: int, max_age: float):
+        self.events: deque[Tuple[float, int, Dict[str, Any]]] = deque(maxlen=max_events)
+        self.max_age = max_age
+
+    def append(self, event_id: int, update: Dict[str, Any]):
+        """Record an event."""
+        self.events.append((time.monotonic(), event_id, update))
+
+    def expire(self) -> bool:
+        """Drop events older than the retention age.
+
+        Returns:
+            True if the history is now empty.
+        """
+        cutoff = time.monotonic() - self.max_age
+        while self.events and self.events[0][0] < cutoff:
+            self.events.popleft()
+        return not self.events
+
+    def since(self, last_event_id: int) -> List[_Event]:
+        """Return retained events newer than `last_event_id`."""
+        self.expire()
+        return [
+            (event_id, update)
+            for _, event_id, update in self.events
+            if event_id > last_event_id
+        ]
+
+
+class _Subscriber:
+    """A single SSE stream and its bounded event buffer."""
+
+    __slots__ = (
+        'session_id',
+        'buffer',
+        'max_events',
+        'wakeup',
+        'last_active',
+        'dropped',
+    )
+
+    def __init__(self, session_id: str, max_events: int):
+        self.session_id = session_id
+        self.buffer: deque[_Event] = deque()
+        self.max_events = max_events
+        self.wakeup = asyncio.Event()
+        self.last_active = time.monotonic()
+        self.dropped = 0
+
+    def push(self, event: _Event):
+        """Buffer an event, coalescing status updates and dropping the oldest."""
+        if (
+            event[1]['type'] == 'status_update'
+            and self.buffer
+            and self.buffer[-1][1]['type'] == 'status_update'
+        ):
+            self.buffer[-1] = event
+        else:
+            if len(self.buffer) >= self.max_events:
+                self.buffer.popleft()
+                self.dropped += 1
+            self.buffer.append(event)
+        self.last_active = time.monotonic()
+        self.wakeup.set()
+
+
+def shared_pubsub_enabled() -> bool:
+    """Return whether events are shared across workers through Redis."""
+    return settings.SSE_SHARED_PUBSUB and bool(settings.REDIS_URL)
+
+
+def _build_transport() -> PubSubBackend:
+    """Create the event transport configured in settings."""
+    if shared_pubsub_enabled():
+        return RedisPubSub(settings.REDIS_URL, channel=settings.SSE_PUBSUB_CHANNEL)
+    return InProcessPubSub()
+
 
 class SSEManager:
     """Manages Server-Sent Events for real-time communication with frontend."""
 
-    def __init__(self):
-        self._connections: Dict[str, asyncio.Queue] = {}
+    def __init__(
+        self,
+        keepalive_interval: Optional[float] = None,
+        max_buffered_events: Optional[int] = None,
+        replay_max_events: Optional[int] = None,
+        replay_max_age: Optional[float] = None,
+        transport: Optional[PubSubBackend] = None,
+    ):
+        self.keepalive_interval = keepalive_interval or settings.SSE_KEEPALIVE_SECONDS
+        self.max_buffered_events = (
+            max_buffered_events or settings.SSE_SUBSCRIBER_BUFFER_SIZE
+        )
+        self.replay_max_events = replay_max_events or settings.SSE_REPLAY_MAX_EVENTS
+        self.replay_max_age = replay_max_age or settings.SSE_REPLAY_MAX_AGE_SECONDS
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._history: Dict[str, _SessionHistory] = {}
+        self._event_ids = _EventIds()
+        self._last_sweep = time.monotonic()
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.transport = transport or _build_transport()
+        self._transport_started = False
+
+    async def start(self):
+        """Start receiving events from the transport.
+
+        Called at application startup so that every worker records events for
+        replay; publishing or streaming also starts it on first use.
+        """
+        if not self._transport_started:
+            await self.transport.start(self._deliver)
+            self._transport_started = True
+
+    async def close(self):
+        """Stop receiving events from the transport."""
+        if self._transport_started:
+            await self.transport.close()
+            self._transport_started = False
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of open streams across all sessions."""
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(
+        self, session_id: str, last_event_id: Optional[int] = None
+    ) -> _Subscriber:
+        """Register a new stream for a session.
+
+        Args:
+            session_id: The session to stream events for.
+            last_event_id: ID of the last event the client received; retained
+                events after it are queued for replay.
+        """
+        subscriber = _Subscriber(session_id, self.max_buffered_events)
+        history = self._history.get(session_id)
+        if last_event_id is not None and history is not None:
+            missed = history.since(last_event_id)
+            subscriber.buffer.extend(missed[-self.max_buffered_events :])
+            if missed:
+                subscriber.wakeup.set()
+                _logger.info(
+                    f'Replaying {len(missed)} SSE events for session {session_id}'
+                )
+        self._subscribers.setdefault(session_id, set()).add(subscriber)
+        self._ensure_heartbeat()
+        _logger.info(f'Added SSE subscriber for session {session_id}')
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber):
+        """Remove a stream without affecting other streams of its session."""
+        subscribers = self._subscribers.get(subscriber.session_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.session_id]
+        _logger.info(f'Removed SSE subscriber for session {subscriber.session_id}')
+
+    def _ensure_heartbeat(self):
+        """Start the shared heartbeat task if it is not running."""
+        if self._heartbeat is not None and not self._heartbeat.done():
+            if self._heartbeat.get_loop() is asyncio.get_running_loop():
+                return
+        self._heartbeat = asyncio.create_task(self._run_heartbeat())
+
+    async def _run_heartbeat(self):
+        """Wake streams that stayed idle for a full interval to send keep-alives.
+
+        Runs while at least one stream is open, checking four times per
+        interval so no stream stays silent for much longer than the interval.
+        """
+        while self._subscribers:
+            await asyncio.sleep(self.keepalive_interval / 4)
+            deadline = time.monotonic() - self.keepalive_interval
+            for subscribers in list(self._subscribers.values()):
+                for subscriber in subscribers:
+                    if subscriber.last_active <= deadline:
+                        subscriber.last_active = time.monotonic()
+                        subscriber.wakeup.set()
+
+    def _sweep_history(self):
+        """Forget replay buffers whose events have all expired."""
+        now = time.monotonic()
+        if now - self._last_sweep < _HISTORY_SWEEP_SECONDS:
+            return
+        self._last_sweep = now
+        for session_id in [
+            session_id
+            for session_id, history in self._history.items()
+            if history.expire()
+        ]:
+            del self._history[session_id]
+
+    async def _publish(self, session_id: str, update: Dict[str, Any]):
+        """Assign an event ID and hand an update to the transport.
 
-    def add_connection(self, session_id: str) -> asyncio.Queue:
-        """Add a new SSE connection for a session."""
-        queue = asyncio.Queue()
-        self._connections[session_id] = queue
-        _logger.info(f'Added SSE connection for session {session_id}')
-        return queue
+        If the transport fails the event is still delivered to this worker's
+        streams.
+        """
+        message = {
+            'session_id': session_id,
+            'id': self._event_ids.next(),
+            'update': update,
+        }
+        try:
+            await self.start()
+            await self.transport.publish(message)
+        except Exception as e:
+            _logger.warning(f'SSE transport publish failed, delivering locally: {e}')
+            self._deliver(message)
+
+    def _deliver(self, message: Dict[str, Any]) -> int:
+        """Record a published event for replay and fan it out to every stream.
 
-    def remove_connection(self, session_id: str):
-        """Remove an SSE connection."""
-        if session_id in self._connections:
-            del self._connections[session_id]
-            _logger.info(f'Removed SSE connection for session {session_id}')
+        Returns:
+            The number of streams the event was delivered to.
+        """
+        self._sweep_history()
+        session_id = message['session_id']
+        event = (message['id'], message['update'])
+        history = self._history.get(session_id)
+        if history is None:
+            history = _SessionHistory(self.replay_max_events, self.replay_max_age)
+            self._history[session_id] = history
+        history.append(*event)
+
+        subscribers = self._subscribers.get(session_id, ())
+        for subscriber in subscribers:
+            subscriber.push(event)
+        return len(subscribers)
 
     async def send_status_update(
-        self, session_id: str, status: str, message: str = '', tool_name: str = ''
+        self,
+        session_id: str,
+        status: str,
+        message: str = '',
+        tool_name: str = '',
+        estimated_duration: Optional[int] = None,
     ):
         """Send a status update to the frontend."""
-        if session_id in self._connections:
-            update = {
-                'type': 'status_update',
-                'status': status,
-                'message': message,
-                'tool_name': tool_name,
-                'timestamp': time.time(),
-            }
-            try:
-                await self._connections[session_id].put(update)
-                _logger.debug(f'Sent status update to session {session_id}: {status}')
-            except Exception as e:
-                _logger.error(
-                    f'Error sending status update to session {session_id}: {e}'
-                )
+        update = {
+            'type': 'status_update',
+            'status': status,
+            'message': message,
+            'tool_name': tool_name,
+            'timestamp': time.time(),
+        }
+        if estimated_duration:
+            update['estimated_duration'] = estimated_duration
+        await self._publish(session_id, update)
+        _logger.debug(f'Sent status update to session {session_id}: {status}')
 
     async def send_tool_start(
         self, session_id: str, tool_name: str, estimated_duration: int = None
@@ -72,7 +336,9 @@ class SSEManager:
         if estimated_duration:
             message += f' (estimated {estimated_duration}s)'
 
-        await self.send_status_update(session_id, 'tool_running', message, tool_name)
+        await self.send_status_update(
+            session_id, 'tool_running', message, tool_name, estimated_duration
+        )
 
     async def send_tool_complete(self, session_id: str, tool_name: str):
         """Send notification that a tool has completed."""
@@ -87,36 +353,45 @@ class SSEManager:
             'response': response,
             'timestamp': time.time(),
         }
-        if session_id in self._connections:
-            try:
-                await self._connections[session_id].put(update)
-            except Exception as e:
-                _logger.error(
-                    f'Error sending final response to session {session_id}: {e}'
-                )
+        await self._publish(session_id, update)
+
+    async def generate_sse_stream(
+        self, session_id: str, last_event_id: Optional[int] = None
+    ) -> AsyncGenerator[str, None]:
+        """Generate SSE stream for a session.
 
-    async def generate_sse_stream(self, session_id: str) -> AsyncGenerator[str, None]:
-        """Generate SSE stream for a session."""
-        queue = self.add_connection(session_id)
+        Args:
+            session_id: The session to stream events for.
+            last_event_id: Value of the client's `Last-Event-ID`, if any.
+        """
+        await self.start()
+        subscriber = self.subscribe(session_id, last_event_id)
 
         try:
+            # Ask clients to reconnect quickly after a dropped connection
+            yield f'retry: {settings.SSE_RETRY_MILLISECONDS}\n\n'
             while True:
-                try:
-                    # Wait for updates with a timeout to send keep-alive
-                    update = await asyncio.wait_for(queue.get(), timeout=30.0)
+                await subscriber.wakeup.wait()
+                subscriber.wakeup.clear()
 
-                    # Format as SSE
-                    data = json.dumps(update)
-                    yield f'data: {data}\n\n'
+                if not subscriber.buffer:
+                    # Woken by the heartbeat after a full idle interval
+                    yield _KEEP_ALIVE
+                    continue
 
-                except asyncio.TimeoutError:
-                    # Send keep-alive
-                    yield 'data: {"type": "keep_alive"}\n\n'
+                while subscriber.buffer:
+                    event_id, update = subscriber.buffer.popleft()
+                    yield f'id: {event_id}\ndata: {dumps_str(update)}\n\n'
 
         except Exception as e:
             _logger.error(f'Error in SSE stream for session {session_id}: {e}')
         finally:
-            self.remove_connection(session_id)
+            if subscriber.dropped:
+                _logger.warning(
+                    f'SSE subscriber for session {session_id} dropped '
+                    f'{subscriber.dropped} events'
+                )
+            self.unsubscribe(subscriber)
 
 
 sse_manager = SSEManager()
@@ -0,0 +1,203 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded TTL result cache with in-memory and Redis backends."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger as _logger
+
+
+class CacheBackend(ABC):
+    """Abstract base class for cache backends."""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Return the cached value for a key, or None if absent or expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value for `ttl` seconds."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+        pass
+
+    def size(self) -> int | None:
+        """Return the number of entries, if cheaply known."""
+        return None
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 512):
+        """Initialize the in-memory cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+        """
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        """Return a live entry and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store an entry, evicting the least recently used ones if full."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+    def size(self) -> int | None:
+        """Return the number of stored entries (including expired ones)."""
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by every worker.
+
+    Entries expire through Redis TTLs; the overall bound is enforced by the
+    server's `maxmemory` eviction policy.
+    """
+
+    def __init__(self, url: str, prefix: str = 'cache'):
+        """Initialize the Redis cache.
+
+        Args:
+            url: Redis connection URL, e.g. redis://localhost:6379/0
+            prefix: Key prefix used to namespace entries
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                'The redis package is required for a shared cache; '
+                'install it with `uv sync --extra redis`'
+            ) from e
+
+        self.prefix = prefix
+        self.client = redis.from_url(url, decode_responses=True)
+        _logger.info(f'Initialized Redis cache with prefix {prefix}')
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached value for a key."""
+        return await self.client.get(f'{self.prefix}:{key}')
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a value with a Redis expiry."""
+        await self.client.set(f'{self.prefix}:{key}', value, ex=max(1, int(ttl)))
+
+    async def clear(self) -> None:
+        """Remove every entry under the prefix."""
+        async for key in self.client.scan_iter(match=f'{self.prefix}:*'):
+            await self.client.delete(key)
+
+
+class ResultCache:
+    """Result cache with hit-rate accounting.
+
+    Backend errors are logged and treated as misses so that the cache can
+    never fail the request it is meant to speed up.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, name: str = 'cache'):
+        """Initialize the result cache.
+
+        Args:
+            backend: Storage backend for cached values
+            ttl: Entry lifetime in seconds
+            name: Name used in logs and metrics
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Return a stable SHA-256 key for a tuple of JSON-serializable parts."""
+        payload = json.dumps(parts, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        """Look up a key, recording a hit or a miss."""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            _logger.warning(f'{self.name} lookup failed: {e}')
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a value for the configured TTL."""
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            _logger.warning(f'{self.name} store failed: {e}')
+
+    async def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        await self.backend.clear()
+        self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit-rate metrics for this process."""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'backend': type(self.backend).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': self.backend.size(),
+            'evictions': getattr(self.backend, 'evictions', None),
+            'ttl_seconds': self.ttl,
+        }
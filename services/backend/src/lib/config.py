@@ -69,6 +69,14 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     ENVIRONMENT: str = 'development'
 
+    # Production server (gunicorn.conf.py)
+    SERVER_WORKERS: int = 0  # 0 derives the count from the cgroup CPU quota
+    SERVER_TIMEOUT_SECONDS: int = 60  # Restart workers unresponsive this long
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30  # To finish requests on shutdown
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_MAX_REQUESTS: int = 10000  # Recycle workers after this many requests
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+
     # API settings
     API_TITLE: str = 'Architecture Designer API'
     API_DESCRIPTION: str = (
@@ -79,6 +87,15 @@ class Settings(BaseSettings):
     # Frontend URL for CORS
     FRONTEND_URL: str = 'http://localhost:3000'
 
+    # Static frontend serving
+    STATIC_MEMORY_MAX_FILE_BYTES: int = 262144  # Largest frontend file kept in memory
+    STATIC_MEMORY_BUDGET_BYTES: int = 33554432  # Frontend files kept in memory
+
+    # Response compression
+    COMPRESSION_MIN_BYTES: int = 1024  # Smallest complete body compressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Used when brotli is installed
+
     # Google Cloud settings
     GOOGLE_CLOUD_PROJECT: str
     GOOGLE_CLOUD_LOCATION: str
@@ -91,6 +108,22 @@ class Settings(BaseSettings):
     GEMINI_MODEL_PRO: str = 'gemini-2.5-pro'
     DEFAULT_MODEL: str = 'gemini-2.5-flash'
 
+    # Connection pool of the shared Gemini client (per worker)
+    GEMINI_HTTP_MAX_CONNECTIONS: int = 64
+    GEMINI_HTTP_MAX_KEEPALIVE: int = 32  # Idle connections kept open
+    GEMINI_HTTP_KEEPALIVE_SECONDS: float = 60.0
+    GEMINI_HTTP_TIMEOUT_SECONDS: float = 180.0  # Whole request, incl. thinking
+
+    # Retries and hedging of Gemini calls
+    GEMINI_RETRY_MAX_ATTEMPTS: int = 3  # Including the first request
+    GEMINI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    GEMINI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    GEMINI_DEADLINE_SECONDS: float = 240.0  # Budget for all attempts of a call
+    GEMINI_HEDGING_ENABLED: bool = False  # Race slow requests against a second
+    GEMINI_HEDGE_QUANTILE: float = 0.95  # Latency after which to hedge
+    GEMINI_HEDGE_MIN_SAMPLES: int = 20  # Requests measured before hedging
+    GEMINI_LATENCY_WINDOW: int = 200  # Recent requests kept per operation
+
     # Model configuration
     AVAILABLE_MODELS: dict = {
         'gemini-2.5-flash': {
@@ -111,11 +144,74 @@ class Settings(BaseSettings):
         },
     }
 
+    # Mermaid editing settings
+    MERMAID_SCOPED_EDIT_MIN_CHARS: int = 8000  # Auto-scope diagrams above this
+    MERMAID_SCOPED_EDIT_MAX_RATIO: float = 0.5  # Largest slice worth scoping
+    MERMAID_EDIT_CACHE_ENABLED: bool = True
+    MERMAID_EDIT_CACHE_MAX_ENTRIES: int = 512
+    MERMAID_EDIT_CACHE_TTL_SECONDS: int = 3600
+    MERMAID_EDIT_CACHE_SHARED: bool = False  # Share across workers via REDIS_URL
+    MERMAID_BATCH_MAX_CONCURRENCY: int = 4  # Concurrent Gemini calls per batch
+
+    # Admission control for Gemini-backed endpoints (per worker)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 16  # Gemini calls in flight
+    ADMISSION_CHAT_LIMIT: int = 12  # Slots agent queries may hold
+    ADMISSION_EDIT_LIMIT: int = 8  # Slots Mermaid edits may hold
+    ADMISSION_BATCH_LIMIT: int = 4  # Slots batch edit jobs may hold
+    ADMISSION_MAX_QUEUE: int = 64  # Waiting requests before rejecting with 429
+    ADMISSION_MAX_QUEUED_PER_SESSION: int = 8
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 30.0
+
+    # Per-session and per-user rate limits (token buckets)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_CHAT_PER_MINUTE: float = 20
+    RATE_LIMIT_CHAT_BURST: float = 10
+    RATE_LIMIT_EDIT_PER_MINUTE: float = 60  # Batch edits cost one per job
+    RATE_LIMIT_EDIT_BURST: float = 100
+    RATE_LIMIT_UPLOAD_BYTES_PER_MINUTE: float = 100 * 1024 * 1024
+    RATE_LIMIT_UPLOAD_BYTES_BURST: float = 50 * 1024 * 1024
+    RATE_LIMIT_MAX_KEYS: int = 10000  # In-memory buckets before LRU eviction
+    RATE_LIMIT_SHARED: bool = False  # Share buckets across workers via REDIS_URL
+    RATE_LIMIT_TRUSTED_PROXIES: int = 0  # Proxies adding to X-Forwarded-For
+
+    # Server-Sent Events settings
+    SSE_KEEPALIVE_SECONDS: float = 30.0
+    SSE_SUBSCRIBER_BUFFER_SIZE: int = 64  # Events buffered per open stream
+    SSE_REPLAY_MAX_EVENTS: int = 50  # Recent events kept per session for replay
+    SSE_REPLAY_MAX_AGE_SECONDS: float = 300.0
+    SSE_RETRY_MILLISECONDS: int = 3000  # Reconnection delay hint sent to clients
+    SSE_SHARED_PUBSUB: bool = False  # Deliver events across workers via REDIS_URL
+    SSE_PUBSUB_CHANNEL: str = 'sse:events'
+
+    # Tool progress estimates
+    TOOL_ETA_WINDOW: int = 100  # Recent calls kept per tool and model
+    TOOL_ETA_QUANTILE: float = 0.75  # Quantile reported as the estimate
+    TOOL_ETA_DEFAULT_SECONDS: int = 20  # Estimate before any call was measured
+
+    # Shared state backend for multi-worker deployments (optional)
+    REDIS_URL: str = ''
+    SESSION_DB_URL: str = ''  # Database shared by all workers for ADK sessions
+
     # Data configuration
     BUGS_DIR: str = 'bugs'
     USE_GCS_FOR_BUGS: bool = False  # Whether to store bugs in Google Cloud Storage
     GCS_BUGS_BUCKET: str = 'flowgen'  # GCS bucket name for bug reports
     GCS_BUGS_PATH: str = 'bugs'  # Path within the bucket
+    GCS_BUGS_LAYOUT: str = 'segmented'  # 'segmented' or legacy single 'jsonl'
+    GCS_BUGS_COMPACT_EVERY: int = 32  # Saves between segment compactions
+    GCS_BUGS_MAX_SEGMENTS: int = 8  # Merge segments above this count
+    GCS_BUGS_IO_THREADS: int = 8  # Threads for blocking GCS calls
+    BUGS_IO_TIMEOUT_SECONDS: float = 30.0  # Per-call bug storage timeout
+    BUGS_DURABILITY: str = 'batch'  # Sync writes per 'batch' or per 'report'
+    BUGS_PAYLOAD_CODEC: str = 'gzip'  # Diagram/chat compression: 'gzip' or 'zstd'
+    BUGS_PAYLOAD_MIN_BYTES: int = 4096  # Smaller payloads stay in the record
+    BUGS_SEARCH_REFRESH_SECONDS: float = 30.0  # In-process search index refresh
+    BUG_QUEUE_ENABLED: bool = True  # Acknowledge reports before they are saved
+    BUG_QUEUE_MAX_BATCH: int = 50  # Most reports saved in one write
+    BUG_QUEUE_FLUSH_SECONDS: float = 1.0  # Longest wait to fill a batch
+    BUG_QUEUE_MAX_PENDING: int = 1000  # Unsaved reports before submissions wait
+    BUG_QUEUE_FALLBACK_FILE: str = 'unsaved_bug_reports.jsonl'  # Reports not saved
 
     @field_validator('BUGS_DIR', mode='before')
     @classmethod
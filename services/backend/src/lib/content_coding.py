@@ -0,0 +1,82 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""HTTP content coding negotiation and streaming compressors."""
+
+from __future__ import annotations
+
+import zlib
+from functools import cache
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Return the content codings an Accept-Encoding header accepts."""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        coding, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+@cache
+def brotli_available() -> bool:
+    """Return whether the optional brotli package is installed."""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class GzipStream:
+    """Incremental gzip compressor."""
+
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress data and flush it so the client can decode it now."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b'') -> bytes:
+        """Compress the last data and end the stream."""
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliStream:
+    """Incremental brotli compressor."""
+
+    def __init__(self, quality: int = 4):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress data and flush it so the client can decode it now."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b'') -> bytes:
+        """Compress the last data and end the stream."""
+        return self._compressor.process(data) + self._compressor.finish()
@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide Google GenAI client with a tuned connection pool.
+
+Every Gemini call in the backend, from the agents, their tools and the
+Mermaid edit service, goes through the one client returned by
+`get_genai_client`. It owns an httpx client for sync call sites
+(`client.models`) and one for async call sites (`client.aio.models`), both
+limited to GEMINI_HTTP_MAX_CONNECTIONS and keeping idle connections open
+for reuse.
+
+The client is created on first use rather than at import, so a gunicorn
+master that preloads the app never forks open connections into workers.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from loguru import logger as _logger
+
+from src.lib.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+    from google import genai
+
+
+class GenAIClientProvider:
+    """Lazily created GenAI client sharing two pooled httpx clients."""
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float | None = None,
+    ):
+        """Initialize the provider.
+
+        Args:
+            max_connections: Most open connections per httpx client
+            max_keepalive_connections: Most idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Seconds a whole Gemini request may take
+        """
+        self.max_connections = max_connections or settings.GEMINI_HTTP_MAX_CONNECTIONS
+        self.max_keepalive_connections = (
+            max_keepalive_connections or settings.GEMINI_HTTP_MAX_KEEPALIVE
+        )
+        self.keepalive_expiry = (
+            keepalive_expiry or settings.GEMINI_HTTP_KEEPALIVE_SECONDS
+        )
+        self.timeout = timeout or settings.GEMINI_HTTP_TIMEOUT_SECONDS
+        self._client: genai.Client | None = None
+        self._http_client: httpx.Client | None = None
+        self._async_http_client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> genai.Client:
+        """Return the shared client, creating it on first use.
+
+        Raises:
+            ValueError: If no API key or Vertex AI project is configured
+        """
+        if self._client is not None:
+            return self._client
+        with self._lock:
+            if self._client is None:
+                self._client = self._create()
+        return self._client
+
+    def _create(self) -> genai.Client:
+        import httpx
+        from google import genai
+        from google.genai import types
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        http_client = httpx.Client(limits=limits, timeout=self.timeout)
+        async_http_client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        try:
+            # The SDK passes its timeout with every request, replacing the
+            # httpx default, and sends no timeout at all unless one is set
+            client = genai.Client(
+                http_options=types.HttpOptions(
+                    timeout=int(self.timeout * 1000),
+                    httpx_client=http_client,
+                    httpx_async_client=async_http_client,
+                )
+            )
+        except Exception:
+            http_client.close()
+            raise
+        self._http_client = http_client
+        self._async_http_client = async_http_client
+        _logger.info(
+            f'Initialized GenAI client with up to {self.max_connections} '
+            f'connections and a {self.timeout}s timeout'
+        )
+        return client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections; the next `get` starts over."""
+        with self._lock:
+            http_client = self._http_client
+            async_http_client = self._async_http_client
+            self._client = self._http_client = self._async_http_client = None
+        if http_client is not None:
+            http_client.close()
+        if async_http_client is not None:
+            await async_http_client.aclose()
+
+
+genai_client_provider = GenAIClientProvider()
+
+
+def get_genai_client() -> genai.Client:
+    """Return the process-wide GenAI client."""
+    return genai_client_provider.get()
@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rolling latency histograms used to estimate tool durations."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+
+from src.lib.config import settings
+
+# Upper bounds of the histogram buckets in seconds
+DEFAULT_BUCKETS = (0.5, 1, 2, 3, 5, 8, 12, 17, 25, 35, 50, 70, 100, 150, 240)
+
+
+class RollingHistogram:
+    """Bucketed histogram over the most recent latency samples."""
+
+    def __init__(self, window: int = 100, buckets: tuple = DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            window: Number of most recent samples to keep
+            buckets: Ascending bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        # The last bucket collects samples above the largest bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self._samples: deque[int] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a sample, evicting the oldest one when the window is full."""
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if seconds <= bound),
+            len(self.buckets),
+        )
+        if len(self._samples) == self._samples.maxlen:
+            self.counts[self._samples[0]] -= 1
+        self._samples.append(index)
+        self.counts[index] += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Return the q-quantile, interpolated within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            The estimated latency in seconds, or None without samples
+        """
+        if not self._samples:
+            return None
+
+        target = q * len(self._samples)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= target:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = (
+                    self.buckets[index]
+                    if index < len(self.buckets)
+                    else self.buckets[-1] * 1.5
+                )
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+        return float(self.buckets[-1])
+
+
+class LatencyTracker:
+    """Per-tool, per-model latency histograms."""
+
+    def __init__(
+        self,
+        window: int | None = None,
+        quantile: float | None = None,
+        default_estimate: int | None = None,
+    ):
+        """Initialize the tracker.
+
+        Args:
+            window: Samples kept per tool and model
+            quantile: Quantile reported as the estimate
+            default_estimate: Estimate in seconds before any sample is recorded
+        """
+        self.window = window or settings.TOOL_ETA_WINDOW
+        self.quantile = quantile or settings.TOOL_ETA_QUANTILE
+        self.default_estimate = (
+            default_estimate
+            if default_estimate is not None
+            else settings.TOOL_ETA_DEFAULT_SECONDS
+        )
+        self._histograms: dict[tuple[str, str], RollingHistogram] = {}
+
+    def record(self, tool_name: str, model: str, seconds: float) -> None:
+        """Record how long a tool call took."""
+        key = (tool_name, model)
+        if key not in self._histograms:
+            self._histograms[key] = RollingHistogram(self.window)
+        self._histograms[key].record(seconds)
+
+    def estimate(self, tool_name: str, model: str) -> int | None:
+        """Return the expected duration of a tool call in whole seconds."""
+        histogram = self._histograms.get((tool_name, model))
+        seconds = histogram.percentile(self.quantile) if histogram else None
+        if seconds is None:
+            return self.default_estimate or None
+        return max(1, math.ceil(seconds))
+
+    def stats(self) -> dict[str, dict[str, float | int | None]]:
+        """Return sample counts and quantiles per tool and model."""
+        return {
+            f'{tool_name}@{model}': {
+                'samples': len(histogram),
+                'p50': histogram.percentile(0.5),
+                'p90': histogram.percentile(0.9),
+            }
+            for (tool_name, model), histogram in self._histograms.items()
+        }
+
+
+tool_latency = LatencyTracker()
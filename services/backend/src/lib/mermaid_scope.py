@@ -0,0 +1,484 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Scoped editing helpers for large Mermaid flowcharts.
+
+Large diagrams are expensive to send to the model in full when an edit only
+concerns a handful of nodes. These helpers locate the subgraphs and nodes an
+instruction refers to (plus their one-hop neighbours), cut that slice out as a
+small standalone excerpt, and merge the edited excerpt back into the original
+diagram.
+
+Only `graph`/`flowchart` diagrams are supported; callers fall back to a full
+edit whenever `extract_edit_scope` returns None.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+_DIRECTIVE_RE = re.compile(r'^(graph|flowchart)\b', re.IGNORECASE)
+_SUBGRAPH_RE = re.compile(r'^subgraph\s+(?P<rest>.+?)\s*$')
+_SUBGRAPH_ID_RE = re.compile(r'^(?P<id>[\w-]+)\s*\[(?P<title>.*)\]$')
+
+# Node definitions with their label, e.g. A[Label], B((Label)), C{Label}
+_NODE_RE = re.compile(
+    r'\b(?P<id>[A-Za-z_]\w*)\s*'
+    r'(?:\[\[(?P<l1>.*?)\]\]|\[\((?P<l2>.*?)\)\]|\(\[(?P<l3>.*?)\]\)'
+    r'|\(\(\((?P<l4>.*?)\)\)\)|\(\((?P<l5>.*?)\)\)|\{\{(?P<l6>.*?)\}\}'
+    r'|\[(?P<l7>.*?)\]|\((?P<l8>.*?)\)|\{(?P<l9>.*?)\}|>(?P<l10>.*?)\])'
+)
+_EDGE_TEXT_RE = re.compile(r'(?:--|==|-\.)\s+[^->=.|]+?\s+(-->|==>|\.->|---|===)')
+_ARROW_RE = re.compile(r'<?(?:-{2,}|={2,}|-\.+-)(?:>|[ox](?=\s|$))?')
+_IDENT_RE = re.compile(r'\b[A-Za-z_]\w*\b')
+_ICON_RE = re.compile(r'fa[bsr]?:fa-[\w-]+')
+_LABEL_SPLIT_RE = re.compile(r'[()\[\]{}/,:;|]+')
+
+_KEYWORDS = frozenset(
+    {'end', 'subgraph', 'graph', 'flowchart', 'style', 'class', 'classDef'}
+    | {'click', 'linkStyle', 'direction'}
+)
+
+_MIN_LABEL_MATCH = 4
+
+
+@dataclass
+class _Block:
+    """A subgraph (or the diagram root) and the lines directly inside it."""
+
+    key: Optional[str]
+    title: str
+    start: int
+    end: int
+    parent: Optional[str] = None
+    lines: list[int] = field(default_factory=list)
+    children: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _ParsedDiagram:
+    """Line-level structure of a flowchart."""
+
+    lines: list[str]
+    header: Optional[int]
+    blocks: dict[Optional[str], _Block]
+    line_block: dict[int, Optional[str]]
+    labels: dict[str, str]
+    definitions: dict[str, int]
+    edges: list[tuple[int, set[str]]]
+    references: list[tuple[int, set[str]]]
+    has_link_styles: bool
+
+
+@dataclass
+class MermaidScope:
+    """A slice of a diagram selected for a scoped edit.
+
+    Attributes:
+        excerpt: Standalone Mermaid code containing only the selected slice,
+            wrapped in the subgraphs that enclose it.
+        node_ids: IDs of the nodes included in the slice.
+        subgraphs: Keys of the subgraphs included in full.
+    """
+
+    excerpt: str
+    node_ids: list[str]
+    subgraphs: list[str]
+    _diagram: _ParsedDiagram = field(repr=False)
+    _selected: set[int] = field(repr=False)
+    _whole: set[str] = field(repr=False)
+    _wrappers: set[Optional[str]] = field(repr=False)
+
+    @property
+    def size(self) -> int:
+        """Return the number of original lines covered by the slice."""
+        return len(self._selected)
+
+
+def _subgraph_key(rest: str) -> tuple[str, str]:
+    """Return the (key, title) of a subgraph declaration."""
+    match = _SUBGRAPH_ID_RE.match(rest)
+    if match:
+        return match.group('id'), match.group('title').strip().strip('"')
+    name = rest.strip().strip('"')
+    return name, name
+
+
+def _node_label(match: re.Match) -> str:
+    """Return the label captured by a `_NODE_RE` match."""
+    for i in range(1, 11):
+        label = match.group(f'l{i}')
+        if label is not None:
+            return label
+    return ''
+
+
+def _strip_labels(line: str) -> str:
+    """Remove labels and edge texts so only IDs and arrows remain."""
+    s = _NODE_RE.sub(lambda m: m.group('id'), line)
+    s = re.sub(r'\|[^|]*\|', ' ', s)
+    s = re.sub(r'"[^"]*"', ' ', s)
+    return _EDGE_TEXT_RE.sub(r' \1 ', s)
+
+
+def _parse(content: str) -> Optional[_ParsedDiagram]:
+    """Parse a flowchart into blocks, node definitions and edges."""
+    lines = content.split('\n')
+    header = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('%%'):
+            continue
+        if _DIRECTIVE_RE.match(stripped):
+            header = i
+        break
+    if header is None:
+        return None
+
+    root = _Block(key=None, title='', start=header, end=len(lines))
+    blocks: dict[Optional[str], _Block] = {None: root}
+    line_block: dict[int, Optional[str]] = {}
+    labels: dict[str, str] = {}
+    definitions: dict[str, int] = {}
+    first_seen: dict[str, int] = {}
+    edges: list[tuple[int, set[str]]] = []
+    references: list[tuple[int, set[str]]] = []
+    has_link_styles = False
+    stack: list[Optional[str]] = [None]
+
+    for i in range(header + 1, len(lines)):
+        stripped = lines[i].strip()
+        if not stripped or stripped.startswith('%%'):
+            continue
+
+        parent = stack[-1]
+        subgraph = _SUBGRAPH_RE.match(stripped)
+        if subgraph:
+            key, title = _subgraph_key(subgraph.group('rest'))
+            blocks[key] = _Block(
+                key=key, title=title, start=i, end=len(lines), parent=parent
+            )
+            blocks[parent].children.append(key)
+            line_block[i] = parent
+            stack.append(key)
+            continue
+        if stripped == 'end' and len(stack) > 1:
+            blocks[stack.pop()].end = i
+            line_block[i] = stack[-1]
+            continue
+
+        line_block[i] = parent
+        blocks[parent].lines.append(i)
+        keyword = stripped.split(None, 1)[0]
+
+        if keyword == 'linkStyle':
+            has_link_styles = True
+            continue
+        if keyword in ('style', 'click'):
+            ids = set(_IDENT_RE.findall(stripped)[1:2])
+            references.append((i, ids))
+            continue
+        if keyword == 'class':
+            parts = stripped.split()
+            ids = set(re.split(r'\s*,\s*', ' '.join(parts[1:-1])))
+            references.append((i, ids))
+            continue
+        if keyword in ('classDef', 'direction'):
+            continue
+
+        for match in _NODE_RE.finditer(stripped):
+            node_id = match.group('id')
+            if node_id in _KEYWORDS:
+                continue
+            labels.setdefault(node_id, _node_label(match))
+            definitions.setdefault(node_id, i)
+
+        bare = _strip_labels(stripped)
+        ids = {
+            ident
+            for ident in _IDENT_RE.findall(_ARROW_RE.sub(' ', bare))
+            if ident not in _KEYWORDS
+        }
+        for node_id in ids:
+            first_seen.setdefault(node_id, i)
+        if _ARROW_RE.search(bare):
+            edges.append((i, ids))
+
+    for node_id, line_idx in first_seen.items():
+        definitions.setdefault(node_id, line_idx)
+
+    return _ParsedDiagram(
+        lines=lines,
+        header=header,
+        blocks=blocks,
+        line_block=line_block,
+        labels=labels,
+        definitions=definitions,
+        edges=edges,
+        references=references,
+        has_link_styles=has_link_styles,
+    )
+
+
+def _normalize_label(label: str) -> str:
+    """Lower-case a label and drop icons, quotes and markup."""
+    label = _ICON_RE.sub(' ', label)
+    label = re.sub(r'<br\s*/?>', ' ', label, flags=re.IGNORECASE)
+    label = label.replace('"', ' ').replace('`', ' ')
+    return re.sub(r'\s+', ' ', label).strip().lower()
+
+
+def _mentions(instructions: str, tokens: set[str], ident: str, label: str) -> bool:
+    """Return whether an instruction refers to an element by ID or label."""
+    if len(ident) >= 2 and ident.lower() in tokens:
+        return True
+
+    label = _normalize_label(label)
+    candidates = [label] + [
+        part.strip() for part in _LABEL_SPLIT_RE.split(label) if part.strip()
+    ]
+    for candidate in candidates:
+        if len(candidate) < _MIN_LABEL_MATCH:
+            continue
+        if re.search(rf'(?<!\w){re.escape(candidate)}(?!\w)', instructions):
+            return True
+    return False
+
+
+def _block_lines(diagram: _ParsedDiagram, key: str) -> range:
+    """Return the full line range of a subgraph, header to `end`."""
+    block = diagram.blocks[key]
+    return range(block.start, block.end + 1)
+
+
+def _nodes_in_block(diagram: _ParsedDiagram, key: str) -> set[str]:
+    """Return the IDs of nodes defined anywhere inside a subgraph."""
+    span = _block_lines(diagram, key)
+    return {
+        node_id for node_id, line_idx in diagram.definitions.items() if line_idx in span
+    }
+
+
+def _render(
+    diagram: _ParsedDiagram,
+    key: Optional[str],
+    selected: set[int],
+    whole: set[str],
+    wrappers: set[Optional[str]],
+    out: list[str],
+) -> None:
+    """Append the selected lines of a block, in source order, to `out`."""
+    block = diagram.blocks[key]
+    items = [(i, None) for i in block.lines if i in selected]
+    items += [(diagram.blocks[child].start, child) for child in block.children]
+    for line_idx, child in sorted(items):
+        if child is None:
+            out.append(diagram.lines[line_idx])
+        elif child in whole:
+            out.extend(diagram.lines[i] for i in _block_lines(diagram, child))
+        elif child in wrappers:
+            out.append(diagram.lines[diagram.blocks[child].start])
+            _render(diagram, child, selected, whole, wrappers, out)
+            out.append(diagram.lines[diagram.blocks[child].end])
+
+
+def extract_edit_scope(
+    content: str, instructions: str, max_ratio: float = 0.5
+) -> Optional[MermaidScope]:
+    """Select the part of a flowchart that an edit instruction refers to.
+
+    Subgraphs and nodes are matched against the instruction by ID or label.
+    Matched subgraphs are included in full; matched nodes are included along
+    with their one-hop neighbours and every edge, style or class line that
+    touches them.
+
+    Args:
+        content: Full Mermaid diagram code
+        instructions: Editing instructions
+        max_ratio: Largest fraction of the diagram worth scoping; larger
+            slices return None so the caller performs a full edit
+
+    Returns:
+        MermaidScope for the selected slice, or None if the diagram is not a
+        flowchart, nothing is referenced, or the slice is too large.
+    """
+    diagram = _parse(content)
+    if diagram is None or diagram.has_link_styles:
+        # linkStyle addresses edges by position, which a merge would reorder
+        return None
+
+    text = instructions.lower()
+    tokens = set(re.findall(r'\w+', text))
+
+    matched_blocks = {
+        key
+        for key, block in diagram.blocks.items()
+        if key is not None and _mentions(text, tokens, key, block.title)
+    }
+    # Nested matches are covered by their outermost matched ancestor
+    whole = set()
+    for key in matched_blocks:
+        parent = diagram.blocks[key].parent
+        while parent is not None and parent not in matched_blocks:
+            parent = diagram.blocks[parent].parent
+        if parent is None:
+            whole.add(key)
+
+    focus = {
+        node_id
+        for node_id in diagram.definitions
+        if _mentions(text, tokens, node_id, diagram.labels.get(node_id, ''))
+    }
+    for key in whole:
+        focus |= _nodes_in_block(diagram, key)
+    if not focus:
+        return None
+
+    selected: set[int] = set()
+    for key in whole:
+        selected.update(_block_lines(diagram, key))
+
+    nodes = set(focus)
+    for line_idx, ids in diagram.edges:
+        if ids & focus:
+            selected.add(line_idx)
+            nodes |= ids
+    for line_idx, ids in diagram.references:
+        if ids & nodes:
+            selected.add(line_idx)
+    for node_id in nodes:
+        selected.add(diagram.definitions[node_id])
+
+    statements = len(diagram.line_block)
+    if not statements or len(selected) > max_ratio * statements:
+        return None
+
+    # Subgraphs enclosing the slice are kept as wrappers; whole subgraphs are
+    # emitted verbatim instead
+    inside_whole: set[int] = set()
+    for key in whole:
+        inside_whole.update(_block_lines(diagram, key))
+    starts = [diagram.line_block[i] for i in selected - inside_whole]
+    starts += [diagram.blocks[key].parent for key in whole]
+    wrappers: set[Optional[str]] = {None}
+    for key in starts:
+        while key is not None and key not in wrappers:
+            wrappers.add(key)
+            key = diagram.blocks[key].parent
+
+    out = [diagram.lines[diagram.header]]
+    _render(diagram, None, selected, whole, wrappers, out)
+
+    return MermaidScope(
+        excerpt='\n'.join(out),
+        node_ids=sorted(nodes),
+        subgraphs=sorted(whole),
+        _diagram=diagram,
+        _selected=selected,
+        _whole=whole,
+        _wrappers=wrappers,
+    )
+
+
+def _indent(lines: list[str], depth: int) -> list[str]:
+    """Re-indent lines at a block depth, following nested subgraphs."""
+    result = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped == 'end':
+            depth -= 1
+        result.append('    ' * (depth + 1) + stripped)
+        if _SUBGRAPH_RE.match(stripped):
+            depth += 1
+    return result
+
+
+def _depth(diagram: _ParsedDiagram, key: Optional[str]) -> int:
+    """Return the nesting depth of a block (root is 0)."""
+    depth = 0
+    while key is not None:
+        depth += 1
+        key = diagram.blocks[key].parent
+    return depth
+
+
+def merge_scoped_edit(scope: MermaidScope, edited: str) -> str:
+    """Merge an edited excerpt back into the diagram it was cut from.
+
+    Every line in the original slice is replaced by the corresponding block
+    of the edited excerpt. Content of each subgraph wrapper is written back
+    into the same subgraph, at the position of its first selected line;
+    subgraphs that were included in full or created by the edit are written
+    back as a unit.
+
+    Args:
+        scope: Scope returned by `extract_edit_scope`
+        edited: Edited excerpt returned by the model
+
+    Returns:
+        str: The full diagram with the edit applied.
+
+    Raises:
+        ValueError: If the edited excerpt is not a flowchart.
+    """
+    original = scope._diagram
+    result = _parse(edited)
+    if result is None:
+        # Tolerate excerpts returned without their directive line
+        result = _parse(f'{original.lines[original.header]}\n{edited}')
+    if result is None:
+        raise ValueError('Edited excerpt is not a Mermaid flowchart')
+
+    def anchor(key: Optional[str]) -> int:
+        block = original.blocks[key]
+        positions = [i for i in block.lines if i in scope._selected]
+        positions += [
+            original.blocks[child].start
+            for child in block.children
+            if child in scope._whole
+        ]
+        if positions:
+            return min(positions)
+        return block.end if key is not None else len(original.lines)
+
+    inserts: dict[int, list[str]] = {}
+
+    def collect(key: Optional[str], target: Optional[str]) -> None:
+        block = result.blocks[key]
+        depth = _depth(original, target)
+        pending = inserts.setdefault(anchor(target), [])
+        items = [(i, None) for i in block.lines]
+        items += [(result.blocks[child].start, child) for child in block.children]
+        for line_idx, child in sorted(items):
+            if child is None:
+                pending.extend(_indent([result.lines[line_idx]], depth))
+            elif child in scope._wrappers:
+                collect(child, child)
+            else:
+                span = range(result.blocks[child].start, result.blocks[child].end + 1)
+                pending.extend(_indent([result.lines[i] for i in span], depth))
+
+    collect(None, None)
+
+    merged = []
+    for i, line in enumerate(original.lines):
+        merged.extend(inserts.get(i, []))
+        if i not in scope._selected:
+            merged.append(line)
+    merged.extend(inserts.get(len(original.lines), []))
+    return '\n'.join(merged)
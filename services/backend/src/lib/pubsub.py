@@ -0,0 +1,147 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Publish/subscribe transports with in-process and Redis backends."""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+from loguru import logger as _logger
+
+from src.lib.serialization import dumps, loads
+
+MessageHandler = Callable[[dict[str, Any]], None]
+
+
+class PubSubBackend(ABC):
+    """Abstract base class for pub/sub transports.
+
+    Every message published by any process is passed to the handler of every
+    started transport, including the publisher's own.
+    """
+
+    @abstractmethod
+    async def start(self, handler: MessageHandler) -> None:
+        """Begin delivering published messages to `handler`."""
+        pass
+
+    @abstractmethod
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Publish a JSON-serializable message."""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop delivering messages and release connections."""
+        pass
+
+
+class InProcessPubSub(PubSubBackend):
+    """Transport that delivers messages synchronously within this process."""
+
+    def __init__(self):
+        self._handler: MessageHandler | None = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        """Register the handler."""
+        self._handler = handler
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Deliver a message to the local handler."""
+        if self._handler is not None:
+            self._handler(message)
+
+    async def close(self) -> None:
+        """Unregister the handler."""
+        self._handler = None
+
+
+class RedisPubSub(PubSubBackend):
+    """Transport that fans messages out to every worker through Redis Pub/Sub.
+
+    Delivery is at-most-once: messages published while a worker is not
+    subscribed are not seen by it.
+    """
+
+    def __init__(self, url: str = '', channel: str = 'sse:events', client=None):
+        """Initialize the Redis transport.
+
+        Args:
+            url: Redis connection URL, e.g. redis://localhost:6379/0
+            channel: Pub/Sub channel shared by all workers
+            client: Existing `redis.asyncio` client to use instead of `url`
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    'The redis package is required for shared pub/sub; '
+                    'install it with `uv sync --extra redis`'
+                ) from e
+            client = redis.from_url(url)
+
+        self.client = client
+        self.channel = channel
+        self._pubsub = None
+        self._listener: asyncio.Task | None = None
+        _logger.info(f'Initialized Redis pub/sub on channel {channel}')
+
+    async def start(self, handler: MessageHandler) -> None:
+        """Subscribe to the channel and start the listener task."""
+        if self._listener is not None and not self._listener.done():
+            return
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(handler))
+
+    async def _listen(self, handler: MessageHandler):
+        """Pass every message on the channel to the handler."""
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _logger.warning(f'Redis pub/sub receive failed: {e}')
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None or message.get('type') != 'message':
+                continue
+            try:
+                handler(loads(message['data']))
+            except Exception as e:
+                _logger.error(f'Failed to handle pub/sub message: {e}')
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Publish a message to every subscribed worker."""
+        await self.client.publish(self.channel, dumps(message))
+
+    async def close(self) -> None:
+        """Stop the listener and unsubscribe."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
@@ -0,0 +1,160 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token buckets with in-memory and Redis backends.
+
+A bucket holds up to `burst` tokens and refills at `rate` tokens per
+second. Taking `cost` tokens from several buckets succeeds if every one
+of them holds that many; otherwise nothing is taken from any of them and
+the caller learns how long to wait.
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from loguru import logger as _logger
+
+
+class RateLimitBackend(ABC):
+    """Abstract base class for token bucket storage."""
+
+    @abstractmethod
+    async def consume(
+        self, keys: list[str], cost: float, rate: float, burst: float
+    ) -> float:
+        """Take tokens from every one of several buckets, or from none.
+
+        Args:
+            keys: Bucket keys
+            cost: Tokens to take from each bucket
+            rate: Tokens added per second
+            burst: Bucket capacity
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until every
+            bucket holds enough of them
+        """
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local buckets, least recently used evicted first.
+
+    An evicted bucket starts over full, so `max_keys` should comfortably
+    exceed the number of clients active within one refill period.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        """Initialize the in-memory buckets.
+
+        Args:
+            max_keys: Maximum number of buckets before LRU eviction
+        """
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(
+        self, keys: list[str], cost: float, rate: float, burst: float
+    ) -> float:
+        """Take tokens from the buckets, refilling them first."""
+        now = time.monotonic()
+        refilled = {}
+        for key in keys:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            refilled[key] = min(burst, tokens + (now - updated) * rate)
+        wait = max(
+            (max(0.0, (cost - tokens) / rate) for tokens in refilled.values()),
+            default=0.0,
+        )
+        for key, tokens in refilled.items():
+            self._buckets[key] = (tokens if wait else tokens - cost, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+# Refill every bucket, then take from all or none in one round trip; Redis'
+# clock is shared by all workers. The wait is returned as a string because
+# Lua numbers become integers.
+_CONSUME_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local refilled = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+  local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+  local tokens = tonumber(bucket[1]) or burst
+  local updated = tonumber(bucket[2]) or now
+  tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+  refilled[i] = tokens
+  if tokens < cost then
+    wait = math.max(wait, (cost - tokens) / rate)
+  end
+end
+for i, key in ipairs(KEYS) do
+  local tokens = refilled[i]
+  if wait == 0 then
+    tokens = tokens - cost
+  end
+  redis.call('HSET', key, 'tokens', tostring(tokens), 'updated', tostring(now))
+  redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+end
+return tostring(wait)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Redis-backed buckets shared by every worker.
+
+    Buckets expire once they would have refilled completely.
+    """
+
+    def __init__(self, url: str = '', prefix: str = 'ratelimit', client=None):
+        """Initialize the Redis buckets.
+
+        Args:
+            url: Redis connection URL, e.g. redis://localhost:6379/0
+            prefix: Key prefix used to namespace buckets
+            client: Existing `redis.asyncio` client to use instead of `url`
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    'The redis package is required for shared rate limits; '
+                    'install it with `uv sync --extra redis`'
+                ) from e
+            client = redis.from_url(url, decode_responses=True)
+
+        self.prefix = prefix
+        self.client = client
+        self._consume = self.client.register_script(_CONSUME_SCRIPT)
+        _logger.info(f'Initialized Redis rate limits with prefix {prefix}')
+
+    async def consume(
+        self, keys: list[str], cost: float, rate: float, burst: float
+    ) -> float:
+        """Take tokens from the buckets atomically."""
+        wait = await self._consume(
+            keys=[f'{self.prefix}:{key}' for key in keys], args=[rate, burst, cost]
+        )
+        return float(wait)
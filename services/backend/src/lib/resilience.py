@@ -0,0 +1,279 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retries with jittered backoff and hedged requests for Gemini calls.
+
+A call is retried when it fails with 429, a 5xx status, a timeout or a
+dropped connection, never for other 4xx errors. Retries wait a random
+delay of up to `base_delay * 2**retry` (full jitter) and stop when the
+attempts or the call's deadline run out.
+
+With hedging enabled, an attempt still running after the recent p95
+latency of its operation is raced against a second, identical request;
+the first to succeed wins and the other is cancelled. Latency of calls
+that needed a hedge is reported separately, so hedging cannot hide a
+growing tail. A hedge is only sent if `hedge_permit` grants it capacity of
+its own, so hedging cannot push past the admission limits either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+from loguru import logger as _logger
+
+from src.lib.config import settings
+from src.lib.latency import DEFAULT_BUCKETS, RollingHistogram
+
+T = TypeVar('T')
+
+# Finer than the tool buckets at the low end, where most model calls finish
+LATENCY_BUCKETS = (0.1, 0.25) + DEFAULT_BUCKETS
+
+# Takes capacity for a hedge and returns the function giving it back, or
+# returns None if there is none to spare and the hedge is not sent
+HedgePermit = Callable[[], Callable[[], None] | None]
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return whether a failed Gemini call is worth retrying."""
+    if isinstance(exc, TimeoutError):
+        return True
+    try:
+        from google.genai import errors
+    except ImportError:
+        errors = None
+    if errors is not None and isinstance(exc, errors.APIError):
+        return exc.code == 429 or exc.code >= 500
+
+    import httpx
+
+    return isinstance(
+        exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+    )
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long a call is retried."""
+
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    deadline: float
+
+    def backoff(self, retry: int) -> float:
+        """Return the full-jitter delay before a retry, counting from 0."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class _OperationStats:
+    """Latency histograms and counters of one operation."""
+
+    def __init__(self, window: int):
+        # Single requests, the basis of the hedge delay
+        self.attempts = RollingHistogram(window, LATENCY_BUCKETS)
+        # Whole calls, split by whether a hedge was sent
+        self.plain = RollingHistogram(window, LATENCY_BUCKETS)
+        self.hedged = RollingHistogram(window, LATENCY_BUCKETS)
+        self.counts: Counter[str] = Counter()
+
+
+def _summary(histogram: RollingHistogram) -> dict[str, float | int | None]:
+    return {
+        'samples': len(histogram),
+        'p50': histogram.percentile(0.5),
+        'p95': histogram.percentile(0.95),
+        'p99': histogram.percentile(0.99),
+    }
+
+
+class ResilientCaller:
+    """Runs idempotent calls with retries, a deadline and optional hedging."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        hedging: bool | None = None,
+        hedge_quantile: float | None = None,
+        hedge_min_samples: int | None = None,
+        window: int | None = None,
+        hedge_permit: HedgePermit | None = None,
+    ):
+        """Initialize the caller.
+
+        Args:
+            policy: Retry limits shared by every call
+            hedging: Whether slow attempts are hedged
+            hedge_quantile: Latency quantile after which an attempt is hedged
+            hedge_min_samples: Attempts measured before hedging starts
+            window: Latency samples kept per operation
+            hedge_permit: Grants capacity to each hedge; hedges are sent
+              unconditionally without one
+        """
+        self.policy = policy or RetryPolicy(
+            max_attempts=settings.GEMINI_RETRY_MAX_ATTEMPTS,
+            base_delay=settings.GEMINI_RETRY_BASE_DELAY_SECONDS,
+            max_delay=settings.GEMINI_RETRY_MAX_DELAY_SECONDS,
+            deadline=settings.GEMINI_DEADLINE_SECONDS,
+        )
+        self.hedging = settings.GEMINI_HEDGING_ENABLED if hedging is None else hedging
+        self.hedge_quantile = hedge_quantile or settings.GEMINI_HEDGE_QUANTILE
+        self.hedge_min_samples = (
+            hedge_min_samples
+            if hedge_min_samples is not None
+            else settings.GEMINI_HEDGE_MIN_SAMPLES
+        )
+        self.window = window or settings.GEMINI_LATENCY_WINDOW
+        self.hedge_permit = hedge_permit
+        self._stats: dict[str, _OperationStats] = {}
+
+    def _operation(self, operation: str) -> _OperationStats:
+        if operation not in self._stats:
+            self._stats[operation] = _OperationStats(self.window)
+        return self._stats[operation]
+
+    def hedge_delay(self, operation: str) -> float | None:
+        """Return how long an attempt may run before it is hedged.
+
+        Returns:
+            Seconds, or None if hedging is off or too few attempts of the
+            operation were measured
+        """
+        stats = self._stats.get(operation)
+        if not self.hedging or stats is None:
+            return None
+        if len(stats.attempts) < self.hedge_min_samples:
+            return None
+        return stats.attempts.percentile(self.hedge_quantile)
+
+    async def _timed(
+        self, stats: _OperationStats, factory: Callable[[], Awaitable[T]]
+    ) -> T:
+        started = time.monotonic()
+        result = await factory()
+        stats.attempts.record(time.monotonic() - started)
+        return result
+
+    async def _attempt(
+        self,
+        operation: str,
+        stats: _OperationStats,
+        factory: Callable[[], Awaitable[T]],
+        hedged: list[bool],
+    ) -> T:
+        """Run one attempt, hedging it once if it is slow."""
+        delay = self.hedge_delay(operation)
+        if delay is None:
+            return await self._timed(stats, factory)
+
+        primary = asyncio.ensure_future(self._timed(stats, factory))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            release = self.hedge_permit() if self.hedge_permit else lambda: None
+            if release is None:
+                stats.counts['hedges_skipped'] += 1
+                return await primary
+
+            hedged[0] = True
+            stats.counts['hedges'] += 1
+            hedge = asyncio.ensure_future(self._timed(stats, factory))
+            hedge.add_done_callback(lambda _: release())
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.counts['hedge_wins'] += 1
+                        return task.result()
+            # Both failed; report the original request's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(self, operation: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run a call until it succeeds, fails for good or runs out of time.
+
+        Args:
+            operation: Name latency is tracked under, e.g. `edit@gemini-2.5-flash`
+            factory: Returns a new awaitable for every request; called once
+              per attempt and hedge, so it must be safe to repeat
+
+        Returns:
+            The result of the first successful request
+
+        Raises:
+            Exception: The last error if it is not retryable or no attempts
+              or time are left; TimeoutError if the deadline passed mid-call
+        """
+        stats = self._operation(operation)
+        stats.counts['calls'] += 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.policy.deadline
+        hedged = [False]
+        retry = 0
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    result = await self._attempt(operation, stats, factory, hedged)
+                break
+            except Exception as e:
+                retry += 1
+                delay = self.policy.backoff(retry - 1)
+                if (
+                    not is_retryable(e)
+                    or retry >= self.policy.max_attempts
+                    or loop.time() + delay >= deadline
+                ):
+                    stats.counts['failures'] += 1
+                    raise
+                stats.counts['retries'] += 1
+                _logger.warning(
+                    f'Retrying {operation} in {delay:.2f}s after attempt '
+                    f'{retry} failed: {e}'
+                )
+                await asyncio.sleep(delay)
+
+        histogram = stats.hedged if hedged[0] else stats.plain
+        histogram.record(loop.time() - started)
+        return result
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return counters and latency quantiles per operation."""
+        return {
+            operation: {
+                **stats.counts,
+                'hedge_delay': self.hedge_delay(operation),
+                'plain': _summary(stats.plain),
+                'hedged': _summary(stats.hedged),
+            }
+            for operation, stats in self._stats.items()
+        }
+
+
+gemini_caller = ResilientCaller()
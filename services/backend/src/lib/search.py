@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory inverted index with BM25 ranking."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Incrementally built inverted index ranking documents with BM25.
+
+    A query matches documents containing any of its terms; documents with
+    more (and rarer) matching terms rank higher.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document; documents already indexed are left unchanged."""
+        if doc_id in self._lengths:
+            return
+        tokens = tokenize(text)
+        for token, count in Counter(tokens).items():
+            self._postings.setdefault(token, {})[doc_id] = count
+        self._lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def search(
+        self, query: str, limit: int = 20, offset: int = 0
+    ) -> list[tuple[str, float]]:
+        """Return the best matching documents, highest score first.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of results
+            offset: Number of best results to skip
+
+        Returns:
+            (document ID, score) pairs
+        """
+        if not self._lengths:
+            return []
+        average_length = self._total_length / len(self._lengths) or 1
+        scores: dict[str, float] = {}
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (len(self._lengths) - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for doc_id, count in postings.items():
+                norm = 1 - self.b + self.b * self._lengths[doc_id] / average_length
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (
+                    self.k1 + 1
+                ) / (count + self.k1 * norm)
+
+        best = heapq.nsmallest(
+            offset + limit, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+        return best[offset:]
@@ -0,0 +1,71 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fast JSON serialization for responses and events.
+
+Uses orjson when the optional `orjson` extra is installed and pydantic's
+Rust serializer otherwise; both are far cheaper than FastAPI's
+`jsonable_encoder` followed by `json.dumps`. Output is compact UTF-8 JSON.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pydantic_core
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert values orjson does not know, such as pydantic models."""
+    return pydantic_core.to_jsonable_python(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return pydantic_core.to_json(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize an object to a JSON string."""
+    return dumps(obj).decode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the fast serializer.
+
+    Return it from a route, with a dict or a pydantic model as content, to
+    skip FastAPI's response validation and `jsonable_encoder`. Routes may keep
+    their `response_model` for the OpenAPI schema; FastAPI sends a returned
+    response as is. Headers set on an injected `Response`, such as cookies,
+    are not merged into it and must be copied over.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
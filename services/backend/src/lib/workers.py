@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""CPU budget detection for sizing the server worker pool.
+
+`os.cpu_count()` reports the host's CPUs, not the share a container may
+use, so the worker count is derived from the cgroup CPU quota instead.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+
+def cgroup_cpu_limit(root: Path = CGROUP_ROOT) -> float | None:
+    """Return the CPU quota of the current cgroup in CPUs.
+
+    Reads `cpu.max` (cgroup v2) or `cpu.cfs_quota_us` and
+    `cpu.cfs_period_us` (cgroup v1).
+
+    Args:
+        root: Mount point of the cgroup file system
+
+    Returns:
+        The quota, or None when the cgroup has no CPU limit
+    """
+    cpu_max = root / 'cpu.max'
+    if cpu_max.is_file():
+        try:
+            quota, period = cpu_max.read_text().split()[:2]
+            if quota == 'max':
+                return None
+            return int(quota) / int(period)
+        except ValueError:
+            return None
+
+    try:
+        quota = int((root / 'cpu' / 'cpu.cfs_quota_us').read_text())
+        period = int((root / 'cpu' / 'cpu.cfs_period_us').read_text())
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+def available_cpus(root: Path = CGROUP_ROOT) -> int:
+    """Return the number of CPUs this process can keep busy.
+
+    The CPUs the process may be scheduled on, capped by the cgroup quota
+    rounded up.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit(root)
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def worker_count(
+    configured: int = 0, shared_state: bool = True, root: Path = CGROUP_ROOT
+) -> int:
+    """Return the number of server workers to run.
+
+    Args:
+        configured: Explicit worker count; 0 derives it from the CPU budget
+        shared_state: Whether sessions and SSE events are shared across
+            workers; without it a derived count is a single worker
+        root: Mount point of the cgroup file system
+
+    Returns:
+        The worker count
+    """
+    if configured > 0:
+        return configured
+    if not shared_state:
+        return 1
+    return available_cpus(root)
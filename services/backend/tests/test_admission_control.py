@@ -0,0 +1,224 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test admission control for the Gemini-backed endpoints."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.main import app
+from src.app.services import mermaid_edit_service
+from src.app.services.admission_control import AdmissionController, AdmissionRejected
+from src.app.services.mermaid_edit_service import MermaidEditService
+from src.app.utils.dependencies import get_mermaid_edit_service
+from src.lib.cache import InMemoryCacheBackend, ResultCache
+
+LIMITS = {'chat': 4, 'edit': 4, 'batch': 4}
+
+
+def make_controller(**kwargs) -> AdmissionController:
+    options = {
+        'max_concurrency': 1,
+        'route_limits': LIMITS,
+        'max_queue': 10,
+        'max_queued_per_session': 10,
+        'queue_timeout': 5,
+        'enabled': True,
+    }
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+class StubGemini:
+    """Gemini service stub answering every prompt with the same diagram."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, **kwargs):
+        self.calls += 1
+        part = SimpleNamespace(text='graph TD\n A --> C')
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))]
+        )
+
+
+def make_service(cache: ResultCache | None = None) -> MermaidEditService:
+    service = MermaidEditService.__new__(MermaidEditService)
+    service.gemini_service = StubGemini()
+    service.cache = cache
+    return service
+
+
+async def run_in_order(controller, requests):
+    """Queue requests behind a held slot and return their admission order."""
+    order = []
+
+    async def request(route, session_id):
+        async with controller.slot(route, session_id):
+            order.append((route, session_id))
+            await asyncio.sleep(0)
+
+    await controller.acquire('chat', 'holder')
+    tasks = []
+    for route, session_id in requests:
+        tasks.append(asyncio.create_task(request(route, session_id)))
+        await asyncio.sleep(0)
+    controller.release('chat', 'holder', 0.1)
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_waiting_requests_are_admitted_by_priority():
+    """Test that chat goes before edits and edits before batch jobs."""
+    order = await run_in_order(
+        make_controller(), [('batch', 'a'), ('edit', 'b'), ('chat', 'c')]
+    )
+    assert [route for route, _ in order] == ['chat', 'edit', 'batch']
+
+
+async def test_sessions_with_fewer_requests_in_flight_go_first():
+    """Test that a session holding slots does not starve other sessions."""
+    controller = make_controller(max_concurrency=2)
+    await controller.acquire('batch', 'busy')
+    order = await run_in_order(controller, [('batch', 'busy'), ('batch', 'quiet')])
+    assert order[0] == ('batch', 'quiet')
+
+
+async def test_full_queue_is_rejected_with_retry_after():
+    """Test that requests beyond the queue bound are rejected at once."""
+    controller = make_controller(max_queue=1)
+    await controller.acquire('chat', 'a')
+    waiting = asyncio.create_task(controller.acquire('chat', 'b'))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire('chat', 'c')
+    assert rejected.value.retry_after >= 1
+
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    assert controller.queued == 0
+
+
+async def test_session_cannot_fill_the_queue():
+    """Test that one session's waiting requests are capped."""
+    controller = make_controller(max_queued_per_session=1)
+    await controller.acquire('edit', 'a')
+    waiting = asyncio.create_task(controller.acquire('edit', 'greedy'))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected):
+        await controller.acquire('edit', 'greedy')
+    other = asyncio.create_task(controller.acquire('edit', 'other'))
+    await asyncio.sleep(0)
+    assert controller.queued == 2
+
+    for task in (waiting, other):
+        task.cancel()
+    await asyncio.gather(waiting, other, return_exceptions=True)
+
+
+async def test_queue_timeout_rejects_and_removes_waiter():
+    """Test that a request waiting too long is rejected and dequeued."""
+    controller = make_controller(queue_timeout=0.01)
+    await controller.acquire('chat', 'a')
+    with pytest.raises(AdmissionRejected):
+        await controller.acquire('chat', 'b')
+    assert controller.queued == 0
+
+    controller.release('chat', 'a', 0.1)
+    assert controller.active == 0
+
+
+async def test_route_limit_leaves_slots_for_other_routes():
+    """Test that a route at its limit does not block other routes."""
+    controller = make_controller(
+        max_concurrency=3, route_limits={'chat': 2, 'edit': 2, 'batch': 1}
+    )
+    await controller.acquire('batch', 'a')
+    blocked = asyncio.create_task(controller.acquire('batch', 'b'))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(controller.acquire('chat', 'c'), 1)
+    assert not blocked.done()
+
+    controller.release('batch', 'a', 0.1)
+    await asyncio.wait_for(blocked, 1)
+    assert controller.active == 2
+
+
+async def test_hedge_takes_a_free_slot_of_its_route():
+    """Test that hedges count against the limits and never wait for a slot."""
+    controller = make_controller(
+        max_concurrency=3, route_limits={'chat': 2, 'edit': 2, 'batch': 1}
+    )
+    assert controller.hedge_slot() is not None  # Not sent from a slot
+
+    async with controller.slot('edit', 'a'):
+        release = controller.hedge_slot()
+        assert release is not None
+        assert controller.active == 2
+        # The edit route is at its limit
+        assert controller.hedge_slot() is None
+        release()
+        assert controller.active == 1
+
+    async with controller.slot('batch', 'a'):
+        assert controller.hedge_slot() is None
+
+
+async def test_cache_hits_skip_admission(monkeypatch):
+    """Test that only edits calling Gemini wait for a slot."""
+    service = make_service(ResultCache(InMemoryCacheBackend(), ttl=60, name='t'))
+    monkeypatch.setattr(mermaid_edit_service, 'admission_controller', make_controller())
+    edited = await service.edit_mermaid_diagram('graph TD\n A --> B', 'rename B')
+
+    closed = make_controller(
+        route_limits={'chat': 1, 'edit': 0, 'batch': 0}, max_queue=0
+    )
+    monkeypatch.setattr(mermaid_edit_service, 'admission_controller', closed)
+    assert (
+        await service.edit_mermaid_diagram('graph TD\n A --> B', 'rename B') == edited
+    )
+    with pytest.raises(AdmissionRejected):
+        await service.edit_mermaid_diagram('graph TD\n A --> B', 'rename A')
+    assert service.gemini_service.calls == 1
+
+
+def test_rejected_edit_answers_429(client, monkeypatch):
+    """Test that a rejected request gets 429 with a Retry-After header."""
+    controller = make_controller(
+        route_limits={'chat': 1, 'edit': 0, 'batch': 1}, max_queue=0
+    )
+    monkeypatch.setattr(mermaid_edit_service, 'admission_controller', controller)
+
+    app.dependency_overrides[get_mermaid_edit_service] = lambda: make_service()
+    try:
+        response = client.post(
+            '/api/v1/mermaid/edit',
+            json={'content': 'graph TD\n A --> B', 'instructions': 'rename A'},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 429
+    assert int(response.headers['retry-after']) >= 1
+    assert 'detail' in response.json()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
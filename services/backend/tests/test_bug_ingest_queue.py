@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the write-behind bug report queue."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.app.services.bug_ingest_queue import BugIngestQueue
+
+
+class RecordingStorage:
+    """Storage stub recording the batches it is asked to save."""
+
+    def __init__(self, failures: int = 0):
+        self.batches: list[list[str]] = []
+        self.failures = failures
+
+    async def save_bugs(self, bug_list):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('storage unavailable')
+        self.batches.append([bug['bug_id'] for bug in bug_list])
+
+
+async def test_reports_are_saved_in_batches():
+    """Test that a burst is saved in full batches and the rest on the timer."""
+    storage = RecordingStorage()
+    queue = BugIngestQueue(storage, max_batch=4, flush_interval=0.05)
+
+    for i in range(10):
+        await queue.submit({'bug_id': f'bug-{i}'})
+    # Queued reports are readable before they are saved
+    assert queue.get_pending('bug-9') == {'bug_id': 'bug-9'}
+
+    await asyncio.sleep(0.2)
+    assert [len(batch) for batch in storage.batches] == [4, 4, 2]
+    assert queue.pending_count == 0
+    await queue.drain()
+
+
+async def test_drain_saves_queued_reports_after_retries():
+    """Test that shutdown waits for queued reports despite transient errors."""
+    storage = RecordingStorage(failures=1)
+    queue = BugIngestQueue(storage, max_batch=50, flush_interval=0.05)
+    queue.RETRY_DELAY_SECONDS = 0.01
+
+    for i in range(3):
+        await queue.submit({'bug_id': f'bug-{i}'})
+    await queue.drain()
+
+    assert storage.batches == [['bug-0', 'bug-1', 'bug-2']]
+    assert queue.get_pending('bug-0') is None
+
+
+async def test_failed_batch_is_saved_with_the_next_flush():
+    """Test that a batch failing every attempt is kept, not dropped."""
+    storage = RecordingStorage(failures=BugIngestQueue.SAVE_ATTEMPTS)
+    queue = BugIngestQueue(storage, max_batch=50, flush_interval=0.05)
+    queue.RETRY_DELAY_SECONDS = 0.01
+
+    await queue.submit({'bug_id': 'bug-0'})
+    await asyncio.sleep(0.3)
+
+    assert storage.batches == [['bug-0']]
+    assert queue.pending_count == 0
+    await queue.drain()
+
+
+async def test_reports_that_cannot_be_saved_go_to_the_fallback_file(tmp_path):
+    """Test that draining during an outage writes reports to disk."""
+    storage = RecordingStorage(failures=100)
+    fallback_file = tmp_path / 'unsaved.jsonl'
+    queue = BugIngestQueue(storage, flush_interval=0.01, fallback_file=fallback_file)
+    queue.RETRY_DELAY_SECONDS = 0.001
+
+    for i in range(3):
+        await queue.submit({'bug_id': f'bug-{i}'})
+    await queue.drain()
+
+    assert storage.batches == []
+    lines = fallback_file.read_text().splitlines()
+    assert [json.loads(line)['bug_id'] for line in lines] == [
+        'bug-0',
+        'bug-1',
+        'bug-2',
+    ]
+    assert queue.pending_count == 0
+
+
+def test_submit_acknowledges_before_saving(client, monkeypatch):
+    """Test that the report endpoint answers from the queue."""
+    from src.app.api.v1.routes import bugs
+
+    storage = RecordingStorage()
+    queue = BugIngestQueue(storage, flush_interval=60)
+    monkeypatch.setattr(bugs, 'get_bug_ingest_queue', lambda: queue)
+
+    response = client.post('/api/v1/bugs/report', json={'description': 'Broken'})
+    bug_id = response.json()['bug_id']
+    assert storage.batches == []
+
+    report = client.get(f'/api/v1/bugs/{bug_id}').json()['bug_report']
+    assert report['description'] == 'Broken'
+
+    client.portal.call(queue.drain)
+    assert storage.batches == [[bug_id]]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
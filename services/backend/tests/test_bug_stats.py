@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test incrementally maintained bug statistics."""
+
+import pytest
+
+from src.app.api.v1.routes import bugs
+from src.app.services import bug_ingest_queue
+from src.app.services.bug_stats import BugStats, platform_from_user_agent
+from src.app.services.bug_storage_service import LocalBugStorage
+
+WINDOWS = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0'
+ANDROID = 'Mozilla/5.0 (Linux; Android 14; Pixel 8) Chrome/120.0 Mobile'
+
+
+class _DiscardingStorage:
+    """Storage stub accepting every report, or failing every save."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def save_bug(self, bug_data):
+        if self.fail:
+            raise OSError('storage unavailable')
+
+    async def save_bugs(self, bug_list):
+        for bug_data in bug_list:
+            await self.save_bug(bug_data)
+
+
+def test_platform_from_user_agent():
+    """Test that mobile agents are not mistaken for their desktop base."""
+    assert platform_from_user_agent(WINDOWS) == 'Windows'
+    assert platform_from_user_agent(ANDROID) == 'Android'
+    assert platform_from_user_agent('Mozilla/5.0 (iPhone; like Mac OS X)') == 'iOS'
+    assert platform_from_user_agent(None) == 'unknown'
+
+
+async def test_counters_rebuild_and_update(tmp_path):
+    """Test that stored reports are counted once."""
+    storage = LocalBugStorage(bugs_dir=str(tmp_path))
+    stored = [
+        {
+            'bug_id': f'bug-{i}',
+            'timestamp': f'2025-03-0{i % 2 + 1}T10:00:00',
+            'status': 'new',
+            'user_agent': WINDOWS if i else ANDROID,
+        }
+        for i in range(4)
+    ]
+    await storage.save_bugs(stored)
+
+    stats = BugStats()
+    # Saved before the rebuild finished; must not be counted twice
+    stats.add(stored[0])
+    await stats.rebuild(storage)
+
+    assert stats.snapshot() == {
+        'ready': True,
+        'total': 4,
+        'by_status': {'new': 4},
+        'by_day': {'2025-03-01': 2, '2025-03-02': 2},
+        'by_platform': {'Android': 1, 'Windows': 3},
+    }
+
+
+def test_submit_updates_stats_endpoint(client, monkeypatch):
+    """Test that a submitted report is counted by the stats endpoint."""
+    stats = BugStats()
+    monkeypatch.setattr(bugs, 'bug_stats', stats)
+    monkeypatch.setattr(bugs.settings, 'BUG_QUEUE_ENABLED', False)
+    monkeypatch.setattr(bugs, 'get_bug_storage_instance', lambda: _DiscardingStorage())
+
+    client.post(
+        '/api/v1/bugs/report', json={'description': 'Broken', 'userAgent': WINDOWS}
+    )
+    body = client.get('/api/v1/bugs/stats').json()
+    assert body['total'] == 1
+    assert body['by_status'] == {'new': 1}
+    assert body['by_platform'] == {'Windows': 1}
+
+
+def test_failed_save_is_not_counted(client, monkeypatch):
+    """Test that a report is counted only once storage has it."""
+    stats = BugStats()
+    monkeypatch.setattr(bugs, 'bug_stats', stats)
+    monkeypatch.setattr(bugs.settings, 'BUG_QUEUE_ENABLED', False)
+    monkeypatch.setattr(
+        bugs, 'get_bug_storage_instance', lambda: _DiscardingStorage(fail=True)
+    )
+
+    response = client.post('/api/v1/bugs/report', json={'description': 'Broken'})
+    assert response.status_code == 500
+    assert stats.total == 0
+
+
+async def test_queue_counts_reports_once_saved(monkeypatch):
+    """Test that queued reports are counted when their batch is saved."""
+    stats = BugStats()
+    monkeypatch.setattr(bug_ingest_queue, 'bug_stats', stats)
+    queue = bug_ingest_queue.BugIngestQueue(_DiscardingStorage(), flush_interval=0.01)
+
+    await queue.submit({'bug_id': 'bug-1', 'status': 'new'})
+    assert stats.total == 0
+    await queue.drain()
+    assert stats.snapshot()['by_status'] == {'new': 1}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
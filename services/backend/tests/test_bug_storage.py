@@ -0,0 +1,460 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test bug report storage backends."""
+
+import asyncio
+import itertools
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from src.app.api.v1.routes import bugs
+from src.app.services.bug_storage_service import (
+    LocalBugStorage,
+    SegmentedGCSBugStorage,
+)
+from src.lib.config import settings
+
+
+class FakeBlob:
+    """Subset of the GCS blob API backed by a FakeBucket."""
+
+    def __init__(self, bucket, name, generation=None, time_created=None):
+        self.bucket = bucket
+        self.name = name
+        self.generation = generation
+        self.time_created = time_created
+        self.content_type = None
+
+    def _check(self, if_generation_match):
+        current = self.bucket.objects.get(self.name)
+        generation = current[0] if current else 0
+        if if_generation_match is not None and generation != if_generation_match:
+            raise PreconditionFailed(self.name)
+
+    def _write(self, data: bytes):
+        generation = next(self.bucket.generations)
+        self.bucket.objects[self.name] = (generation, data)
+        self.generation = generation
+        self.time_created = datetime.now(timezone.utc)
+
+    def upload_from_string(
+        self, data, content_type=None, if_generation_match=None, timeout=None
+    ):
+        self._check(if_generation_match)
+        self._write(data.encode('utf-8') if isinstance(data, str) else data)
+
+    @property
+    def size(self):
+        return len(self.bucket.objects[self.name][1])
+
+    def download_as_bytes(self, start=None, end=None, timeout=None):
+        if self.name not in self.bucket.objects:
+            raise NotFound(self.name)
+        data = self.bucket.objects[self.name][1]
+        if start is not None:
+            self.bucket.range_reads += 1
+            return data[start : end + 1]
+        return data
+
+    def compose(
+        self,
+        sources,
+        if_generation_match=None,
+        if_source_generation_match=None,
+        timeout=None,
+    ):
+        self._check(if_generation_match)
+        for source, generation in zip(sources, if_source_generation_match):
+            FakeBlob(self.bucket, source.name)._check(generation)
+        self._write(b''.join(self.bucket.objects[s.name][1] for s in sources))
+
+    def delete(self, if_generation_match=None, timeout=None):
+        if self.name not in self.bucket.objects:
+            raise NotFound(self.name)
+        self._check(if_generation_match)
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    """In-memory bucket with object generations."""
+
+    def __init__(self):
+        self.objects: dict[str, tuple[int, bytes]] = {}
+        self.generations = itertools.count(1)
+        self.range_reads = 0
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def get_blob(self, name, timeout=None):
+        if name not in self.objects:
+            return None
+        return FakeBlob(self, name, self.objects[name][0], datetime.now(timezone.utc))
+
+
+class FakeClient:
+    """Storage client exposing a single fake bucket."""
+
+    def __init__(self):
+        self.fake_bucket = FakeBucket()
+
+    def bucket(self, name):
+        return self.fake_bucket
+
+    def list_blobs(self, bucket_name, prefix='', timeout=None):
+        return [
+            self.fake_bucket.get_blob(name)
+            for name in list(self.fake_bucket.objects)
+            if name.startswith(prefix)
+        ]
+
+
+@pytest.fixture
+def storage():
+    """Segmented GCS storage on a fake bucket with manual compaction."""
+    return SegmentedGCSBugStorage(
+        bugs_path='bugs', compact_every=10**6, max_segments=2, client=FakeClient()
+    )
+
+
+async def test_concurrent_saves_are_not_lost(storage):
+    """Test that saves write separate objects and never rewrite others."""
+    await asyncio.gather(*(storage.save_bug({'bug_id': f'bug-{i}'}) for i in range(40)))
+
+    bugs = await storage.list_bugs()
+    assert sorted(bug['bug_id'] for bug in bugs) == sorted(
+        f'bug-{i}' for i in range(40)
+    )
+    assert (await storage.get_bug('bug-7')) == {'bug_id': 'bug-7'}
+
+
+async def test_compaction_reduces_objects_read(storage):
+    """Test that compaction leaves a few segments holding every report."""
+    objects = storage.bucket.objects
+    objects['bugs/bug_reports.jsonl'] = (0, b'{"bug_id": "legacy"}\n')
+    for batch in range(3):
+        for i in range(40):
+            await storage.save_bug({'bug_id': f'bug-{batch}-{i}'})
+        assert await storage.compact() == 40
+
+    assert not any(name.startswith('bugs/reports/') for name in objects)
+    segments = [name for name in objects if name.startswith('bugs/segments/')]
+    assert len(segments) <= 3
+    assert 'bugs/compaction.lock' not in objects
+
+    bugs = await storage.list_bugs()
+    assert len(bugs) == 121
+    assert bugs[0]['bug_id'] == 'legacy'
+    # Index entries follow reports into merged segments
+    assert (await storage.get_bug('bug-0-5')) == {'bug_id': 'bug-0-5'}
+    assert (await storage.get_bug('legacy')) == {'bug_id': 'legacy'}
+    assert storage.bucket.range_reads == 2
+
+
+async def test_compaction_skips_while_locked(storage):
+    """Test that only one worker compacts at a time."""
+    await storage.save_bug({'bug_id': 'bug-1'})
+    storage.bucket.blob('bugs/compaction.lock').upload_from_string('busy')
+
+    assert await storage.compact() == 0
+    assert (await storage.get_bug('bug-1')) is not None
+
+
+async def test_gcs_index_serves_lookups_and_filters(storage, monkeypatch):
+    """Test that compacted reports are found through the index object."""
+    for i in range(10):
+        await storage.save_bug(
+            {'bug_id': f'bug-{i}', 'status': 'fixed' if i % 2 else 'new'}
+        )
+    await storage.compact()
+    await storage.save_bug({'bug_id': 'pending', 'status': 'new'})
+
+    def full_scan():
+        raise AssertionError('lookups must not read every segment')
+
+    monkeypatch.setattr(storage, '_read_bugs', full_scan)
+    assert (await storage.get_bug('bug-3'))['status'] == 'fixed'
+    assert storage.bucket.range_reads == 1
+    assert (await storage.get_bug('pending'))['status'] == 'new'
+    assert (await storage.get_bug('missing')) is None
+
+    new_bugs = await storage.list_bug_summaries(status='new')
+    assert sorted(bug['bug_id'] for bug in new_bugs) == [
+        'bug-0',
+        'bug-2',
+        'bug-4',
+        'bug-6',
+        'bug-8',
+        'pending',
+    ]
+
+
+async def test_local_index_serves_lookups_and_filters(tmp_path):
+    """Test that the SQLite sidecar finds reports without scanning the file."""
+    storage = LocalBugStorage(bugs_dir=str(tmp_path))
+    for i in range(5):
+        await storage.save_bug(
+            {'bug_id': f'bug-{i}', 'user_name': 'ana' if i < 2 else 'bo'}
+        )
+    # Lines appended by another process are picked up on the next query
+    with storage.bugs_file.open('a', encoding='utf-8') as f:
+        f.write('{"bug_id": "external", "user_name": "ana", "chat_history": [1]}\n')
+
+    assert (await storage.get_bug('bug-3'))['user_name'] == 'bo'
+    assert (await storage.get_bug('missing')) is None
+
+    summaries = await storage.list_bug_summaries(user_name='ana')
+    assert [bug['bug_id'] for bug in summaries] == ['external', 'bug-1', 'bug-0']
+    assert summaries[0]['chat_messages_count'] == 1
+    assert summaries[0]['has_diagram'] is False
+
+
+async def _all_pages(storage, **filters) -> list[str]:
+    """Walk every page and return the bug IDs in page order."""
+    bug_ids, cursor = [], None
+    while True:
+        page, cursor = await storage.page_bug_summaries(
+            limit=3, cursor=cursor, **filters
+        )
+        assert len(page) <= 3
+        bug_ids += [summary['bug_id'] for summary in page]
+        if cursor is None:
+            return bug_ids
+
+
+async def test_cursor_pagination_orders_by_timestamp(tmp_path, storage):
+    """Test that both backends page newest first without gaps or repeats."""
+    local = LocalBugStorage(bugs_dir=str(tmp_path))
+    for backend in (local, storage):
+        for i in range(8):
+            await backend.save_bug(
+                {
+                    'bug_id': f'bug-{i}',
+                    'timestamp': f'2025-01-0{i % 4 + 1}T00:00:00',
+                    'status': 'new' if i < 6 else 'fixed',
+                }
+            )
+    await storage.compact()
+
+    expected = ['bug-7', 'bug-3', 'bug-6', 'bug-2', 'bug-5', 'bug-1', 'bug-4']
+    for backend in (local, storage):
+        assert await _all_pages(backend) == expected + ['bug-0']
+        assert await _all_pages(backend, status='new') == [
+            'bug-3',
+            'bug-2',
+            'bug-5',
+            'bug-1',
+            'bug-4',
+            'bug-0',
+        ]
+
+    with pytest.raises(ValueError):
+        await local.page_bug_summaries(cursor='not-a-cursor')
+
+
+def test_list_endpoints_page_and_stream(client, tmp_path, monkeypatch):
+    """Test the paginated and NDJSON bug listing endpoints."""
+    local = LocalBugStorage(bugs_dir=str(tmp_path))
+    for i in range(3):
+        asyncio.run(local.save_bug({'bug_id': f'bug-{i}', 'timestamp': str(i)}))
+    monkeypatch.setattr(bugs, 'get_bug_storage_instance', lambda: local)
+
+    first = client.get('/api/v1/bugs/list', params={'limit': 2}).json()
+    assert [bug['bug_id'] for bug in first['reports']] == ['bug-2', 'bug-1']
+    second = client.get(
+        '/api/v1/bugs/list', params={'limit': 2, 'cursor': first['next_cursor']}
+    ).json()
+    assert [bug['bug_id'] for bug in second['reports']] == ['bug-0']
+    assert second['next_cursor'] is None
+    assert client.get('/api/v1/bugs/list', params={'cursor': '!'}).status_code == 400
+
+    response = client.get('/api/v1/bugs/list/stream')
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [bug['bug_id'] for bug in lines] == ['bug-2', 'bug-1', 'bug-0']
+
+
+async def test_batches_are_written_together(tmp_path, storage, monkeypatch):
+    """Test batch saves and the fsync count of each durability mode."""
+    fsyncs = []
+    monkeypatch.setattr('src.app.services.bug_storage_service.os.fsync', fsyncs.append)
+    batch = [{'bug_id': f'bug-{i}'} for i in range(5)]
+    for durability, expected in (('batch', 1), ('report', 5)):
+        local = LocalBugStorage(
+            bugs_dir=str(tmp_path / durability), durability=durability
+        )
+        fsyncs.clear()
+        await local.save_bugs(batch)
+        assert len(fsyncs) == expected
+        assert (await local.get_bug('bug-3')) == {'bug_id': 'bug-3'}
+
+    await storage.save_bugs(batch)
+    reports = [name for name in storage.bucket.objects if 'reports/' in name]
+    assert len(reports) == 1 and reports[0].endswith('.jsonl')
+    assert (await storage.get_bug('bug-3')) == {'bug_id': 'bug-3'}
+    summaries = await storage.list_bug_summaries()
+    assert sorted(bug['bug_id'] for bug in summaries) == [b['bug_id'] for b in batch]
+
+    await storage.compact()
+    assert (await storage.get_bug('bug-4')) == {'bug_id': 'bug-4'}
+    assert storage.bucket.range_reads == 1
+
+
+async def test_large_payloads_are_stored_compressed(tmp_path, storage):
+    """Test that diagrams and chats live outside the records listings read."""
+    report = {
+        'bug_id': 'big',
+        'description': 'Diagram lost',
+        'diagram': {'code': 'graph TD\n' + 'A-->B\n' * 2000},
+        'chat_history': [{'role': 'user', 'content': 'hello'}] * 50,
+    }
+    small = {'bug_id': 'small', 'diagram': {'code': 'A-->B'}}
+    local = LocalBugStorage(bugs_dir=str(tmp_path))
+    for backend in (local, storage):
+        await backend.save_bugs([report, small])
+        assert (await backend.get_bug('big')) == report
+        assert (await backend.get_bug('small')) == small
+
+        records = {bug['bug_id']: bug for bug in await backend.list_bugs()}
+        assert 'diagram' not in records['big']
+        assert records['small'] == small
+        summary = next(
+            bug for bug in await backend.list_bug_summaries() if bug['bug_id'] == 'big'
+        )
+        assert summary['has_diagram'] is True
+        assert summary['chat_messages_count'] == 50
+
+    assert local.bugs_file.stat().st_size < 1024
+    [payload_file] = local.payloads_dir.iterdir()
+    assert payload_file.stat().st_size < len(report['diagram']['code']) / 10
+
+    await storage.compact()
+    assert (await storage.get_bug('big')) == report
+    assert any(name.startswith('bugs/payloads/') for name in storage.bucket.objects)
+
+
+async def test_search_ranks_matching_reports(tmp_path, storage):
+    """Test ranked, paginated search on the FTS5 and in-process indexes."""
+    reports = [
+        {'bug_id': 'azure', 'description': 'Azure subgraph renders twice'},
+        {'bug_id': 'subgraph', 'description': 'Nested subgraph is cut off'},
+        {
+            'bug_id': 'chat',
+            'description': 'Layout glitch',
+            'user_name': 'ana',
+            'chat_history': [{'role': 'user', 'content': 'add an azure vnet'}],
+        },
+        {'bug_id': 'other', 'description': 'Export fails'},
+    ]
+    local = LocalBugStorage(bugs_dir=str(tmp_path))
+    for backend in (local, storage):
+        await backend.save_bugs(reports)
+
+        page, next_offset = await backend.search_bugs('Subgraph azure', limit=2)
+        assert page[0]['bug_id'] == 'azure'
+        assert page[0]['score'] >= page[1]['score']
+        rest, last = await backend.search_bugs('subgraph azure', 2, next_offset)
+        assert last is None
+        assert {bug['bug_id'] for bug in page + rest} == {'azure', 'subgraph', 'chat'}
+
+        page, _ = await backend.search_bugs('ana')
+        assert [bug['bug_id'] for bug in page] == ['chat']
+        assert (await backend.search_bugs('"NEAR(*'))[0] == []
+
+    # Lines written before search existed are indexed on the next open
+    local._db.execute('DROP TABLE bugs_fts')
+    reopened = LocalBugStorage(bugs_dir=str(tmp_path))
+    assert len((await reopened.search_bugs('vnet'))[0]) == 1
+
+
+async def test_gcs_search_refresh_reads_only_new_reports(storage, monkeypatch):
+    """Test that refreshing the search index skips reports indexed before."""
+    monkeypatch.setattr(settings, 'BUGS_SEARCH_REFRESH_SECONDS', 0)
+    for i in range(5):
+        await storage.save_bug({'bug_id': f'old-{i}', 'description': 'Old bug'})
+    await storage.compact()
+    await storage.save_bug({'bug_id': 'pending', 'description': 'Pending azure bug'})
+
+    def full_scan():
+        raise AssertionError('refreshes must not read every report')
+
+    monkeypatch.setattr(storage, '_read_bugs', full_scan)
+    assert len((await storage.search_bugs('bug'))[0]) == 6
+    # All compacted reports come from a single range read
+    assert storage.bucket.range_reads == 1
+
+    downloads = []
+    download = storage._download
+
+    def recording_download(blob, *args):
+        downloads.append(blob.name)
+        return download(blob, *args)
+
+    monkeypatch.setattr(storage, '_download', recording_download)
+    await storage.save_bug({'bug_id': 'new', 'description': 'New azure bug'})
+    page, _ = await storage.search_bugs('azure')
+    assert {bug['bug_id'] for bug in page} == {'pending', 'new'}
+    assert len(downloads) == 1
+    assert downloads[0].endswith('-new.json')
+
+
+async def test_local_retry_does_not_duplicate_reports(tmp_path):
+    """Test that saving a report again, as a retry does, keeps one copy."""
+    storage = LocalBugStorage(bugs_dir=str(tmp_path))
+    await storage.save_bugs([{'bug_id': 'bug-1'}, {'bug_id': 'bug-2'}])
+    await storage.save_bugs([{'bug_id': 'bug-2'}, {'bug_id': 'bug-3'}])
+    assert len(storage.bugs_file.read_text().splitlines()) == 3
+
+    # Duplicates written before the check are listed once
+    with storage.bugs_file.open('a') as f:
+        f.write(json.dumps({'bug_id': 'bug-1', 'status': 'copy'}) + '\n')
+    bugs = await storage.list_bugs()
+    assert [bug['bug_id'] for bug in bugs] == ['bug-1', 'bug-2', 'bug-3']
+    assert 'status' not in bugs[0]
+
+
+async def test_blocking_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    """Test that slow storage calls neither stall the loop nor hang callers."""
+    storage = LocalBugStorage(bugs_dir=str(tmp_path), timeout=0.2)
+    original = storage._save_bugs
+
+    def slow_save(bug_list):
+        time.sleep(0.1 if bug_list[0]['bug_id'] == 'slow' else 0.5)
+        original(bug_list)
+
+    monkeypatch.setattr(storage, '_save_bugs', slow_save)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await storage.save_bug({'bug_id': 'slow'})
+    assert ticks >= 5
+
+    with pytest.raises(TimeoutError):
+        await storage.save_bug({'bug_id': 'stuck'})
+    task.cancel()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,149 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the response compression middleware."""
+
+import asyncio
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.app.middleware.compression_middleware import (
+    CompressionMiddleware,
+    is_compressible,
+)
+
+LARGE_DIAGRAM = {'diagram': {'nodes': [{'id': f'node-{i}'} for i in range(200)]}}
+
+
+async def diagram(request: Request):
+    return JSONResponse(LARGE_DIAGRAM, headers={'ETag': '"v1"'})
+
+
+async def small(request: Request):
+    return JSONResponse({'ok': True})
+
+
+async def image(request: Request):
+    return Response(b'\x89PNG' * 1000, media_type='image/png')
+
+
+async def precompressed(request: Request):
+    return Response(
+        b'x' * 4096,
+        media_type='text/css',
+        headers={'Content-Encoding': 'br'},
+    )
+
+
+async def events(request: Request):
+    async def stream():
+        for i in range(3):
+            yield f'id: {i}\ndata: {{"step": {i}}}\n\n'
+
+    return StreamingResponse(stream(), media_type='text/event-stream')
+
+
+@pytest.fixture
+def compression_client():
+    """Client for a small app wrapped in the compression middleware."""
+    app = Starlette(
+        routes=[
+            Route('/diagram', diagram),
+            Route('/small', small),
+            Route('/image', image),
+            Route('/precompressed', precompressed),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=512)
+    return TestClient(app)
+
+
+def test_compressible_types():
+    """Test the media type allowlist."""
+    assert is_compressible('application/json')
+    assert is_compressible('text/event-stream; charset=utf-8')
+    assert is_compressible('image/svg+xml')
+    assert not is_compressible('image/png')
+    assert not is_compressible('')
+
+
+def test_large_json_is_gzipped(compression_client):
+    """Test that a large body is compressed and marked as varying."""
+    response = compression_client.get('/diagram', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.headers['ETag'] == 'W/"v1"'
+    assert int(response.headers['Content-Length']) < len(response.content)
+    assert response.json() == LARGE_DIAGRAM
+
+
+def test_responses_left_alone(compression_client):
+    """Test the cases the middleware must not compress."""
+    headers = {'Accept-Encoding': 'gzip'}
+    for path in ('/small', '/image'):
+        response = compression_client.get(path, headers=headers)
+        assert 'Content-Encoding' not in response.headers
+
+    response = compression_client.get('/precompressed', headers=headers)
+    assert response.headers['Content-Encoding'] == 'br'
+
+    response = compression_client.get(
+        '/diagram', headers={'Accept-Encoding': 'identity, gzip;q=0'}
+    )
+    assert 'Content-Encoding' not in response.headers
+
+
+async def test_sse_events_are_flushed_one_by_one():
+    """Test that every event is decodable as soon as it is sent."""
+    messages = []
+
+    async def receive():
+        # The client stays connected
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/events',
+        'query_string': b'',
+        'headers': [(b'accept-encoding', b'gzip, deflate')],
+    }
+    middleware = CompressionMiddleware(await events(None), minimum_size=512)
+    await middleware(scope, receive, send)
+
+    headers = dict(messages[0]['headers'])
+    assert headers[b'content-encoding'] == b'gzip'
+    assert b'content-length' not in headers
+
+    decoder = zlib.decompressobj(31)
+    chunks = [m['body'] for m in messages[1:]]
+    for i, chunk in enumerate(chunks[:3]):
+        assert decoder.decompress(chunk) == (
+            f'id: {i}\ndata: {{"step": {i}}}\n\n'.encode()
+        )
+    assert decoder.decompress(b''.join(chunks[3:])) == b''
+    assert decoder.eof
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the Mermaid edit-result cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.services import mermaid_edit_service
+from src.lib.cache import InMemoryCacheBackend, ResultCache
+
+
+class FakeGeminiService:
+    """Gemini stand-in that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, content, model, response_modalities=None):
+        self.calls += 1
+        part = SimpleNamespace(text='graph TD\n    A --> B')
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))]
+        )
+
+
+async def test_in_memory_backend_evicts_and_expires():
+    """Test LRU eviction and TTL expiry of the in-memory backend."""
+    backend = InMemoryCacheBackend(max_entries=2)
+    await backend.set('a', '1', ttl=60)
+    await backend.set('b', '2', ttl=60)
+    assert await backend.get('a') == '1'
+    await backend.set('c', '3', ttl=60)
+
+    assert await backend.get('b') is None
+    assert await backend.get('a') == '1'
+    assert backend.evictions == 1
+
+    await backend.set('d', '4', ttl=0)
+    assert await backend.get('d') is None
+
+
+async def test_identical_edits_hit_cache(monkeypatch):
+    """Test that repeated identical edits only call Gemini once."""
+    monkeypatch.setattr(mermaid_edit_service, 'GeminiService', FakeGeminiService)
+    service = mermaid_edit_service.MermaidEditService()
+    service.cache = ResultCache(InMemoryCacheBackend(), ttl=60)
+
+    first = await service.edit_mermaid_diagram('graph TD\n  A-->B', 'simplify')
+    # Whitespace differences normalize to the same key
+    second = await service.edit_mermaid_diagram(
+        'graph TD\r\n    A-->B   \n\n', 'simplify'
+    )
+    await service.edit_mermaid_diagram('graph TD\n  A-->B', 'improve layout')
+
+    assert first == second
+    assert service.gemini_service.calls == 2
+    stats = service.cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['hit_rate'] == pytest.approx(1 / 3, abs=1e-3)
@@ -0,0 +1,97 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the shared, pooled GenAI client."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.lib import genai_client
+from src.lib.genai_client import GenAIClientProvider
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setenv('GOOGLE_GENAI_USE_VERTEXAI', 'false')
+    monkeypatch.setenv('GOOGLE_API_KEY', 'test-key')
+    fresh = GenAIClientProvider(
+        max_connections=7, max_keepalive_connections=3, timeout=12
+    )
+    monkeypatch.setattr(genai_client, 'genai_client_provider', fresh)
+    return fresh
+
+
+def test_client_is_created_once_and_shared(provider):
+    """Test that concurrent callers get the same client."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: genai_client.get_genai_client(), range(16)))
+    assert all(client is clients[0] for client in clients)
+
+
+def test_client_uses_pooled_http_clients(provider):
+    """Test that sync and async calls go through the configured pools."""
+    api_client = provider.get()._api_client
+    assert api_client._httpx_client is provider._http_client
+    assert api_client._async_httpx_client is provider._async_http_client
+    assert provider._async_http_client._transport._pool._max_connections == 7
+    assert provider._http_client._transport._pool._max_keepalive_connections == 3
+    assert api_client._http_options.timeout == 12000
+
+
+async def test_aclose_closes_pools_and_starts_over(provider):
+    """Test that closing the provider releases its connections."""
+    client = provider.get()
+    async_http_client = provider._async_http_client
+
+    await provider.aclose()
+
+    assert async_http_client.is_closed
+    assert provider.get() is not client
+
+
+def test_agents_share_the_client(provider):
+    """Test that ADK agents call Gemini through the shared client."""
+    from src.agents.agent_factory import AgentFactory
+
+    agent = AgentFactory().get_agent('gemini-2.5-flash')
+    assert agent.model.api_client is provider.get()
+
+
+def test_clients_survive_a_second_lifespan(provider, monkeypatch):
+    """Test that cached agents and services use the pools of a restarted app."""
+    from fastapi.testclient import TestClient
+
+    from src.agents.agent_factory import AgentFactory
+    from src.app import main
+    from src.app.services.gemini_service import GeminiService
+
+    monkeypatch.setattr(main, 'genai_client_provider', provider)
+    factory = AgentFactory()
+    service = GeminiService()
+
+    with TestClient(main.app):
+        agent = factory.get_agent('gemini-2.5-flash')
+        first = agent.model.api_client
+        assert service.client is first
+
+    with TestClient(main.app):
+        second = factory.get_agent('gemini-2.5-flash').model.api_client
+        assert second is not first
+        assert service.client is second
+        assert not second._api_client._async_httpx_client.is_closed
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
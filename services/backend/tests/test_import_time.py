@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the import-time budget of the application module."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Cumulative import time of src.app.main; about 0.8s on a laptop, 1.8s
+# when the agent stack was imported with it. Wall-clock time depends on the
+# machine, so the budget is only checked when CHECK_IMPORT_TIME is set.
+IMPORT_BUDGET_SECONDS = 1.5
+
+# Imported on first use, never at startup
+LAZY_PACKAGES = ('google.adk', 'google.genai', 'google.cloud.storage', 'PyPDF2', 'PIL')
+
+
+@pytest.fixture(scope='module')
+def import_profile() -> dict[str, int]:
+    """Import the application in a fresh interpreter under -X importtime.
+
+    Returns:
+        Cumulative import time in microseconds per imported module
+    """
+    env = {
+        **os.environ,
+        'GOOGLE_CLOUD_PROJECT': os.environ.get('GOOGLE_CLOUD_PROJECT', 'test'),
+        'GOOGLE_CLOUD_LOCATION': os.environ.get('GOOGLE_CLOUD_LOCATION', 'test'),
+    }
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import src.app.main'],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_heavy_packages_are_not_imported(import_profile):
+    """Test that heavy SDKs stay out of the startup path."""
+    eager = sorted(
+        name
+        for name in import_profile
+        if any(
+            name == package or name.startswith(f'{package}.')
+            for package in LAZY_PACKAGES
+        )
+    )
+    assert eager == []
+
+
+@pytest.mark.skipif(
+    not os.environ.get('CHECK_IMPORT_TIME'),
+    reason='timing check; set CHECK_IMPORT_TIME=1 to run it',
+)
+def test_import_time_budget(import_profile):
+    """Test that importing the application stays within its budget."""
+    seconds = import_profile['src.app.main'] / 1e6
+    assert seconds < IMPORT_BUDGET_SECONDS
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the batch Mermaid edit endpoint."""
+
+import asyncio
+import json
+
+from src.app.main import app
+from src.app.services.mermaid_edit_service import MermaidEditService
+from src.app.utils.dependencies import get_mermaid_edit_service
+from src.lib import serialization
+
+
+class FakeEditService(MermaidEditService):
+    """Edit service that fails on demand and tracks concurrency."""
+
+    def __init__(self):
+        self.cache = None
+        self.running = 0
+        self.peak = 0
+
+    async def edit_mermaid_diagram(self, content, instructions, **kwargs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if 'fail' in instructions:
+            raise Exception('Gemini unavailable')
+        return content.replace('X', 'Y')
+
+
+def test_batch_edit_streams_ndjson_with_item_errors(client):
+    """Test that each job yields a line and failures stay per-item."""
+    service = FakeEditService()
+    app.dependency_overrides[get_mermaid_edit_service] = lambda: service
+    try:
+        instructions = ['rename X', 'fail', 'rename X', 'rename X']
+        jobs = [
+            {
+                'job_id': f'doc-{i}',
+                'content': 'graph TD\n X --> B',
+                'instructions': text,
+            }
+            for i, text in enumerate(instructions)
+        ]
+        response = client.post(
+            '/api/v1/mermaid/edit/batch', json={'jobs': jobs, 'max_concurrency': 2}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r['index'] for r in results) == [0, 1, 2, 3]
+
+    by_id = {r['job_id']: r for r in results}
+    assert by_id['doc-1']['success'] is False
+    assert by_id['doc-1']['error'] == 'Gemini unavailable'
+    assert by_id['doc-0']['content'] == 'graph TD\n Y --> B'
+    assert service.peak <= 2
+
+
+def test_single_edit_renders_with_fast_serializer(client, monkeypatch):
+    """Test that the edit response skips FastAPI's response_model encoding."""
+    rendered = []
+    dumps = serialization.dumps
+    monkeypatch.setattr(
+        serialization, 'dumps', lambda obj: rendered.append(obj) or dumps(obj)
+    )
+
+    app.dependency_overrides[get_mermaid_edit_service] = lambda: FakeEditService()
+    try:
+        response = client.post(
+            '/api/v1/mermaid/edit',
+            json={'content': 'graph TD\n X --> B', 'instructions': 'rename X'},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()['content'] == 'graph TD\n Y --> B'
+    assert len(rendered) == 1
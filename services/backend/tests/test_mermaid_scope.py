@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test scoped editing of large mermaid diagrams."""
+
+import pytest
+
+from src.lib.mermaid_scope import extract_edit_scope, merge_scoped_edit
+
+DIAGRAM = """graph TD
+    subgraph Cloud [Azure Cloud]
+        AFD(fa:fa-globe Azure Front Door)
+        subgraph AppTier [App Service Subnet]
+            FrontendApp[Azure App Service (Frontend)]
+            BackendApi[Azure App Service (Backend API)]
+        end
+        subgraph DataTier [Data Tier]
+            SQLDB[(Azure SQL DB)]
+            Redis[(Azure Cache for Redis)]
+        end
+        subgraph Observability
+            Monitor(Azure Monitor)
+            AppInsights(Application Insights)
+        end
+    end
+    User -- HTTPS --> AFD
+    AFD --> FrontendApp
+    FrontendApp -- REST API Call --> BackendApi
+    BackendApi --> SQLDB
+    BackendApi -.-> Monitor
+    style Redis fill:#f96"""
+
+
+def test_scope_selects_referenced_node_and_neighbors():
+    """Test that a node matched by label brings its one-hop neighbors."""
+    scope = extract_edit_scope(DIAGRAM, 'Rename the Backend API to Orders API', 0.9)
+
+    assert scope is not None
+    assert scope.node_ids == ['BackendApi', 'FrontendApp', 'Monitor', 'SQLDB']
+    assert 'Redis' not in scope.excerpt
+    assert 'AFD' not in scope.excerpt
+    # Enclosing subgraphs are kept as wrappers
+    assert 'subgraph AppTier [App Service Subnet]' in scope.excerpt
+    assert scope.excerpt.startswith('graph TD')
+
+
+def test_scope_includes_whole_subgraph():
+    """Test that a subgraph matched by title is included in full."""
+    scope = extract_edit_scope(DIAGRAM, 'Add tracing to the observability group', 0.9)
+
+    assert scope is not None
+    assert scope.subgraphs == ['Observability']
+    assert 'AppInsights' in scope.excerpt
+
+
+def test_scope_falls_back_for_global_instructions():
+    """Test that instructions not naming any element disable scoping."""
+    assert extract_edit_scope(DIAGRAM, 'improve layout', 0.9) is None
+    assert extract_edit_scope(DIAGRAM, 'Rename Backend API', 0.1) is None
+    assert extract_edit_scope('sequenceDiagram\n    A->>B: hi', 'rename A') is None
+
+
+def test_merge_replaces_slice_in_place():
+    """Test that the edited excerpt is merged back into the right subgraphs."""
+    scope = extract_edit_scope(DIAGRAM, 'Rename the Backend API to Orders API', 0.9)
+    edited = scope.excerpt.replace('Backend API', 'Orders API') + (
+        '\n    BackendApi --> Queue[Message Queue]'
+    )
+
+    merged = merge_scoped_edit(scope, edited)
+
+    assert 'BackendApi[Azure App Service (Orders API)]' in merged
+    assert 'Backend API' not in merged
+    assert 'BackendApi --> Queue[Message Queue]' in merged
+    # Untouched content is preserved
+    assert 'Redis[(Azure Cache for Redis)]' in merged
+    assert 'style Redis fill:#f96' in merged
+    lines = merged.split('\n')
+    assert lines.index('        subgraph AppTier [App Service Subnet]') < lines.index(
+        '            BackendApi[Azure App Service (Orders API)]'
+    )
+    assert merged.count('subgraph') == DIAGRAM.count('subgraph')
+
+
+def test_merge_removes_deleted_subgraph():
+    """Test that dropping a fully selected subgraph removes it."""
+    scope = extract_edit_scope(DIAGRAM, 'Remove the Observability subgraph', 0.9)
+    edited = '\n'.join(
+        line
+        for line in scope.excerpt.split('\n')
+        if 'Monitor' not in line
+        and 'AppInsights' not in line
+        and 'Observability' not in line
+    )
+
+    merged = merge_scoped_edit(scope, edited)
+
+    assert 'Observability' not in merged
+    assert 'BackendApi -.-> Monitor' not in merged
+    assert 'subgraph DataTier [Data Tier]' in merged
+    assert 'BackendApi[Azure App Service (Backend API)]' in merged
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,267 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test token bucket rate limiting."""
+
+import fakeredis
+import pytest
+from starlette.requests import Request
+
+from src.app.main import app
+from src.app.schemas.mermaid_edit import MermaidBatchEditResult
+from src.app.services.rate_limiting import (
+    BucketLimit,
+    RateLimiter,
+    RateLimitExceeded,
+    client_address,
+)
+from src.app.utils.dependencies import get_mermaid_edit_service, get_session_user
+from src.lib import rate_limit
+from src.lib.config import settings
+from src.lib.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    RedisRateLimitBackend,
+)
+
+
+class EchoEditService:
+    """Edit service that returns every diagram unchanged."""
+
+    async def iter_batch_edits(self, jobs, **kwargs):
+        for job in jobs:
+            yield MermaidBatchEditResult(
+                job_id=job.job_id,
+                index=0,
+                success=True,
+                content=job.content,
+                diagram_type=job.diagram_type,
+            )
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, 'monotonic', fake.monotonic)
+    return fake
+
+
+def make_limiter(per_minute=60, burst=2) -> RateLimiter:
+    return RateLimiter(
+        backend=InMemoryRateLimitBackend(),
+        limits={'chat': BucketLimit(per_minute, burst)},
+        enabled=True,
+    )
+
+
+async def test_bucket_allows_burst_then_refills(clock):
+    """Test that a bucket empties after its burst and refills over time."""
+    backend = InMemoryRateLimitBackend()
+    assert await backend.consume(['a'], 1, rate=1, burst=2) == 0
+    assert await backend.consume(['a'], 1, rate=1, burst=2) == 0
+    assert await backend.consume(['a'], 1, rate=1, burst=2) == pytest.approx(1)
+
+    clock.now += 1
+    assert await backend.consume(['a'], 1, rate=1, burst=2) == 0
+    assert await backend.consume(['b'], 1, rate=1, burst=2) == 0
+
+
+async def test_bucket_evicts_least_recently_used(clock):
+    """Test that the in-memory buckets stay bounded."""
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ('a', 'b', 'c'):
+        await backend.consume([key], 1, rate=1, burst=1)
+    assert list(backend._buckets) == ['b', 'c']
+
+
+async def test_limit_is_shared_by_sessions_of_one_user(clock):
+    """Test that a new session does not reset a user's allowance."""
+    limiter = make_limiter(burst=1)
+    await limiter.check('chat', ['session:one', 'user:ada'])
+
+    with pytest.raises(RateLimitExceeded) as exceeded:
+        await limiter.check('chat', ['session:two', 'user:ada'])
+    assert exceeded.value.retry_after == 1
+
+    await limiter.check('chat', ['session:three', 'user:grace'])
+
+
+async def test_rejected_request_charges_no_bucket(clock):
+    """Test that a request rejected by its user bucket spares its session."""
+    limiter = make_limiter(burst=1)
+    await limiter.check('chat', ['session:one', 'user:ada'])
+
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check('chat', ['session:two', 'user:ada'])
+    # The rejected request left the session's bucket full
+    await limiter.check('chat', ['session:two'])
+
+
+async def test_cost_above_burst_waits_for_full_bucket(clock):
+    """Test that an oversized request is allowed once the bucket is full."""
+    limiter = make_limiter(burst=2)
+    await limiter.check('chat', ['session:a'], cost=5)
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check('chat', ['session:a'])
+
+    clock.now += 2
+    await limiter.check('chat', ['session:a'], cost=5)
+
+
+async def test_backend_errors_allow_requests():
+    """Test that an unreachable backend does not fail requests."""
+
+    class BrokenBackend(RateLimitBackend):
+        async def consume(self, keys, cost, rate, burst):
+            raise ConnectionError('redis down')
+
+    limiter = RateLimiter(
+        backend=BrokenBackend(), limits={'chat': BucketLimit(1, 1)}, enabled=True
+    )
+    for _ in range(3):
+        await limiter.check('chat', ['session:a'])
+
+
+async def test_redis_buckets_are_charged_all_or_none():
+    """Test the Lua script against an in-memory Redis."""
+    backend = RedisRateLimitBackend(
+        client=fakeredis.FakeAsyncRedis(decode_responses=True)
+    )
+    # One token a minute, so the real clock Redis reads adds next to nothing
+    rate = 1 / 60
+    assert await backend.consume(['session:one', 'user:ada'], 1, rate, burst=1) == 0
+
+    wait = await backend.consume(['session:two', 'user:ada'], 1, rate, burst=1)
+    assert wait == pytest.approx(60, abs=1)
+    # The rejected request left the session's bucket full
+    assert await backend.consume(['session:two'], 1, rate, burst=1) == 0
+    assert await backend.client.pttl('ratelimit:session:two') > 0
+
+
+def make_request(client_host: str, forwarded_for: str | None = None) -> Request:
+    headers = []
+    if forwarded_for is not None:
+        headers.append((b'x-forwarded-for', forwarded_for.encode()))
+    return Request({'type': 'http', 'headers': headers, 'client': (client_host, 1234)})
+
+
+def test_client_address_trusts_only_configured_proxies(monkeypatch):
+    """Test that only proxy-appended X-Forwarded-For entries are believed."""
+    request = make_request('10.0.0.2', forwarded_for='6.6.6.6, 203.0.113.7')
+    assert client_address(request) == '10.0.0.2'
+
+    monkeypatch.setattr(settings, 'RATE_LIMIT_TRUSTED_PROXIES', 1)
+    assert client_address(request) == '203.0.113.7'
+    assert client_address(make_request('10.0.0.2')) == '10.0.0.2'
+
+
+def test_requests_without_session_share_address_bucket(client, monkeypatch):
+    """Test that dropping X-Session-ID does not reset the allowance."""
+    limiter = RateLimiter(
+        backend=InMemoryRateLimitBackend(),
+        limits={'edit': BucketLimit(per_minute=1, burst=1)},
+        enabled=True,
+    )
+    monkeypatch.setattr('src.app.api.v1.routes.mermaid_edit.rate_limiter', limiter)
+    app.dependency_overrides[get_mermaid_edit_service] = EchoEditService
+    try:
+        responses = [
+            client.post(
+                '/api/v1/mermaid/edit/batch',
+                json={
+                    'jobs': [
+                        {
+                            'job_id': 'doc',
+                            'content': 'graph TD\n A',
+                            'instructions': 'x',
+                        }
+                    ]
+                },
+            )
+            for _ in range(3)
+        ]
+    finally:
+        app.dependency_overrides.clear()
+
+    assert 'x-session-id' not in client.headers
+    assert [r.status_code for r in responses] == [200, 429, 429]
+
+
+def test_rate_limited_edit_answers_429(client, monkeypatch):
+    """Test that an exhausted edit bucket gets 429 with Retry-After."""
+    limiter = RateLimiter(
+        backend=InMemoryRateLimitBackend(),
+        limits={'edit': BucketLimit(per_minute=1, burst=1)},
+        enabled=True,
+    )
+    monkeypatch.setattr('src.app.api.v1.routes.mermaid_edit.rate_limiter', limiter)
+    app.dependency_overrides[get_mermaid_edit_service] = EchoEditService
+    app.dependency_overrides[get_session_user] = lambda: 'ada'
+    try:
+        jobs = [
+            {'job_id': f'doc-{i}', 'content': 'graph TD\n A', 'instructions': 'x'}
+            for i in range(3)
+        ]
+        first = client.post('/api/v1/mermaid/edit/batch', json={'jobs': jobs})
+        second = client.post(
+            '/api/v1/mermaid/edit',
+            json={'content': 'graph TD\n A --> B', 'instructions': 'rename A'},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert int(second.headers['retry-after']) >= 1
+
+
+def test_rate_limited_query_creates_no_session(client, monkeypatch):
+    """Test that the agent endpoint checks the limit before any session work."""
+    from src.app.api.v1.routes import agent
+
+    limiter = RateLimiter(
+        backend=InMemoryRateLimitBackend(),
+        limits={'chat': BucketLimit(per_minute=1, burst=1)},
+        enabled=True,
+    )
+    client.portal.call(limiter.check, 'chat', ['user:ada'])
+    monkeypatch.setattr(agent, 'rate_limiter', limiter)
+    created = []
+
+    async def get_or_create_session(*args):
+        created.append(args)
+
+    monkeypatch.setattr(agent, 'get_or_create_session', get_or_create_session)
+    app.dependency_overrides[get_session_user] = lambda: 'ada'
+    try:
+        response = client.post('/api/v1/root_agent/', data={'text': 'hello'})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 429
+    assert created == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
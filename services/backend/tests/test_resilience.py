@@ -0,0 +1,175 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test retries and hedging of Gemini calls."""
+
+import asyncio
+
+import httpx
+import pytest
+from google.genai import errors
+
+from src.lib.resilience import ResilientCaller, RetryPolicy, is_retryable
+
+
+def api_error(code: int) -> errors.APIError:
+    error_class = errors.ServerError if code >= 500 else errors.ClientError
+    return error_class(code, {'error': {'code': code, 'message': 'failed'}})
+
+
+def make_caller(**kwargs) -> ResilientCaller:
+    options = {
+        'policy': RetryPolicy(
+            max_attempts=3, base_delay=0.001, max_delay=0.01, deadline=5
+        ),
+        'hedging': False,
+        'hedge_min_samples': 5,
+    }
+    options.update(kwargs)
+    return ResilientCaller(**options)
+
+
+class Flaky:
+    """Fails with the given errors, then returns 'ok'."""
+
+    def __init__(self, *failures: Exception):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return 'ok'
+
+
+@pytest.mark.parametrize(
+    'exc, retryable',
+    [
+        (api_error(429), True),
+        (api_error(503), True),
+        (api_error(400), False),
+        (api_error(404), False),
+        (httpx.ConnectTimeout('slow'), True),
+        (httpx.ConnectError('refused'), True),
+        (TimeoutError(), True),
+        (ValueError('bad prompt'), False),
+    ],
+)
+def test_errors_are_classified(exc, retryable):
+    """Test that only throttling, server errors and timeouts are retried."""
+    assert is_retryable(exc) is retryable
+
+
+async def test_transient_errors_are_retried():
+    """Test that a call survives transient failures."""
+    caller = make_caller()
+    flaky = Flaky(api_error(503), httpx.ReadTimeout('slow'))
+
+    assert await caller.call('edit@flash', flaky) == 'ok'
+    assert flaky.calls == 3
+    assert caller.stats()['edit@flash']['retries'] == 2
+
+
+async def test_client_errors_are_not_retried():
+    """Test that a 4xx other than 429 fails at once."""
+    caller = make_caller()
+    flaky = Flaky(api_error(400))
+
+    with pytest.raises(errors.ClientError):
+        await caller.call('edit@flash', flaky)
+    assert flaky.calls == 1
+
+
+async def test_attempts_are_bounded():
+    """Test that retries stop after the last attempt."""
+    caller = make_caller()
+    flaky = Flaky(*(api_error(503) for _ in range(5)))
+
+    with pytest.raises(errors.ServerError):
+        await caller.call('edit@flash', flaky)
+    assert flaky.calls == 3
+    assert caller.stats()['edit@flash']['failures'] == 1
+
+
+async def test_deadline_bounds_the_whole_call():
+    """Test that a hanging request fails when the deadline passes."""
+    caller = make_caller(
+        policy=RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, deadline=0.05)
+    )
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(caller.call('edit@flash', hang), 1)
+
+
+async def test_slow_request_is_hedged():
+    """Test that a straggler is raced against a second request."""
+    caller = make_caller(hedging=True)
+    fast = Flaky()
+    for _ in range(5):
+        await caller.call('edit@flash', fast)
+    assert caller.hedge_delay('edit@flash') is not None
+
+    started = []
+
+    async def straggler_then_fast():
+        started.append(len(started))
+        if len(started) == 1:
+            await asyncio.sleep(10)
+        return 'hedge'
+
+    result = await asyncio.wait_for(caller.call('edit@flash', straggler_then_fast), 2)
+
+    stats = caller.stats()['edit@flash']
+    assert result == 'hedge'
+    assert stats['hedges'] == stats['hedge_wins'] == 1
+    assert stats['hedged']['samples'] == 1
+    assert stats['plain']['samples'] == 5
+
+
+async def test_hedge_is_sent_only_with_permit():
+    """Test that a hedge is only sent when it is granted capacity."""
+    released = []
+    for permit, expected_calls in ((None, 1), (lambda: released.append(True), 2)):
+        caller = make_caller(hedging=True, hedge_permit=lambda p=permit: p)
+        fast = Flaky()
+        for _ in range(5):
+            await caller.call('edit@flash', fast)
+
+        calls = []
+
+        async def slow():
+            calls.append(None)
+            await asyncio.sleep(0.2)
+            return 'slow'
+
+        assert await asyncio.wait_for(caller.call('edit@flash', slow), 2) == 'slow'
+        await asyncio.sleep(0)
+        assert len(calls) == expected_calls
+
+    assert released == [True]
+
+
+def test_gemini_stats_endpoint(client):
+    """Test that the metrics are served."""
+    response = client.get('/api/v1/gemini/stats')
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
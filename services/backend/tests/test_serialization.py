@@ -0,0 +1,69 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the fast JSON serializer."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from src.app.schemas.response import AgentResponse
+from src.lib import serialization
+from src.lib.serialization import FastJSONResponse, dumps, dumps_str, loads
+
+
+@pytest.fixture(params=['orjson', 'pydantic-core'])
+def backend(request, monkeypatch):
+    """Run a test with each serializer backend."""
+    if request.param == 'orjson':
+        if serialization.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(serialization, 'orjson', None)
+    return request.param
+
+
+def test_dumps_matches_json(backend):
+    """Test that output parses back to what json.dumps would encode."""
+    value = {'name': 'Zoë', 'nodes': [1, 2.5, None, True], 'nested': {'a': 'b\n'}}
+    assert json.loads(dumps(value)) == value
+    assert loads(dumps_str(value)) == value
+    assert 'Zoë' in dumps_str(value)
+
+
+def test_dumps_handles_rich_values(backend):
+    """Test models, datetimes and non-string keys."""
+    response = AgentResponse(response='ok', diagram={'code': 'graph TD'})
+    value = {
+        'agent': response,
+        'at': datetime(2025, 6, 1, 12, 30),
+        1: 'one',
+    }
+    assert json.loads(dumps(value)) == {
+        'agent': response.model_dump(mode='json'),
+        'at': '2025-06-01T12:30:00',
+        '1': 'one',
+    }
+
+
+def test_fast_json_response(backend):
+    """Test that the response renders with the fast serializer."""
+    response = FastJSONResponse({'success': True, 'count': 0})
+    assert response.body == b'{"success":true,"count":0}'
+    assert response.headers['content-type'] == 'application/json'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,127 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the pure ASGI session middleware."""
+
+import asyncio
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.app.middleware.session_middleware import SessionMiddleware, is_static_path
+
+
+async def whoami(request: Request):
+    request.state.actual_session_id = request.headers.get('X-Use-Session') or (
+        request.state.candidate_session_id
+    )
+    return JSONResponse(
+        {'candidate': request.state.candidate_session_id},
+        headers={'Access-Control-Expose-Headers': 'X-Request-ID'},
+    )
+
+
+async def stream(request: Request):
+    async def events():
+        for i in range(3):
+            yield f'data: {i}\n\n'
+
+    return StreamingResponse(events(), media_type='text/event-stream')
+
+
+async def asset(request: Request):
+    return PlainTextResponse('body {}')
+
+
+@pytest.fixture
+def session_client():
+    """Client for a small app wrapped in the session middleware."""
+    app = Starlette(
+        routes=[
+            Route('/api/v1/whoami', whoami),
+            Route('/api/v1/stream', stream),
+            Route('/_next/static/app.css', asset),
+        ]
+    )
+    app.add_middleware(SessionMiddleware)
+    return TestClient(app)
+
+
+def test_static_paths_are_classified():
+    """Test the precompiled static asset classification."""
+    assert is_static_path('/_next/static/chunks/main.js')
+    assert is_static_path('/favicon.ico')
+    assert is_static_path('/images/Logo.PNG')
+    assert not is_static_path('/api/v1/files/report.json')
+    assert not is_static_path('/login')
+    assert not is_static_path('/js')
+
+
+def test_session_id_is_generated_and_echoed(session_client):
+    """Test that a session ID reaches handlers and the response headers."""
+    response = session_client.get('/api/v1/whoami')
+    session_id = response.headers['X-Session-ID']
+    assert response.json() == {'candidate': session_id}
+    assert response.headers['Access-Control-Expose-Headers'] == (
+        'X-Request-ID, X-Session-ID'
+    )
+
+    response = session_client.get(
+        '/api/v1/whoami', headers={'X-Session-ID': 'abc', 'X-Use-Session': 'xyz'}
+    )
+    assert response.json() == {'candidate': 'abc'}
+    # The session the handler actually used wins
+    assert response.headers['X-Session-ID'] == 'xyz'
+
+
+async def test_streams_pass_through_chunk_by_chunk():
+    """Test that each streamed chunk is forwarded as its own message."""
+    messages = []
+
+    async def receive():
+        # The client stays connected
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/api/v1/stream',
+        'query_string': b'',
+        'headers': [],
+    }
+    await SessionMiddleware(await stream(None))(scope, receive, send)
+
+    assert (b'x-session-id', scope['state']['candidate_session_id'].encode()) in (
+        messages[0]['headers']
+    )
+    bodies = [m['body'] for m in messages[1:] if m.get('body')]
+    assert bodies == [f'data: {i}\n\n'.encode() for i in range(3)]
+
+
+def test_assets_skip_sessions(session_client):
+    """Test that static assets are served without a session."""
+    response = session_client.get('/_next/static/app.css')
+    assert response.text == 'body {}'
+    assert 'X-Session-ID' not in response.headers
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the SSE hub fan-out, buffering, keep-alives and replay."""
+
+import asyncio
+import json
+
+import fakeredis
+
+from src.app.utils.sse import SSEManager
+from src.lib.pubsub import InProcessPubSub, RedisPubSub
+
+
+async def _next_frame(stream) -> tuple[int | None, dict]:
+    """Read the next data frame from a stream and return its ID and payload."""
+    while True:
+        frame = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        fields = dict(line.split(': ', 1) for line in frame.strip().split('\n') if line)
+        if 'data' in fields:
+            event_id = int(fields['id']) if 'id' in fields else None
+            return event_id, json.loads(fields['data'])
+
+
+async def _next_event(stream) -> dict:
+    """Read the next data frame from a stream and decode its payload."""
+    return (await _next_frame(stream))[1]
+
+
+async def test_every_subscriber_of_a_session_receives_events():
+    """Test that a second tab does not steal the first tab's stream."""
+    manager = SSEManager(keepalive_interval=60)
+    first = manager.generate_sse_stream('s1')
+    second = manager.generate_sse_stream('s1')
+    # Start both generators so they subscribe
+    first_read = asyncio.ensure_future(_next_event(first))
+    second_read = asyncio.ensure_future(_next_event(second))
+    await asyncio.sleep(0.01)
+    assert manager.subscriber_count == 2
+
+    await manager.send_final_response('s1', 'done')
+
+    assert (await first_read)['response'] == 'done'
+    assert (await second_read)['response'] == 'done'
+
+    # Closing one tab leaves the other subscribed
+    await first.aclose()
+    assert manager.subscriber_count == 1
+    await second.aclose()
+    assert manager.subscriber_count == 0
+
+
+async def test_buffer_coalesces_status_and_drops_oldest():
+    """Test that slow subscribers keep a bounded buffer."""
+    manager = SSEManager(keepalive_interval=60, max_buffered_events=2)
+    subscriber = manager.subscribe('s1')
+
+    await manager.send_status_update('s1', 'processing')
+    await manager.send_status_update('s1', 'tool_running')
+    assert [u['status'] for _, u in subscriber.buffer] == ['tool_running']
+
+    await manager.send_final_response('s1', 'one')
+    await manager.send_final_response('s1', 'two')
+    assert [u.get('response') for _, u in subscriber.buffer] == ['one', 'two']
+    assert subscriber.dropped == 1
+    manager.unsubscribe(subscriber)
+
+
+async def test_shared_heartbeat_sends_keep_alive():
+    """Test that idle streams receive keep-alives from the heartbeat task."""
+    manager = SSEManager(keepalive_interval=0.05)
+    stream = manager.generate_sse_stream('s1')
+
+    assert (await _next_event(stream))['type'] == 'keep_alive'
+    await stream.aclose()
+
+
+async def test_reconnect_replays_missed_events():
+    """Test that Last-Event-ID resumes the stream without gaps or duplicates."""
+    manager = SSEManager(keepalive_interval=60)
+    stream = manager.generate_sse_stream('s1')
+    read = asyncio.ensure_future(_next_frame(stream))
+    await asyncio.sleep(0.01)
+    await manager.send_tool_start('s1', 'diagram_tool')
+    last_id, _ = await read
+    await stream.aclose()
+
+    # Published while the client was disconnected
+    await manager.send_tool_complete('s1', 'diagram_tool')
+    await manager.send_final_response('s1', 'done')
+
+    resumed = manager.generate_sse_stream('s1', last_event_id=last_id)
+    first_id, first = await _next_frame(resumed)
+    second_id, second = await _next_frame(resumed)
+    assert first['status'] == 'tool_complete'
+    assert second['response'] == 'done'
+    assert last_id < first_id < second_id
+    await resumed.aclose()
+
+
+async def test_replay_history_is_bounded():
+    """Test that only recent events are kept for replay."""
+    manager = SSEManager(keepalive_interval=60, replay_max_events=2)
+    for response in ('one', 'two', 'three'):
+        await manager.send_final_response('s1', response)
+
+    subscriber = manager.subscribe('s1', last_event_id=0)
+    assert [u['response'] for _, u in subscriber.buffer] == ['two', 'three']
+    manager.unsubscribe(subscriber)
+
+    # Without Last-Event-ID a fresh stream starts with live events only
+    fresh = manager.subscribe('s1')
+    assert not fresh.buffer
+    manager.unsubscribe(fresh)
+
+
+async def test_events_reach_streams_on_other_workers():
+    """Test that an event published by one worker reaches another's stream."""
+    server = fakeredis.FakeServer()
+
+    def worker() -> SSEManager:
+        client = fakeredis.FakeAsyncRedis(server=server)
+        return SSEManager(keepalive_interval=60, transport=RedisPubSub(client=client))
+
+    streaming_worker, producing_worker = worker(), worker()
+    await producing_worker.start()
+    stream = streaming_worker.generate_sse_stream('s1')
+    read = asyncio.ensure_future(_next_event(stream))
+    await asyncio.sleep(0.01)
+
+    await producing_worker.send_final_response('s1', 'done')
+
+    assert (await read)['response'] == 'done'
+    await stream.aclose()
+    await streaming_worker.close()
+    await producing_worker.close()
+
+
+async def test_transport_failure_delivers_locally():
+    """Test that a broken transport does not lose events on this worker."""
+
+    class BrokenTransport(InProcessPubSub):
+        async def publish(self, message):
+            raise ConnectionError('unreachable')
+
+    manager = SSEManager(keepalive_interval=60, transport=BrokenTransport())
+    subscriber = manager.subscribe('s1')
+
+    await manager.send_final_response('s1', 'done')
+
+    assert [u['response'] for _, u in subscriber.buffer] == ['done']
+    manager.unsubscribe(subscriber)
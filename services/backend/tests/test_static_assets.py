@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test static frontend serving from the asset table."""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.staticfrontend import router
+from src.app.staticfrontend.assets import IMMUTABLE_CACHE_CONTROL
+
+BUNDLE = '_next/static/chunks/app-3f9a.js'
+SCRIPT = 'console.log("hello");\n' * 200
+
+
+@pytest.fixture
+def frontend(tmp_path, monkeypatch):
+    """Client for an app serving a small frontend build."""
+    (tmp_path / '_next/static/chunks').mkdir(parents=True)
+    (tmp_path / BUNDLE).write_text(SCRIPT)
+    (tmp_path / 'index.html').write_text('<html>index</html>')
+    (tmp_path / 'about.html').write_text('<html>about</html>')
+    (tmp_path / 'video.webm').write_bytes(b'\0' * 16384)
+    (tmp_path / 'logo.svg').write_text('<svg/>')
+    (tmp_path / 'logo.svg.br').write_bytes(b'brotli-bytes')
+
+    monkeypatch.setattr(router, 'static_files_dir', tmp_path)
+    monkeypatch.setattr(router, 'frontend_router', router.APIRouter())
+    monkeypatch.setattr(router.settings, 'STATIC_MEMORY_MAX_FILE_BYTES', 1024 * 8)
+    app = FastAPI()
+    router.register_frontend_routes(app)
+    return TestClient(app)
+
+
+def test_hashed_bundles_are_immutable_and_revalidated(frontend):
+    """Test cache headers, gzip negotiation and conditional requests."""
+    response = frontend.get(f'/{BUNDLE}', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.text == SCRIPT
+
+    etag = response.headers['ETag']
+    cached = frontend.get(
+        f'/{BUNDLE}', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b''
+
+    # The identity encoding has its own validator
+    plain = frontend.get(
+        f'/{BUNDLE}', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag}
+    )
+    assert plain.status_code == 200
+    assert 'Content-Encoding' not in plain.headers
+    assert len(gzip.compress(plain.content)) < len(plain.content)
+
+
+def test_spa_fallback_and_precompressed_variants(frontend):
+    """Test SPA routing, build-provided variants and large files."""
+    assert frontend.get('/').text == '<html>index</html>'
+    assert frontend.get('/about').text == '<html>about</html>'
+    page = frontend.get('/designs/42')
+    assert page.text == '<html>index</html>'
+    assert page.headers['Cache-Control'] == 'no-cache'
+
+    assert frontend.get('/_next/static/chunks/missing.js').status_code == 404
+    assert frontend.get('/../pyproject.toml').text == '<html>index</html>'
+
+    response = frontend.get('/logo.svg', headers={'Accept-Encoding': 'gzip, br;q=0.9'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.content == b'brotli-bytes'
+    response = frontend.get('/logo.svg', headers={'Accept-Encoding': 'br;q=0'})
+    assert response.text == '<svg/>'
+
+    # Streamed from disk above the in-memory limit
+    assert len(frontend.get('/video.webm').content) == 16384
+    assert frontend.head('/about').status_code == 200
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
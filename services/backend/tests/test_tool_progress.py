@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test tool progress events and learned duration estimates."""
+
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import callbacks
+from src.agents.tools import diagram_model
+from src.app.utils.sse import SSEManager
+from src.lib.latency import LatencyTracker, RollingHistogram
+
+
+def test_histogram_percentile_follows_recent_samples():
+    """Test that the estimate tracks the rolling window of samples."""
+    histogram = RollingHistogram(window=4)
+    assert histogram.percentile(0.5) is None
+
+    for seconds in (1.5, 1.5, 1.5, 1.5):
+        histogram.record(seconds)
+    assert 1 <= histogram.percentile(0.75) <= 2
+
+    # Slower calls push the fast ones out of the window
+    for seconds in (20, 21, 22, 23):
+        histogram.record(seconds)
+    assert len(histogram) == 4
+    assert 17 <= histogram.percentile(0.75) <= 25
+
+
+def test_tracker_is_keyed_by_tool_and_model():
+    """Test that estimates are kept separately per tool and model."""
+    tracker = LatencyTracker(window=10, quantile=0.5, default_estimate=7)
+    tracker.record('diagram', 'pro', 24.0)
+    tracker.record('diagram', 'flash', 4.0)
+
+    assert tracker.estimate('diagram', 'pro') > tracker.estimate('diagram', 'flash')
+    assert tracker.estimate('search', 'pro') == 7
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Route callback events to a fresh SSE manager and latency tracker."""
+    manager = SSEManager(keepalive_interval=60)
+    monkeypatch.setattr(callbacks, 'sse_manager', manager)
+    monkeypatch.setattr(
+        callbacks,
+        'tool_latency',
+        LatencyTracker(window=10, quantile=0.5, default_estimate=25),
+    )
+    return manager
+
+
+def _tool_context(session_id: str = 's1') -> SimpleNamespace:
+    """Return a minimal stand-in for an ADK tool context."""
+    return SimpleNamespace(
+        session=SimpleNamespace(id=session_id),
+        agent_name='assistant_gemini_2_5_flash__gcp',
+        function_call_id='call-1',
+    )
+
+
+async def test_tool_callbacks_publish_progress(manager):
+    """Test that tool callbacks emit start and completion events with an ETA."""
+    subscriber = manager.subscribe('s1')
+    tool = SimpleNamespace(name='generate_architecture_diagram')
+    context = _tool_context()
+
+    await callbacks.tool_started_callback(tool, {}, context)
+    start = subscriber.buffer.popleft()[1]
+    assert start['status'] == 'tool_running'
+    assert start['estimated_duration'] == 25
+
+    await callbacks.tool_completed_callback(tool, {}, context, {'status': 'success'})
+    complete = subscriber.buffer.popleft()[1]
+    assert complete['status'] == 'tool_complete'
+
+    # The measured call replaces the default estimate of the model it used
+    assert callbacks.tool_latency.estimate(tool.name, diagram_model()) == 1
+    assert not callbacks._tool_starts
+    manager.unsubscribe(subscriber)
+
+
+async def test_failed_tool_call_is_forgotten(manager):
+    """Test that a tool raising does not leave its start time behind."""
+    tool = SimpleNamespace(name='generate_architecture_diagram')
+    context = _tool_context()
+
+    await callbacks.tool_started_callback(tool, {}, context)
+    assert callbacks.tool_failed_callback(tool, {}, context, ValueError()) is None
+    assert not callbacks._tool_starts
+
+
+async def test_running_tools_are_bounded(manager, monkeypatch):
+    """Test that start times of calls that never end are evicted."""
+    monkeypatch.setattr(callbacks, 'MAX_RUNNING_TOOLS', 2)
+    monkeypatch.setattr(callbacks, '_tool_starts', OrderedDict())
+    tool = SimpleNamespace(name='search')
+    for call_id in ('a', 'b', 'c'):
+        context = _tool_context()
+        context.function_call_id = call_id
+        await callbacks.tool_started_callback(tool, {}, context)
+
+    assert list(callbacks._tool_starts) == [('s1', 'b'), ('s1', 'c')]
+
+
+def test_tool_stats_endpoint(client):
+    """Test that the measured tool durations are served."""
+    response = client.get('/api/v1/tools/stats')
+    assert response.status_code == 200
+    assert isinstance(response.json(), dict)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
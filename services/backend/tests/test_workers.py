@@ -0,0 +1,72 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test worker count detection from cgroup CPU quotas."""
+
+import pytest
+from google.adk.sessions import InMemorySessionService
+
+from src.app.utils.dependencies import create_session_service
+from src.lib.workers import available_cpus, cgroup_cpu_limit, worker_count
+
+
+def write_v1(root, quota: int, period: int = 100000):
+    (root / 'cpu').mkdir()
+    (root / 'cpu' / 'cpu.cfs_quota_us').write_text(f'{quota}\n')
+    (root / 'cpu' / 'cpu.cfs_period_us').write_text(f'{period}\n')
+
+
+def test_cgroup_v2_quota(tmp_path):
+    """Test quotas read from cpu.max."""
+    (tmp_path / 'cpu.max').write_text('250000 100000\n')
+    assert cgroup_cpu_limit(tmp_path) == 2.5
+
+    (tmp_path / 'cpu.max').write_text('max 100000\n')
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    """Test quotas read from the CFS files."""
+    write_v1(tmp_path, 50000)
+    assert cgroup_cpu_limit(tmp_path) == 0.5
+
+
+def test_unlimited_cgroup_v1(tmp_path):
+    """Test that a quota of -1 means no limit."""
+    write_v1(tmp_path, -1)
+    assert cgroup_cpu_limit(tmp_path) is None
+    assert cgroup_cpu_limit(tmp_path / 'missing') is None
+
+
+def test_worker_count(tmp_path, monkeypatch):
+    """Test that the quota caps the CPUs and rounds up."""
+    monkeypatch.setattr('os.sched_getaffinity', lambda pid: set(range(8)))
+    (tmp_path / 'cpu.max').write_text('150000 100000\n')
+    assert available_cpus(tmp_path) == 2
+    assert worker_count(root=tmp_path) == 2
+    assert worker_count(configured=3, root=tmp_path) == 3
+    # Per-worker sessions and SSE events need a single worker
+    assert worker_count(shared_state=False, root=tmp_path) == 1
+
+    (tmp_path / 'cpu.max').write_text('20000 100000\n')
+    assert available_cpus(tmp_path) == 1
+
+
+def test_session_service_defaults_to_memory():
+    """Test that sessions stay in memory without SESSION_DB_URL."""
+    assert isinstance(create_session_service(), InMemorySessionService)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])